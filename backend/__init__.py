@@ -26,37 +26,51 @@ Quick Start:
     ```
 
 For more details, see the individual modules:
-    - backend.config: Configuration management
+    - backend.config: Configuration management (global instance: backend.config.config)
     - backend.db: Neo4j database client
     - backend.llm: LLM providers and graph transformation
     - backend.schemas: Graph schema definitions
     - backend.services: High-level service layer
 """
-from .config import config, Config, Neo4jConfig, LLMConfig, OllamaConfig, GeminiConfig
-from .db import Neo4jClient
-from .llm import get_llm, LLMProvider, GraphTransformer
-from .schemas import GraphSchema, SkillGraphSchema
-from .services import KnowledgeGraphService
+import importlib
 
-__all__ = [
+# Public name -> submodule. Resolved on first access (PEP 562) so that, e.g.,
+# ``from backend import Config`` does not import LangChain or the Neo4j driver.
+_LAZY_EXPORTS = {
     # Config
-    "config",
-    "Config",
-    "Neo4jConfig",
-    "LLMConfig",
-    "OllamaConfig",
-    "GeminiConfig",
+    "Config": ".config",
+    "Neo4jConfig": ".config",
+    "LLMConfig": ".config",
+    "OllamaConfig": ".config",
+    "GeminiConfig": ".config",
     # Database
-    "Neo4jClient",
+    "Neo4jClient": ".db",
     # LLM
-    "get_llm",
-    "LLMProvider",
-    "GraphTransformer",
+    "get_llm": ".llm",
+    "LLMProvider": ".llm",
+    "GraphTransformer": ".llm",
     # Schemas
-    "GraphSchema",
-    "SkillGraphSchema",
+    "GraphSchema": ".schemas",
+    "SkillGraphSchema": ".schemas",
     # Services
-    "KnowledgeGraphService",
-]
+    "KnowledgeGraphService": ".services",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Import a public name from its submodule on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 __version__ = "0.1.0"
@@ -2,124 +2,413 @@
 Configuration module for Endstate backend.
 Supports environment variables and config file overrides.
 """
+import contextvars
 import os
-from dataclasses import dataclass, field
-from typing import Literal
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from enum import StrEnum
+from typing import Final, Iterator, Literal, NamedTuple, Optional, Union
 from pathlib import Path
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv(Path(__file__).parent.parent / ".env")
-except ImportError:
-    pass
+_ENV_PATH: Final[Path] = Path(__file__).resolve().parent.parent / ".env"
+
+# Survives importlib.reload(), which re-executes the module in the same namespace
+if not globals().get("_DOTENV_LOADED"):
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(_ENV_PATH, override=False)
+    except ImportError:
+        pass
+    _DOTENV_LOADED = True
+
+__all__ = [
+    "Overrides",
+    "REQUEST_OVERRIDES",
+    "LLMProvider",
+    "Neo4jConfig",
+    "OllamaConfig",
+    "GeminiConfig",
+    "OpenRouterConfig",
+    "LLMConfig",
+    "ChatConfig",
+    "ResolvedConfig",
+    "Config",
+    "config",
+    "request_scope",
+]
+
+
+@dataclass(slots=True, frozen=True)
+class Overrides:
+    """Request-scoped config overrides; empty strings mean "use the default"."""
+    gemini_api_key: str = ""
+    openrouter_api_key: str = ""
+    neo4j_uri: str = ""
+    neo4j_username: str = ""
+    neo4j_password: str = ""
+    llm_provider: str = ""
+
+
+# Single context variable holding every request-scoped override
+REQUEST_OVERRIDES: contextvars.ContextVar[Overrides] = contextvars.ContextVar(
+    "request_overrides", default=Overrides()
+)
+
+
+class LLMProvider(StrEnum):
+    """Supported LLM providers."""
+    OLLAMA = "ollama"
+    GEMINI = "gemini"
+    OPENROUTER = "openrouter"
+    MOCK = "mock"
+
+
+_PROVIDER_LOOKUP = {p.value: p for p in LLMProvider}
+
+
+def _to_provider(value: str) -> Union[LLMProvider, str]:
+    """Resolve a provider name to its ``LLMProvider`` member; unknown names pass through."""
+    return _PROVIDER_LOOKUP.get(value) or _PROVIDER_LOOKUP.get(value.lower(), value)
+
+
+# Environment-backed defaults, read once at import time.
+# Use the ``from_env`` classmethods to re-read the environment explicitly.
+_ENV_DEFAULTS = {
+    "NEO4J_URI": "bolt://localhost:7687",
+    "NEO4J_USERNAME": "neo4j",
+    "NEO4J_PASSWORD": "password123",
+    "NEO4J_DATABASE": "neo4j",
+    "NEO4J_MAX_POOL_SIZE": "50",
+    "NEO4J_ACQUISITION_TIMEOUT_SECONDS": "60",
+    "NEO4J_MAX_CONNECTION_LIFETIME_SECONDS": "3600",
+    "NEO4J_CONNECTION_TIMEOUT_SECONDS": "30",
+    "OLLAMA_BASE_URL": "http://localhost:11434",
+    "OLLAMA_MODEL": "llama3.2",
+    "OLLAMA_KEEP_ALIVE": "5m",
+    "OLLAMA_TIMEOUT_SECONDS": "600",
+    "GOOGLE_API_KEY": "",
+    "GEMINI_MODEL": "gemini-2.5-flash-lite",
+    "OPENROUTER_API_KEY": "",
+    "OPENROUTER_MODEL": "openai/gpt-4o-mini",
+    "LLM_PROVIDER": "ollama",
+    "LLM_TIMEOUT_SECONDS": "600",
+    "CHAT_HISTORY_MAX_MESSAGES": "20",
+}
 
-import contextvars
 
-# Context variables for request-scoped overrides
-X_GEMINI_API_KEY = contextvars.ContextVar("x_gemini_api_key", default="")
-X_OPENROUTER_API_KEY = contextvars.ContextVar("x_openrouter_api_key", default="")
-X_NEO4J_URI = contextvars.ContextVar("x_neo4j_uri", default="")
-X_NEO4J_USERNAME = contextvars.ContextVar("x_neo4j_username", default="")
-X_NEO4J_PASSWORD = contextvars.ContextVar("x_neo4j_password", default="")
-X_LLM_PROVIDER = contextvars.ContextVar("x_llm_provider", default="")
+def _getenv(name: str) -> str:
+    """Read an environment variable, falling back to its documented default."""
+    return os.getenv(name, _ENV_DEFAULTS[name])
 
 
-@dataclass
+def _getenv_typed(name: str, cast: type):
+    """Read and convert an environment variable, failing fast on bad values."""
+    raw = _getenv(name)
+    try:
+        return cast(raw)
+    except ValueError:
+        raise ValueError(f"Invalid {name}={raw!r}: expected {cast.__name__}") from None
+
+
+def _override_property(override: str, fallback: str) -> property:
+    """
+    Build a read-only property preferring a request override over a field.
+
+    The getter is generated with the attribute names written into its body,
+    so each access compiles to plain attribute loads (no getattr/attrgetter
+    indirection). Both names are module constants, never user input.
+    """
+    namespace = {"_get_overrides": REQUEST_OVERRIDES.get}
+    exec(
+        f"def {override}(self):\n"
+        f"    return _get_overrides().{override} or self.{fallback}\n",
+        namespace,
+    )
+    return property(namespace[override], doc=f"``{fallback}`` unless overridden for the current request.")
+
+
+def _defer_subconfigs(obj: object, names: tuple[str, ...]) -> None:
+    """Unset sub-config slots left as None so they are built on first access."""
+    for name in names:
+        if getattr(obj, name) is None:
+            delattr(obj, name)
+
+
+def _build_subconfig(obj: object, name: str, factories: dict) -> object:
+    """Build, store and return a deferred sub-config (``__getattr__`` helper)."""
+    factory = factories.get(name)
+    if factory is None:
+        raise AttributeError(f"{type(obj).__name__!r} object has no attribute {name!r}")
+    value = factory()
+    setattr(obj, name, value)
+    return value
+
+
+_NEO4J_URI = _getenv("NEO4J_URI")
+_NEO4J_USERNAME = _getenv("NEO4J_USERNAME")
+_NEO4J_PASSWORD = _getenv("NEO4J_PASSWORD")
+_NEO4J_DATABASE = _getenv("NEO4J_DATABASE")
+_OLLAMA_BASE_URL = _getenv("OLLAMA_BASE_URL")
+_OLLAMA_MODEL = _getenv("OLLAMA_MODEL")
+_OLLAMA_KEEP_ALIVE = _getenv("OLLAMA_KEEP_ALIVE")
+_GOOGLE_API_KEY = _getenv("GOOGLE_API_KEY")
+_GEMINI_MODEL = _getenv("GEMINI_MODEL")
+_OPENROUTER_API_KEY = _getenv("OPENROUTER_API_KEY")
+_OPENROUTER_MODEL = _getenv("OPENROUTER_MODEL")
+_LLM_PROVIDER = _getenv("LLM_PROVIDER")
+_OLLAMA_TIMEOUT_SECONDS: Final[float] = _getenv_typed("OLLAMA_TIMEOUT_SECONDS", float)
+_LLM_TIMEOUT_SECONDS: Final[float] = _getenv_typed("LLM_TIMEOUT_SECONDS", float)
+_CHAT_HISTORY_MAX_MESSAGES: Final[int] = _getenv_typed("CHAT_HISTORY_MAX_MESSAGES", int)
+_NEO4J_MAX_POOL_SIZE: Final[int] = _getenv_typed("NEO4J_MAX_POOL_SIZE", int)
+_NEO4J_ACQUISITION_TIMEOUT_SECONDS: Final[float] = _getenv_typed("NEO4J_ACQUISITION_TIMEOUT_SECONDS", float)
+_NEO4J_MAX_CONNECTION_LIFETIME_SECONDS: Final[float] = _getenv_typed(
+    "NEO4J_MAX_CONNECTION_LIFETIME_SECONDS", float
+)
+_NEO4J_CONNECTION_TIMEOUT_SECONDS: Final[float] = _getenv_typed("NEO4J_CONNECTION_TIMEOUT_SECONDS", float)
+
+
+@dataclass(slots=True, frozen=True)
 class Neo4jConfig:
     """Neo4j database configuration."""
-    _uri: str = field(default_factory=lambda: os.getenv("NEO4J_URI", "bolt://localhost:7687"))
-    _username: str = field(default_factory=lambda: os.getenv("NEO4J_USERNAME", "neo4j"))
-    _password: str = field(default_factory=lambda: os.getenv("NEO4J_PASSWORD", "password123"))
-    database: str = field(default_factory=lambda: os.getenv("NEO4J_DATABASE", "neo4j"))
+    _uri: str = _NEO4J_URI
+    _username: str = _NEO4J_USERNAME
+    _password: str = _NEO4J_PASSWORD
+    database: str = _NEO4J_DATABASE
+    max_pool_size: int = _NEO4J_MAX_POOL_SIZE
+    acquisition_timeout_seconds: float = _NEO4J_ACQUISITION_TIMEOUT_SECONDS
+    max_connection_lifetime_seconds: float = _NEO4J_MAX_CONNECTION_LIFETIME_SECONDS
+    connection_timeout_seconds: float = _NEO4J_CONNECTION_TIMEOUT_SECONDS
 
-    @property
-    def uri(self) -> str:
-        override = X_NEO4J_URI.get()
-        return override if override else self._uri
+    @classmethod
+    def from_env(cls) -> "Neo4jConfig":
+        """Create configuration by re-reading environment variables."""
+        return cls(
+            _uri=_getenv("NEO4J_URI"),
+            _username=_getenv("NEO4J_USERNAME"),
+            _password=_getenv("NEO4J_PASSWORD"),
+            database=_getenv("NEO4J_DATABASE"),
+            max_pool_size=_getenv_typed("NEO4J_MAX_POOL_SIZE", int),
+            acquisition_timeout_seconds=_getenv_typed("NEO4J_ACQUISITION_TIMEOUT_SECONDS", float),
+            max_connection_lifetime_seconds=_getenv_typed("NEO4J_MAX_CONNECTION_LIFETIME_SECONDS", float),
+            connection_timeout_seconds=_getenv_typed("NEO4J_CONNECTION_TIMEOUT_SECONDS", float),
+        )
 
-    @property
-    def username(self) -> str:
-        override = X_NEO4J_USERNAME.get()
-        return override if override else self._username
+    def driver_options(self) -> dict:
+        """Connection-pool keyword arguments for ``GraphDatabase.driver``."""
+        return {
+            "max_connection_pool_size": self.max_pool_size,
+            "connection_acquisition_timeout": self.acquisition_timeout_seconds,
+            "max_connection_lifetime": self.max_connection_lifetime_seconds,
+            "connection_timeout": self.connection_timeout_seconds,
+        }
 
-    @property
-    def password(self) -> str:
-        override = X_NEO4J_PASSWORD.get()
-        return override if override else self._password
+    uri = _override_property("neo4j_uri", "_uri")
+    username = _override_property("neo4j_username", "_username")
+    password = _override_property("neo4j_password", "_password")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OllamaConfig:
     """Ollama (local LLM) configuration."""
-    base_url: str = field(default_factory=lambda: os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"))
-    model: str = field(default_factory=lambda: os.getenv("OLLAMA_MODEL", "llama3.2"))
+    base_url: str = _OLLAMA_BASE_URL
+    model: str = _OLLAMA_MODEL
     temperature: float = 0.0
-    timeout_seconds: float = field(default_factory=lambda: float(os.getenv("OLLAMA_TIMEOUT_SECONDS", "600")))
-    keep_alive: str = field(default_factory=lambda: os.getenv("OLLAMA_KEEP_ALIVE", "5m"))
+    timeout_seconds: float = _OLLAMA_TIMEOUT_SECONDS
+    keep_alive: str = _OLLAMA_KEEP_ALIVE
+
+    @classmethod
+    def from_env(cls) -> "OllamaConfig":
+        """Create configuration by re-reading environment variables."""
+        return cls(
+            base_url=_getenv("OLLAMA_BASE_URL"),
+            model=_getenv("OLLAMA_MODEL"),
+            timeout_seconds=_getenv_typed("OLLAMA_TIMEOUT_SECONDS", float),
+            keep_alive=_getenv("OLLAMA_KEEP_ALIVE"),
+        )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GeminiConfig:
     """Google Gemini API configuration."""
-    _api_key: str = field(default_factory=lambda: os.getenv("GOOGLE_API_KEY", ""))
-    model: str = field(default_factory=lambda: os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite"))
+    _api_key: str = _GOOGLE_API_KEY
+    model: str = _GEMINI_MODEL
     temperature: float = 0.0
 
-    @property
-    def api_key(self) -> str:
-        override = X_GEMINI_API_KEY.get()
-        return override if override else self._api_key
+    @classmethod
+    def from_env(cls) -> "GeminiConfig":
+        """Create configuration by re-reading environment variables."""
+        return cls(_api_key=_getenv("GOOGLE_API_KEY"), model=_getenv("GEMINI_MODEL"))
+
+    api_key = _override_property("gemini_api_key", "_api_key")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OpenRouterConfig:
     """OpenRouter API configuration."""
-    _api_key: str = field(default_factory=lambda: os.getenv("OPENROUTER_API_KEY", ""))
-    model: str = field(default_factory=lambda: os.getenv("OPENROUTER_MODEL", "openai/gpt-4o-mini"))
+    _api_key: str = _OPENROUTER_API_KEY
+    model: str = _OPENROUTER_MODEL
     base_url: str = "https://openrouter.ai/api/v1"
     temperature: float = 0.0
 
-    @property
-    def api_key(self) -> str:
-        override = X_OPENROUTER_API_KEY.get()
-        return override if override else self._api_key
+    @classmethod
+    def from_env(cls) -> "OpenRouterConfig":
+        """Create configuration by re-reading environment variables."""
+        return cls(_api_key=_getenv("OPENROUTER_API_KEY"), model=_getenv("OPENROUTER_MODEL"))
 
+    api_key = _override_property("openrouter_api_key", "_api_key")
 
-@dataclass
+
+@dataclass(slots=True)
 class LLMConfig:
-    """LLM provider configuration."""
-    _provider: Literal["ollama", "gemini", "openrouter", "mock"] = field(
-        default_factory=lambda: os.getenv("LLM_PROVIDER", "ollama")
-    )
-    ollama: OllamaConfig = field(default_factory=OllamaConfig)
-    gemini: GeminiConfig = field(default_factory=GeminiConfig)
-    openrouter: OpenRouterConfig = field(default_factory=OpenRouterConfig)
-    timeout_seconds: float = field(default_factory=lambda: float(os.getenv("LLM_TIMEOUT_SECONDS", "600")))
+    """
+    LLM provider configuration.
+
+    Provider sub-configs left as None are only built on first access,
+    so unused providers never read their environment defaults. Settings not
+    defined here (``model``, ``api_key``, ...) are read from the active
+    provider's config, e.g. ``config.llm.model``.
+    """
+    _provider: Literal["ollama", "gemini", "openrouter", "mock"] = _LLM_PROVIDER
+    ollama: Optional[OllamaConfig] = None
+    gemini: Optional[GeminiConfig] = None
+    openrouter: Optional[OpenRouterConfig] = None
+    timeout_seconds: float = _LLM_TIMEOUT_SECONDS
+
+    def __post_init__(self) -> None:
+        self._provider = _to_provider(self._provider)
+        _defer_subconfigs(self, ("ollama", "gemini", "openrouter"))
+
+    def __getattr__(self, name: str):
+        if name in _LLM_SUBCONFIGS or name.startswith("_"):
+            return _build_subconfig(self, name, _LLM_SUBCONFIGS)
+        provider = self.provider
+        if provider not in _LLM_SUBCONFIGS:
+            raise AttributeError(f"provider {provider!r} has no setting {name!r}")
+        return getattr(getattr(self, provider), name)
+
+    @classmethod
+    def from_env(cls) -> "LLMConfig":
+        """Create configuration by re-reading environment variables."""
+        return cls(
+            _provider=_getenv("LLM_PROVIDER"),
+            ollama=OllamaConfig.from_env(),
+            gemini=GeminiConfig.from_env(),
+            openrouter=OpenRouterConfig.from_env(),
+            timeout_seconds=_getenv_typed("LLM_TIMEOUT_SECONDS", float),
+        )
 
     @property
     def provider(self) -> str:
-        override = X_LLM_PROVIDER.get()
-        return override if override else self._provider
+        """Active provider, as an ``LLMProvider`` member when the name is known."""
+        override = REQUEST_OVERRIDES.get().llm_provider
+        return _to_provider(override) if override else self._provider
+
 
+_LLM_SUBCONFIGS = {
+    "ollama": OllamaConfig,
+    "gemini": GeminiConfig,
+    "openrouter": OpenRouterConfig,
+}
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ChatConfig:
     """Chat service configuration."""
-    history_max_messages: int = field(default_factory=lambda: int(os.getenv("CHAT_HISTORY_MAX_MESSAGES", "20")))
+    history_max_messages: int = _CHAT_HISTORY_MAX_MESSAGES
+
+    @classmethod
+    def from_env(cls) -> "ChatConfig":
+        """Create configuration by re-reading environment variables."""
+        return cls(history_max_messages=_getenv_typed("CHAT_HISTORY_MAX_MESSAGES", int))
+
 
+class ResolvedConfig(NamedTuple):
+    """Effective configuration values with request overrides applied."""
+    neo4j_uri: str
+    neo4j_username: str
+    neo4j_password: str
+    neo4j_database: str
+    llm_provider: str
+    llm_api_key: str
 
-@dataclass
+
+@dataclass(slots=True)
 class Config:
-    """Main configuration class."""
-    neo4j: Neo4jConfig = field(default_factory=Neo4jConfig)
-    llm: LLMConfig = field(default_factory=LLMConfig)
-    chat: ChatConfig = field(default_factory=ChatConfig)
-    
+    """Main configuration class. Sub-configs left as None are built lazily."""
+    neo4j: Optional[Neo4jConfig] = None
+    llm: Optional[LLMConfig] = None
+    chat: Optional[ChatConfig] = None
+
+    def __post_init__(self) -> None:
+        _defer_subconfigs(self, ("neo4j", "llm", "chat"))
+
+    def __getattr__(self, name: str):
+        return _build_subconfig(self, name, _CONFIG_SUBCONFIGS)
+
     @classmethod
     def from_env(cls) -> "Config":
         """Create configuration from environment variables."""
-        return cls()
+        return cls(
+            neo4j=Neo4jConfig.from_env(),
+            llm=LLMConfig.from_env(),
+            chat=ChatConfig.from_env(),
+        )
+
+    def snapshot(self) -> ResolvedConfig:
+        """Resolve every override-aware property once into a plain tuple."""
+        neo4j = self.neo4j
+        llm = self.llm
+        # Only the active provider's sub-config is materialized
+        api_key = getattr(llm, "api_key", "")
+        return ResolvedConfig(
+            neo4j_uri=neo4j.uri,
+            neo4j_username=neo4j.username,
+            neo4j_password=neo4j.password,
+            neo4j_database=neo4j.database,
+            llm_provider=llm.provider,
+            llm_api_key=api_key,
+        )
+
+
+_CONFIG_SUBCONFIGS = {
+    "neo4j": Neo4jConfig,
+    "llm": LLMConfig,
+    "chat": ChatConfig,
+}
+
+
+def __getattr__(name: str):
+    """Build the global ``config`` instance on first access (PEP 562)."""
+    if name == "config":
+        global config
+        config = Config()
+        return config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@contextmanager
+def request_scope(**overrides: Optional[str]) -> Iterator[None]:
+    """
+    Apply request-scoped overrides for the duration of the block.
 
+    Blank values are ignored so the environment defaults still apply.
+    Overrides already in effect are kept unless replaced, and the previous
+    set is restored on exit.
 
-# Global config instance
-config = Config.from_env()
+    Args:
+        **overrides: Values keyed by ``Overrides`` field name
+            (e.g. ``neo4j_uri``, ``gemini_api_key``).
+    """
+    values = {
+        name: value.strip()
+        for name, value in overrides.items()
+        if value and value.strip()
+    }
+    if not values:
+        yield
+        return
+    token = REQUEST_OVERRIDES.set(replace(REQUEST_OVERRIDES.get(), **values))
+    try:
+        yield
+    finally:
+        REQUEST_OVERRIDES.reset(token)
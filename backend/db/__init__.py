@@ -1,6 +1,6 @@
 """
 Database module for Neo4j operations.
 """
-from .neo4j_client import Neo4jClient
+from .neo4j_client import AsyncNeo4jClient, Neo4jClient
 
-__all__ = ["Neo4jClient"]
+__all__ = ["AsyncNeo4jClient", "Neo4jClient"]
@@ -4,45 +4,1216 @@ Provides connection management and graph operations.
 """
 from __future__ import annotations
 
+import asyncio
+import atexit
+import copy
+import hashlib
 import json
 import re
-from typing import Optional, Any
-
-from langchain_neo4j import Neo4jGraph
-from neo4j import GraphDatabase, Result, RoutingControl
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping, Optional
+
+from neo4j import (
+    READ_ACCESS,
+    AsyncDriver,
+    AsyncGraphDatabase,
+    AsyncResult,
+    Driver,
+    GraphDatabase,
+    Record,
+    Result,
+    RoutingControl,
+)
+from neo4j.exceptions import ClientError
 from neo4j.time import DateTime
 
-from ..config import Neo4jConfig, config
+from ..config import REQUEST_OVERRIDES, Neo4jConfig, Overrides, config
+
+if TYPE_CHECKING:
+    from langchain_neo4j import Neo4jGraph
+
+# orjson is an optional speedup for the summary and proposal payloads
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 DEFAULT_PROJECT_ID = "project-all"
 DEFAULT_PROJECT_NAME = "All"
+# How long a cached relationship type set is trusted without a refresh
+RELATIONSHIP_TYPES_TTL_SECONDS = 60.0
+# Rows written per UNWIND statement by the bulk write helpers
+BULK_WRITE_BATCH_SIZE = 1000
+# Nodes deleted per committed transaction by the bulk delete queries
+BULK_DELETE_BATCH_SIZE = 10000
+# How long a graph stats payload is served from memory, see _cached_stats
+STATS_CACHE_TTL_SECONDS = 5.0
+# Stats payloads kept at once; the cache is emptied when it would grow past this
+STATS_CACHE_MAX_ENTRIES = 64
+# Parsed project summaries kept at once; the cache is emptied when it would grow past this
+SUMMARY_CACHE_MAX_ENTRIES = 256
+# Shared drivers kept at once; the least recently used is retired past this
+SHARED_DRIVERS_MAX_ENTRIES = 16
+
+
+# Cypher reused verbatim on every call. Queries with an optional
+# relationship properties column are built once per variant; the
+# "{properties}" marker is replaced rather than formatted so Cypher map
+# braces need no escaping.
+_REL_PROPERTIES_MARKER = "{properties}"
+
+
+def _rel_query_variants(query: str, column: str) -> dict[bool, str]:
+    """Build the without/with relationship properties variants of a query."""
+    return {
+        False: query.replace(_REL_PROPERTIES_MARKER, ""),
+        True: query.replace(_REL_PROPERTIES_MARKER, column),
+    }
+
+
+# Bulk deletes commit every $batch_size nodes so a large graph never sits
+# in one transaction; they must run through _run_in_batches
+_CLEAN_GRAPH_QUERY = """
+    MATCH (n)
+    CALL (n) { DETACH DELETE n } IN TRANSACTIONS OF $batch_size ROWS
+"""
+_CLEAN_LABEL_QUERY = """
+    MATCH (n:$($label))
+    CALL (n) { DETACH DELETE n } IN TRANSACTIONS OF $batch_size ROWS
+    RETURN count(*) as deleted
+"""
+_NODE_COUNT_QUERY = "MATCH (n) RETURN count(n) as count"
+_LABEL_NODE_COUNT_QUERY = "MATCH (n:$($label)) RETURN count(n) as count"
+_RELATIONSHIP_COUNT_QUERY = "MATCH ()-[r]->() RETURN count(r) as count"
+_TYPE_RELATIONSHIP_COUNT_QUERY = "MATCH ()-[r:$($rel_type)]->() RETURN count(r) as count"
+
+# Label and match property are parameters so every label shares one plan.
+# mergeNodes folds each group into its first node in one pass over the
+# duplicates' relationships; the first node's property values win.
+_MERGE_NODES_QUERY = """
+    MATCH (n:$($label))
+    WITH n[$match_property] AS prop, COLLECT(n) AS nodes
+    WHERE prop IS NOT NULL AND SIZE(nodes) > 1
+    CALL apoc.refactor.mergeNodes(nodes, {properties: 'discard', mergeRels: true}) YIELD node
+    RETURN SUM(SIZE(nodes) - 1) as total_merged
+"""
+
+# Statements run by _merge_nodes_simple_tx
+_DUPLICATE_NODES_QUERY = """
+    MATCH (n:$($label))
+    WITH n[$match_property] AS prop, COLLECT(n) AS nodes
+    WHERE prop IS NOT NULL AND SIZE(nodes) > 1
+    RETURN elementId(HEAD(nodes)) as keep_id,
+           [node IN TAIL(nodes) | elementId(node)] as dup_ids
+"""
+_REWIRE_RELATIONSHIPS_QUERY = """
+    UNWIND $rels AS rel
+    MATCH (a) WHERE elementId(a) = rel.from_id
+    MATCH (b) WHERE elementId(b) = rel.to_id
+    CREATE (a)-[r:$(rel.rel_type)]->(b)
+    SET r += rel.props
+"""
+
+# Labels that make up the knowledge graph, as opposed to chat and
+# bookkeeping nodes; relationships only count edges between the rel labels
+_KNOWLEDGE_GRAPH_LABELS = ["Skill", "Concept", "Topic", "Project", "Milestone"]
+_KNOWLEDGE_GRAPH_REL_LABELS = ["Skill", "Concept", "Topic", "Project"]
+
+# Node counts by label and relationship counts by type in one round trip.
+# Nodes are grouped by label set first so a node with several labels
+# counts once in the total.
+_KG_STATS_QUERY = """
+    CALL {
+        MATCH (n)
+        WHERE any(label IN labels(n) WHERE label IN $labels)
+          AND NOT (n:Project AND COALESCE(n.is_default, false))
+        WITH [label IN labels(n) WHERE label IN $labels] as labels, count(*) as count
+        WITH collect({labels: labels, count: count}) as groups, sum(count) as total_nodes
+        CALL (groups) {
+            UNWIND groups as group
+            UNWIND group.labels as label
+            WITH label, sum(group.count) as count
+            RETURN collect([label, count]) as node_counts
+        }
+        RETURN node_counts, total_nodes
+    }
+    CALL {
+        MATCH (n)-[r]->(m)
+        WHERE any(label IN labels(n) WHERE label IN $rel_labels)
+          AND any(label IN labels(m) WHERE label IN $rel_labels)
+          AND NOT (n:Project AND COALESCE(n.is_default, false))
+          AND NOT (m:Project AND COALESCE(m.is_default, false))
+        WITH type(r) as type, count(*) as count
+        RETURN collect([type, count]) as rel_counts, sum(count) as total_relationships
+    }
+    RETURN node_counts, total_nodes, rel_counts, total_relationships
+"""
+
+def _node_map(variable: str) -> str:
+    """
+    Cypher map projecting a node to the id/labels/properties shape that
+    _serialize_node produces.
+
+    Returning this map instead of the node itself keeps the driver from
+    hydrating graph objects for every row.
+    """
+    return (
+        f"{{id: coalesce({variable}.id, elementId({variable})), "
+        f"labels: labels({variable}), properties: properties({variable})}}"
+    )
+
+
+# Projects sort first so they are kept when the limit truncates
+_KG_NODES_QUERY = f"""
+    MATCH (n)
+    WHERE any(label IN labels(n) WHERE label IN $labels)
+      AND NOT (n:Project AND COALESCE(n.is_default, false))
+    WITH n
+    ORDER BY n:Project DESC
+    LIMIT $limit
+    RETURN {_node_map("n")} as n
+"""
+
+_ALL_NODES_QUERY = f"MATCH (n) WITH n LIMIT $limit RETURN {_node_map('n')} as n"
+_LABEL_NODES_QUERY = f"MATCH (n:$($label)) WITH n LIMIT $limit RETURN {_node_map('n')} as n"
+
+_KG_RELATIONSHIPS_QUERIES = _rel_query_variants(
+    """
+    MATCH (n)-[r]->(m)
+    WHERE any(label IN labels(n) WHERE label IN $labels)
+      AND any(label IN labels(m) WHERE label IN $labels)
+      AND NOT (n:Project AND COALESCE(n.is_default, false))
+      AND NOT (m:Project AND COALESCE(m.is_default, false))
+    RETURN COALESCE(n.id, elementId(n)) as source,
+           type(r) as type,
+           COALESCE(m.id, elementId(m)) as target{properties}
+    LIMIT $limit
+""",
+    ", properties(r) as properties",
+)
+
+# Relationships where at least one end is a project node or connected to it.
+# This iterates over the project's connections rather than all relationships in the graph.
+_PROJECT_RELATIONSHIPS_QUERIES = _rel_query_variants(
+    """
+    MATCH (p:Project {id: $project_id})
+    OPTIONAL MATCH (p)-[:HAS_NODE|HAS_SKILL|HAS_CONCEPT|HAS_TOPIC|HAS_MILESTONE|HAS_LESSON]->(connected)
+    WITH p, COLLECT(DISTINCT connected) as connected_nodes
+    WITH connected_nodes + [p] as project_nodes
+    UNWIND project_nodes as n
+    MATCH (n)-[r]-(m)
+    WHERE any(label IN labels(n) WHERE label IN $labels)
+      AND any(label IN labels(m) WHERE label IN $labels)
+      AND NOT (n:Project AND COALESCE(n.is_default, false))
+      AND NOT (m:Project AND COALESCE(m.is_default, false))
+    WITH DISTINCT r
+    RETURN COALESCE(startNode(r).id, elementId(startNode(r))) as source,
+           type(r) as type,
+           COALESCE(endNode(r).id, elementId(endNode(r))) as target{properties}
+    LIMIT $limit
+""",
+    ", properties(r) as properties",
+)
+
+_PROJECT_GRAPH_QUERIES = _rel_query_variants(
+    """
+    MATCH (p:Project {id: $project_id})
+    OPTIONAL MATCH (p)-[:HAS_NODE|HAS_SKILL|HAS_CONCEPT|HAS_TOPIC|HAS_MILESTONE|HAS_LESSON]->(c)
+    WITH p, COLLECT(DISTINCT c) as connected_nodes
+    CALL (p, connected_nodes) {
+        WITH [
+            n IN connected_nodes
+            WHERE any(label IN labels(n) WHERE label IN $labels)
+              AND NOT (n:Project AND COALESCE(n.is_default, false))
+        ][..$limit] as connected
+        UNWIND [p] + connected as x
+        WITH DISTINCT x
+        WHERE NOT (x:Project AND COALESCE(x.is_default, false))
+        RETURN collect({id: coalesce(x.id, elementId(x)), labels: labels(x), properties: properties(x)}) as nodes
+    }
+    CALL (p, connected_nodes) {
+        UNWIND connected_nodes + [p] as n
+        MATCH (n)-[r]-(m)
+        WHERE any(label IN labels(n) WHERE label IN $labels)
+          AND any(label IN labels(m) WHERE label IN $labels)
+          AND NOT (n:Project AND COALESCE(n.is_default, false))
+          AND NOT (m:Project AND COALESCE(m.is_default, false))
+        WITH DISTINCT r
+        LIMIT $limit
+        RETURN collect({
+            source: COALESCE(startNode(r).id, elementId(startNode(r))),
+            type: type(r),
+            target: COALESCE(endNode(r).id, elementId(endNode(r))){properties}
+        }) as relationships
+    }
+    RETURN nodes, relationships
+""",
+    ", properties: properties(r)",
+)
+
+_ALL_RELATIONSHIPS_QUERIES = _rel_query_variants(
+    """
+    MATCH (n)-[r]->(m)
+    RETURN n.id as source, type(r) as type, m.id as target{properties}
+    LIMIT $limit
+""",
+    ", properties(r) as properties",
+)
+
+# Labels whose nodes are matched and merged by id, with their constraint names
+_ID_KEYED_LABELS = {
+    "ChatSession": "chat_session_id",
+    "Project": "project_id",
+    "ProjectSummary": "project_summary_id",
+    "ProjectLesson": "project_lesson_id",
+    "ProjectAssessment": "project_assessment_id",
+    "ProjectSubmission": "project_submission_id",
+    "UserProfile": "user_profile_id",
+}
+# Summary node labels are merged by name. Extracted graph documents can
+# hold the same name under different ids, so these are indexed rather
+# than constrained.
+_NAME_KEYED_LABELS = ("Skill", "Concept", "Topic", "Milestone")
+
+_SCHEMA_QUERIES = (
+    *(
+        f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR (n:{label}) REQUIRE n.id IS UNIQUE"
+        for label, name in _ID_KEYED_LABELS.items()
+    ),
+    *(
+        f"CREATE INDEX {label.lower()}_name IF NOT EXISTS FOR (n:{label}) ON (n.name)"
+        for label in _NAME_KEYED_LABELS
+    ),
+    # Duplicate-project lookups match on scalar keys derived from
+    # summary_json at write time, see _summary_match_keys
+    "CREATE INDEX project_summary_session_title IF NOT EXISTS "
+    "FOR (ps:ProjectSummary) ON (ps.session_id, ps.norm_title)",
+    "CREATE INDEX project_summary_session_desc IF NOT EXISTS "
+    "FOR (ps:ProjectSummary) ON (ps.session_id, ps.norm_desc_200)",
+    # Lessons always carry archived once backfilled, see ensure_schema
+    "CREATE INDEX lesson_archived IF NOT EXISTS FOR (l:ProjectLesson) ON (l.archived)",
+    # Serves the project's submission list already in submitted_at order,
+    # see _LIST_PROJECT_SUBMISSIONS_QUERY
+    "CREATE INDEX project_submission_submitted IF NOT EXISTS "
+    "FOR (s:ProjectSubmission) ON (s.project_id, s.submitted_at)",
+    # Idempotency check on every chat turn, see _BEGIN_CHAT_TURN_QUERY
+    "CREATE INDEX chat_message_request_id IF NOT EXISTS FOR (m:ChatMessage) ON (m.request_id)",
+    # Legacy remediation nodes are looked up by id but came from graph
+    # extraction, so ids are not guaranteed unique and are only indexed
+    "CREATE INDEX remediation_concept_id IF NOT EXISTS FOR (r:RemediationConcept) ON (r.id)",
+)
+
+# (uri, database) targets whose schema this process has fully ensured
+_SCHEMA_READY_TARGETS: set[tuple[str, str]] = set()
+
+
+def _connection_key(neo4j_config: Neo4jConfig) -> tuple[str, str, str, str]:
+    """
+    Identify a config's target and credentials.
+
+    The password is included as a digest, so state cached per key is never
+    served to a caller holding different credentials.
+    """
+    return (
+        neo4j_config.uri,
+        neo4j_config.username,
+        neo4j_config.database,
+        hashlib.sha256(neo4j_config.password.encode()).hexdigest(),
+    )
+
+
+# Drivers shared by every client in the process, keyed on _connection_key
+# and kept in least recently used order, so short-lived per-request clients
+# reuse one connection pool
+_DRIVERS: dict[tuple[str, str, str, str], Driver] = {}
+_DRIVERS_LOCK = threading.Lock()
+# Drivers evicted from _DRIVERS. Long-lived clients may still hold them and
+# queries may still be running on them, so they are only closed at exit.
+_RETIRED_DRIVERS: list[Driver] = []
+
+
+def _shared_driver(neo4j_config: Neo4jConfig) -> Driver:
+    """Return the process-wide driver for a config's target, creating it once."""
+    key = _connection_key(neo4j_config)
+    with _DRIVERS_LOCK:
+        driver = _DRIVERS.pop(key, None)
+        if driver is None:
+            # Suppress notifications about non-existent labels/properties/relationship types
+            # These are informational warnings that occur when querying fresh databases
+            driver = GraphDatabase.driver(
+                neo4j_config.uri,
+                auth=(neo4j_config.username, neo4j_config.password),
+                notifications_disabled_categories=["UNRECOGNIZED", "DEPRECATION"],
+                **neo4j_config.driver_options(),
+            )
+            while len(_DRIVERS) >= SHARED_DRIVERS_MAX_ENTRIES:
+                _RETIRED_DRIVERS.append(_DRIVERS.pop(next(iter(_DRIVERS))))
+        _DRIVERS[key] = driver
+    return driver
+
+
+# Async drivers shared per event loop, keyed on (id(loop), *_connection_key)
+# and holding (loop, driver) in least recently used order. An async driver
+# is bound to the loop it runs on, so each loop gets its own pool.
+_ASYNC_DRIVERS: dict[tuple, tuple[asyncio.AbstractEventLoop, AsyncDriver]] = {}
+
+
+def _shared_async_driver(neo4j_config: Neo4jConfig) -> AsyncDriver:
+    """Return the running loop's driver for a config's target, creating it once."""
+    loop = asyncio.get_running_loop()
+    key = (id(loop), *_connection_key(neo4j_config))
+    with _DRIVERS_LOCK:
+        entry = _ASYNC_DRIVERS.pop(key, None)
+        if entry is None:
+            entry = (
+                loop,
+                AsyncGraphDatabase.driver(
+                    neo4j_config.uri,
+                    auth=(neo4j_config.username, neo4j_config.password),
+                    notifications_disabled_categories=["UNRECOGNIZED", "DEPRECATION"],
+                    **neo4j_config.driver_options(),
+                ),
+            )
+            # Drivers of loops that have since closed can never run again
+            for stale_key in [k for k, (owner, _) in _ASYNC_DRIVERS.items() if owner.is_closed()]:
+                del _ASYNC_DRIVERS[stale_key]
+            # Evicted drivers are not closed, as requests on the loop may
+            # still be using them; they are released with their last client
+            while len(_ASYNC_DRIVERS) >= SHARED_DRIVERS_MAX_ENTRIES:
+                del _ASYNC_DRIVERS[next(iter(_ASYNC_DRIVERS))]
+        _ASYNC_DRIVERS[key] = entry
+    return entry[1]
+
+
+def _close_shared_drivers() -> None:
+    """Close and forget every shared driver."""
+    with _DRIVERS_LOCK:
+        drivers = [*_DRIVERS.values(), *_RETIRED_DRIVERS]
+        _DRIVERS.clear()
+        _RETIRED_DRIVERS.clear()
+    for driver in drivers:
+        try:
+            driver.close()
+        except Exception:
+            pass
+
+
+atexit.register(_close_shared_drivers)
+
+# Recent stats payloads, keyed on _connection_key, method and arguments and
+# holding (fetched_at, payload), so dashboard refreshes from per-request
+# clients with the same credentials share one aggregation
+_STATS_CACHE: dict[tuple, tuple[float, Any]] = {}
+_STATS_CACHE_LOCK = threading.Lock()
+
+
+def _cached_stats(method: Callable) -> Callable:
+    """
+    Serve a read-only stats method from memory for STATS_CACHE_TTL_SECONDS.
+
+    Each caller gets its own copy of the payload. Writes that reshape the
+    graph call Neo4jClient.invalidate_stats; other writers are bounded by
+    the TTL.
+    """
+    @wraps(method)
+    def cached(self: "Neo4jClient", *args, **kwargs):
+        key = (
+            *_connection_key(self._config),
+            method.__name__,
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+        now = time.monotonic()
+        hit = _STATS_CACHE.get(key)
+        if hit is None or now - hit[0] > STATS_CACHE_TTL_SECONDS:
+            hit = (now, method(self, *args, **kwargs))
+            with _STATS_CACHE_LOCK:
+                if len(_STATS_CACHE) >= STATS_CACHE_MAX_ENTRIES:
+                    _STATS_CACHE.clear()
+                _STATS_CACHE[key] = hit
+        return copy.deepcopy(hit[1])
+    return cached
+
+# Fill properties older writers left unset, so indexes cover every node.
+# Reads still default them per row: AsyncNeo4jClient reads never run
+# ensure_schema, so a backfill may not have happened yet.
+_BACKFILL_QUERIES = (
+    """
+    MATCH (l:ProjectLesson)
+    WHERE l.archived IS NULL
+    SET l.archived = false
+    """,
+    """
+    MATCH (a:ProjectAssessment)
+    WHERE a.archived IS NULL
+    SET a.archived = false
+    """,
+    # Legacy remediation nodes only carried a name
+    """
+    MATCH (r:RemediationConcept)
+    WHERE r.title IS NULL AND r.name IS NOT NULL
+    SET r.title = r.name
+    """,
+    # Writers reach the Project node through SUMMARY_FOR and call
+    # ensure_schema first, so summaries older than the edge get it here
+    """
+    MATCH (ps:ProjectSummary)
+    WHERE NOT (ps)-[:SUMMARY_FOR]->(:Project)
+    MERGE (p:Project {id: ps.id})
+    ON CREATE SET p.created_at = datetime(),
+                  p.name = ps.project_name,
+                  p.is_default = COALESCE(ps.is_default, false)
+    MERGE (ps)-[:SUMMARY_FOR]->(p)
+    """,
+)
+
+_UNKEYED_PROJECT_SUMMARIES_QUERY = """
+    MATCH (ps:ProjectSummary)
+    WHERE ps.summary_json IS NOT NULL
+      AND ps.session_id IS NULL
+      AND ps.norm_title IS NULL
+      AND ps.norm_desc_200 IS NULL
+    RETURN ps.id as id, ps.summary_json as summary_json
+"""
+
+_SET_PROJECT_SUMMARY_KEYS_QUERY = """
+    UNWIND $rows as row
+    MATCH (ps:ProjectSummary {id: row.id})
+    SET ps.session_id = row.session_id,
+        ps.norm_title = row.norm_title,
+        ps.norm_desc_200 = row.norm_desc_200
+"""
+
+_FIND_PROJECT_BY_CONTENT_QUERY = """
+    MATCH (ps:ProjectSummary {session_id: $session_id})
+    WHERE ps.norm_title = $norm_title OR ps.norm_desc_200 = $norm_desc_200
+    RETURN ps.id as id, ps.project_name as name
+    LIMIT 1
+"""
+
+# Project summary node labels and the project relationship linking each
+_PROJECT_NODE_REL_TYPES = {
+    "Skill": "HAS_SKILL",
+    "Concept": "HAS_CONCEPT",
+    "Topic": "HAS_TOPIC",
+    "Milestone": "HAS_MILESTONE",
+}
+
+_PROJECT_NODE_UPSERT_SUBQUERY = """
+    CALL (p) {
+        UNWIND $by_label.{label} as item
+        MERGE (n:{label} {name: item.name})
+        ON CREATE SET n.created_at = datetime()
+        SET n.id = COALESCE(n.id, item.id),
+            n.updated_at = datetime()
+        MERGE (p)-[:{rel_type}]->(n){extra}
+    }"""
+
+# Labels and relationship types cannot be parameters, so each label gets
+# its own fixed statement rather than one built per call
+_CONNECT_PROJECT_NODES_QUERIES = {
+    label: f"""
+    MATCH (p:Project {{id: $project_id}})
+    UNWIND $names as node_name
+    MATCH (n:{label} {{name: node_name}})
+    MERGE (p)-[:{rel_type}]->(n)
+"""
+    for label, rel_type in _PROJECT_NODE_REL_TYPES.items()
+}
+
+# All summary nodes, milestone PART_OF links and milestone REQUIRES skill
+# links in one statement, with one unit subquery per label. A milestone
+# requires every skill whose name it contains, ignoring case.
+_UPSERT_PROJECT_NODES_QUERY = (
+    "\n    MATCH (p:Project {id: $project_id})"
+    + "".join(
+        _PROJECT_NODE_UPSERT_SUBQUERY.replace("{label}", label)
+        .replace("{rel_type}", rel_type)
+        .replace(
+            "{extra}",
+            "\n        MERGE (n)-[:PART_OF]->(p)" if label == "Milestone" else "",
+        )
+        for label, rel_type in _PROJECT_NODE_REL_TYPES.items()
+    )
+    + """
+    CALL () {
+        UNWIND $by_label.Milestone as milestone
+        UNWIND $by_label.Skill as skill
+        WITH milestone, skill
+        WHERE toLower(milestone.name) CONTAINS toLower(skill.name)
+        MATCH (m:Milestone {name: milestone.name})
+        MATCH (s:Skill {name: skill.name})
+        MERGE (m)-[:REQUIRES]->(s)
+        RETURN count(DISTINCT [milestone.name, skill.name]) as requires
+    }
+    RETURN requires
+"""
+)
+
+# Reads shared by Neo4jClient and AsyncNeo4jClient. Chat messages are
+# numbered per session by seq; messages written before seq existed have
+# none and all precede numbered ones, so they sort first by timestamp.
+# A since_seq page therefore only ever holds numbered messages. Timestamps
+# come back as DateTime and are formatted by _format_timestamps.
+_CHAT_HISTORY_QUERY = """
+    MATCH (s:ChatSession {id: $session_id})-[:HAS_MESSAGE]->(m:ChatMessage)
+    WHERE $since_seq IS NULL OR m.seq > $since_seq
+    RETURN m.role as role, m.content as content, m.timestamp as timestamp,
+           m.request_id as request_id, m.seq as seq
+    ORDER BY COALESCE(m.seq, 0), m.timestamp
+"""
+
+_PROJECT_CHAT_HISTORY_QUERY = """
+    MATCH (p:ProjectSummary {id: $project_id})-[:HAS_PROJECT_MESSAGE]->(m:ProjectMessage)
+    WHERE $since_idx IS NULL OR m.idx > $since_idx
+    RETURN m.role as role, m.content as content, m.timestamp as timestamp, m.request_id as request_id, m.idx as idx
+    ORDER BY m.idx ASC
+"""
+
+_PENDING_PROPOSALS_QUERY = """
+    MATCH (s:ChatSession {id: $session_id})
+    RETURN s.pending_proposals as pending_proposals
+"""
+
+_PROJECT_LESSONS_QUERY = """
+    MATCH (p:ProjectSummary {id: $project_id})-[:HAS_LESSON]->(l:ProjectLesson)
+    RETURN l.id as id, l.node_id as node_id, l.title as title, 
+           l.explanation as explanation, l.task as task, 
+           l.created_at as created_at, 
+           coalesce(l.archived, false) as archived, 
+           l.archived_at as archived_at
+    ORDER BY l.created_at DESC
+"""
+
+_CREATE_CHAT_SESSION_QUERY = """
+    MERGE (s:ChatSession {id: $session_id})
+    ON CREATE SET s.created_at = datetime(),
+                  s.pending_proposals = '[]'
+"""
+
+# Messages are deleted with their session in the same statement
+_DELETE_CHAT_SESSION_QUERY = """
+    MATCH (s:ChatSession {id: $session_id})
+    CALL (s) {
+        MATCH (s)-[:HAS_MESSAGE]->(m:ChatMessage)
+        DETACH DELETE m
+        RETURN count(m) as message_count
+    }
+    DETACH DELETE s
+    RETURN message_count
+"""
+
+# Appends to an existing session only, so a reply that lands after the
+# session was deleted is dropped instead of recreating it. New sessions
+# come from create_chat_session or the first turn, see _BEGIN_CHAT_TURN_QUERY.
+# The counter is bumped before it is read, so the session's write lock is
+# held first and concurrent appends never share a seq.
+_ADD_CHAT_MESSAGES_QUERY = """
+    MATCH (s:ChatSession {id: $session_id})
+    SET s.msg_count = COALESCE(s.msg_count, 0) + size($messages)
+    WITH s, s.msg_count - size($messages) as base
+    UNWIND range(0, size($messages) - 1) as i
+    WITH s, base + i + 1 as seq, $messages[i] as msg
+    CREATE (m:ChatMessage {
+        role: msg.role,
+        content: msg.content,
+        timestamp: datetime(msg.timestamp),
+        request_id: msg.request_id,
+        seq: seq
+    })
+    CREATE (s)-[:HAS_MESSAGE]->(m)
+"""
+
+# Opens a chat turn in one transaction: the session is created if needed,
+# and only when it is unlocked, has no pending proposals and has not seen
+# this request_id is the user message stored, the session locked and the
+# history (including the new message) returned.
+_BEGIN_CHAT_TURN_QUERY = """
+    MERGE (s:ChatSession {id: $session_id})
+    ON CREATE SET s.created_at = datetime(),
+                  s.pending_proposals = '[]'
+    WITH s,
+         $respect_lock AND COALESCE(s.is_processing, false) as locked,
+         s.pending_proposals IS NOT NULL
+             AND NOT trim(s.pending_proposals) IN ['', '[]', 'null'] as has_proposals,
+         EXISTS {
+             MATCH (s)-[:HAS_MESSAGE]->(:ChatMessage {request_id: $request_id})
+         } as duplicate
+    WITH s, CASE
+        WHEN locked THEN 'locked'
+        WHEN has_proposals THEN 'pending_proposals'
+        WHEN duplicate THEN 'duplicate'
+        ELSE 'started'
+    END as status
+    CALL (s, status) {
+        WITH s WHERE status = 'started'
+        SET s.msg_count = COALESCE(s.msg_count, 0) + 1,
+            s.is_processing = true
+        CREATE (m:ChatMessage {
+            role: 'user',
+            content: $content,
+            timestamp: datetime($timestamp),
+            request_id: $request_id,
+            seq: s.msg_count
+        })
+        CREATE (s)-[:HAS_MESSAGE]->(m)
+    }
+    CALL (s, status) {
+        OPTIONAL MATCH (s)-[:HAS_MESSAGE]->(m:ChatMessage)
+        WHERE status = 'started'
+        WITH m ORDER BY COALESCE(m.seq, 0), m.timestamp
+        RETURN collect(m {
+            .role, .content, .request_id, .seq, .timestamp
+        }) as history
+    }
+    RETURN status, history
+"""
+
+# Assessment, submission and evaluation statements
+_SAVE_PROJECT_ASSESSMENTS_QUERY = """
+    UNWIND $rows as row
+    MATCH (ps:ProjectSummary {id: row.project_id})-[:SUMMARY_FOR]->(p:Project)
+    CREATE (a:ProjectAssessment {
+        id: row.assessment_id,
+        lesson_id: row.lesson_id,
+        prompt: row.prompt,
+        status: 'pending',
+        archived: false,
+        created_at: datetime(),
+        updated_at: datetime()
+    })
+    CREATE (ps)-[:HAS_ASSESSMENT]->(a)
+    CREATE (p)-[:HAS_ASSESSMENT]->(a)
+    WITH a, row
+    MATCH (l:ProjectLesson {id: row.lesson_id})
+    CREATE (a)-[:ASSESSMENT_FOR]->(l)
+"""
+
+_CREATE_PROJECT_SUBMISSIONS_QUERY = """
+    UNWIND $rows as row
+    MATCH (ps:ProjectSummary {id: row.project_id})-[:SUMMARY_FOR]->(p:Project)
+    CREATE (s:ProjectSubmission {
+        id: row.submission_id,
+        project_id: row.project_id,
+        content: row.content,
+        attempt_number: row.attempt_number,
+        status: 'pending',
+        submitted_at: datetime()
+    })
+    CREATE (ps)-[:HAS_SUBMISSION]->(s)
+    CREATE (p)-[:HAS_SUBMISSION]->(s)
+"""
+
+_LIST_PROJECT_ASSESSMENTS_QUERY = """
+    MATCH (p:ProjectSummary {id: $project_id})-[:HAS_ASSESSMENT]->(a:ProjectAssessment)
+    RETURN a.id as id, a.lesson_id as lesson_id, a.prompt as prompt, 
+           a.status as status, a.feedback as feedback, 
+           a.created_at as created_at, a.updated_at as updated_at, 
+           coalesce(a.archived, false) as archived, 
+           a.archived_at as archived_at
+    ORDER BY a.created_at DESC
+"""
+
+# Columns shared by the submission reads
+_SUBMISSION_FIELDS = (
+    "s.id as id, s.project_id as project_id, s.content as content, "
+    "s.attempt_number as attempt_number, s.status as status, "
+    "s.score as score, s.passed as passed, s.feedback as feedback, "
+    "s.submitted_at as submitted_at, s.evaluated_at as evaluated_at"
+)
+
+# Anchored on the (project_id, submitted_at) index so the rows come back in
+# sort order; the EXISTS keeps submissions of a deleted project out
+_LIST_PROJECT_SUBMISSIONS_QUERY = f"""
+    MATCH (s:ProjectSubmission {{project_id: $project_id}})
+    WHERE s.submitted_at IS NOT NULL
+      AND EXISTS {{ (:ProjectSummary {{id: $project_id}})-[:HAS_SUBMISSION]->(s) }}
+    RETURN {_SUBMISSION_FIELDS}
+    ORDER BY s.submitted_at DESC
+"""
+
+_PROJECT_SUBMISSION_COUNT_QUERY = """
+    MATCH (ps:ProjectSummary {id: $project_id})-[:HAS_SUBMISSION]->(s:ProjectSubmission)
+    RETURN count(s) as submission_count
+"""
+
+_GET_SUBMISSION_QUERY = f"""
+    MATCH (s:ProjectSubmission {{id: $submission_id}})
+    RETURN {_SUBMISSION_FIELDS}
+"""
+
+_SAVE_SUBMISSION_EVALUATION_QUERY = """
+    MATCH (s:ProjectSubmission {id: $submission_id})
+    SET s.status = 'evaluated',
+        s.score = $score,
+        s.passed = $passed,
+        s.feedback = $overall_feedback,
+        s.evaluated_at = datetime()
+    WITH s
+    CREATE (e:ProjectEvaluation {
+        id: $evaluation_id,
+        submission_id: $submission_id,
+        score: $score,
+        rubric: $rubric,
+        skill_evidence: $skill_evidence,
+        overall_feedback: $overall_feedback,
+        suggestions: $suggestions,
+        passed: $passed,
+        model_used: $model_used,
+        prompt_version: $prompt_version,
+        evaluated_at: datetime()
+    })
+    CREATE (s)-[:HAS_EVALUATION]->(e)
+    WITH s, e
+    MATCH (ps:ProjectSummary {id: s.project_id})-[:SUMMARY_FOR]->(p:Project)
+    CREATE (p)-[:HAS_EVALUATION]->(e)
+    CREATE (ps)-[:HAS_EVALUATION]->(e)
+"""
+
+_UPDATE_SUBMISSION_STATUS_QUERY = """
+    MATCH (s:ProjectSubmission {id: $submission_id})
+    SET s.status = $status,
+        s.evaluated_at = datetime()
+    FOREACH (_ IN CASE WHEN $feedback IS NULL THEN [] ELSE [1] END |
+        SET s.feedback = $feedback
+    )
+"""
+
+_UPDATE_PROJECT_SUMMARY_JSON_QUERY = """
+    MATCH (p:ProjectSummary {id: $project_id})
+    SET p.summary_json = $summary_json,
+        p.session_id = $session_id,
+        p.norm_title = $norm_title,
+        p.norm_desc_200 = $norm_desc_200,
+        p.updated_at = datetime()
+"""
+
+_UPDATE_PROJECT_CAPSTONE_STATE_QUERY = """
+    MATCH (ps:ProjectSummary {id: $project_id})
+    SET ps.capstone_status = $status,
+        ps.capstone_score = $score,
+        ps.updated_at = datetime()
+    WITH ps
+    MATCH (ps)-[:SUMMARY_FOR]->(p:Project)
+    SET p.capstone_status = $status,
+        p.capstone_score = $score,
+        p.updated_at = datetime()
+    FOREACH (_ IN CASE WHEN $completed_at IS NULL THEN [] ELSE [1] END |
+        SET ps.capstone_completed_at = datetime($completed_at),
+            p.capstone_completed_at = datetime($completed_at)
+    )
+"""
+
+_LIST_SUBMISSION_EVALUATIONS_QUERY = """
+    MATCH (s:ProjectSubmission {id: $submission_id})-[:HAS_EVALUATION]->(e:ProjectEvaluation)
+    RETURN e.id as id,
+           e.score as score,
+           e.rubric as rubric,
+           e.skill_evidence as skill_evidence,
+           e.overall_feedback as overall_feedback,
+           e.suggestions as suggestions,
+           e.passed as passed,
+           e.model_used as model_used,
+           e.prompt_version as prompt_version,
+           e.evaluated_at as evaluated_at
+    ORDER BY e.evaluated_at DESC
+"""
+
+_UPDATE_PROJECT_ASSESSMENT_QUERY = """
+    MATCH (a:ProjectAssessment {id: $assessment_id})
+    SET a.status = $status,
+        a.feedback = $feedback,
+        a.answer = $answer,
+        a.updated_at = datetime()
+    FOREACH (_ IN CASE WHEN $archived IS NULL THEN [] ELSE [1] END |
+        SET a.archived = $archived,
+            a.archived_at = CASE WHEN $archived THEN datetime() ELSE null END
+    )
+"""
+
+_ARCHIVE_PROJECT_ASSESSMENT_QUERY = """
+    MATCH (p:ProjectSummary {id: $project_id})-[:HAS_ASSESSMENT]->(a:ProjectAssessment {id: $assessment_id})
+    SET a.archived = true,
+        a.archived_at = datetime()
+"""
+
+_DELETE_PROJECT_ASSESSMENT_QUERY = """
+    MATCH (p:ProjectSummary {id: $project_id})-[:HAS_ASSESSMENT]->(a:ProjectAssessment {id: $assessment_id})
+    DETACH DELETE a
+"""
+
+# Neo4j 5 element ids look like "4:c0a8f1e2-...-9d3b:17"
+_ELEMENT_ID_PATTERN = re.compile(
+    r"\d+:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}:\d+"
+)
+
+
+def _is_element_id(key: str) -> bool:
+    """Tell whether a node key is a Neo4j element id rather than an id property."""
+    return bool(_ELEMENT_ID_PATTERN.fullmatch(key))
+
+
+def _key_predicate(variable: str, param: str, element_id: bool) -> str:
+    """
+    Build the predicate matching a node by a key that is either its id
+    property or its element id.
+
+    Queries taking such keys are kept as ``{element_id: query}`` pairs and
+    picked with _is_element_id, so each plan does a single lookup instead
+    of evaluating both sides of an OR.
+    """
+    if element_id:
+        return f"elementId({variable}) = ${param}"
+    return f"{variable}.id = ${param}"
+
+
+# Keyed on whether the project key and the target key are element ids.
+# The lesson is created even when no target matches.
+_CREATE_REMEDIATION_NODE_QUERIES = {
+    (project_element_id, target_element_id): f"""
+    MATCH (ps:ProjectSummary)-[:SUMMARY_FOR]->(p:Project)
+    WHERE {_key_predicate("ps", "project_id", project_element_id)}
+    CREATE (r:ProjectLesson:Concept {{
+        id: $node_id,
+        title: $title,
+        name: $title,
+        description: $description,
+        explanation: $explanation,
+        diagnosis: $diagnosis,
+        severity: $severity,
+        before_node_id: $before_node_id,
+        triggered_by_assessment: $triggered_by_assessment,
+        node_type: 'remediation',
+        is_remediation: true,
+        created_at: datetime(),
+        archived: false,
+        version: 1
+    }})
+    CREATE (p)-[:HAS_LESSON {{version: 1, created_at: datetime()}}]->(r)
+    CREATE (ps)-[:HAS_LESSON]->(r)
+    WITH r
+    MATCH (target)
+    WHERE {_key_predicate("target", "before_node_id", target_element_id)}
+    CREATE (r)-[:PREREQUISITE_FOR {{version: 1, created_at: datetime()}}]->(target)
+"""
+    for project_element_id in (False, True)
+    for target_element_id in (False, True)
+}
+
+# A remediation node by id, from an id lookup on each label
+_GET_REMEDIATION_NODE_QUERY = """
+    CALL () {
+        MATCH (r:RemediationConcept {id: $node_id})
+        RETURN r
+        UNION
+        MATCH (r:ProjectLesson {id: $node_id})
+        WHERE r.is_remediation = true
+        RETURN r
+    }
+    RETURN r.id as id,
+           COALESCE(r.title, r.name) as name,
+           r.description as description,
+           r.explanation as explanation,
+           r.diagnosis as diagnosis,
+           r.severity as severity,
+           r.before_node_id as before_node_id,
+           r.triggered_by_assessment as triggered_by_assessment,
+           r.created_at as created_at
+"""
+
+# Old RemediationConcept nodes and new ProjectLesson nodes with
+# is_remediation=true, one label-specific branch each
+_LIST_REMEDIATION_NODES_QUERY = """
+    MATCH (ps:ProjectSummary {id: $project_id})
+    CALL (ps) {
+        MATCH (ps)-[:HAS_REMEDIATION]->(r:RemediationConcept)
+        RETURN r
+        UNION
+        MATCH (ps)-[:HAS_LESSON]->(r:ProjectLesson)
+        WHERE r.is_remediation = true
+        RETURN r
+    }
+    RETURN r.id as id,
+           COALESCE(r.title, r.name) as name,
+           r.description as description,
+           r.explanation as explanation,
+           r.diagnosis as diagnosis,
+           r.severity as severity,
+           r.before_node_id as before_node_id,
+           r.triggered_by_assessment as triggered_by_assessment,
+           r.created_at as created_at
+    ORDER BY r.created_at DESC
+"""
+
+_TRACK_REMEDIATION_EVENTS_QUERY = """
+    UNWIND $rows as row
+    MATCH (ps:ProjectSummary {id: row.project_id})
+    CREATE (e:RemediationEvent {
+        id: row.event_id,
+        project_id: row.project_id,
+        assessment_id: row.assessment_id,
+        remediation_node_id: row.remediation_node_id,
+        diagnosis_summary: row.diagnosis_summary,
+        severity: row.severity,
+        created_at: datetime(row.created_at)
+    })
+    CREATE (ps)-[:HAS_REMEDIATION_EVENT]->(e)
+"""
+
+_PROJECT_GRAPH_COUNTS_QUERY = """
+    MATCH (p:Project {id: $project_id})
+    CALL (p) {
+        MATCH (p)-[:HAS_NODE|HAS_SKILL|HAS_CONCEPT|HAS_TOPIC|HAS_MILESTONE]->(n)
+        RETURN count(DISTINCT n) as node_count
+    }
+    RETURN node_count, COUNT { (p)-->() } as rel_count
+"""
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the Neo4j values JSON encoders do not know, see json_dumps."""
+    if isinstance(value, DateTime):
+        return _format_datetime(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_dumps(value: Any) -> str:
+    """
+    Serialize a value to a JSON string, using orjson when installed.
+
+    Neo4j DateTime values are encoded in place as ISO-8601 UTC strings,
+    so rows can be dumped straight from the driver without a separate
+    _serialize_neo4j_value walk.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_json_default).decode()
+    return json.dumps(value, default=_json_default)
+
+
+def _json_loads(raw: Any) -> Any:
+    """
+    Parse a JSON string, using orjson when installed.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+    the same exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+_LIST_PROJECT_SUMMARIES_QUERY = """
+    MATCH (p:ProjectSummary)
+    RETURN p.id as id, p.project_name as name, p.created_at as created_at, p.updated_at as updated_at
+    ORDER BY p.created_at DESC
+    LIMIT $limit
+"""
+
+# Summary payloads for the listed projects whose revision is not parsed yet
+_PROJECT_SUMMARY_JSON_QUERY = """
+    MATCH (p:ProjectSummary)
+    WHERE p.id IN $project_ids
+    RETURN p.id as id, p.summary_json as summary_json
+"""
+
+
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _format_datetime(value: DateTime) -> str:
+    # Same output as strftime("%Y-%m-%dT%H:%M:%S.%fZ") without converting
+    # to a native datetime and parsing the format string on every call
+    return (
+        f"{value.year:04d}-{value.month:02d}-{value.day:02d}"
+        f"T{value.hour:02d}:{value.minute:02d}:{value.second:02d}"
+        f".{value.nanosecond // 1000:06d}Z"
+    )
+
+
+def _serialize_list(value: list) -> list:
+    return [_serialize_neo4j_value(item) for item in value]
+
+
+def _serialize_dict(value: dict) -> dict:
+    return {k: _serialize_neo4j_value(v) for k, v in value.items()}
+
+
+_VALUE_SERIALIZERS = {
+    DateTime: _format_datetime,
+    list: _serialize_list,
+    dict: _serialize_dict,
+}
 
 
 def _serialize_neo4j_value(value: Any) -> Any:
     """Serialize Neo4j types to JSON-compatible Python types."""
+    value_type = type(value)
+    if value_type in _SCALAR_TYPES:
+        return value
+    serializer = _VALUE_SERIALIZERS.get(value_type)
+    if serializer is not None:
+        return serializer(value)
+    # Subclasses miss the exact-type lookup above
     if isinstance(value, DateTime):
-        return value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-    elif isinstance(value, list):
-        return [_serialize_neo4j_value(item) for item in value]
-    elif isinstance(value, dict):
-        return {k: _serialize_neo4j_value(v) for k, v in value.items()}
+        return _format_datetime(value)
+    if isinstance(value, list):
+        return _serialize_list(value)
+    if isinstance(value, dict):
+        return _serialize_dict(value)
     return value
 
 
+# Keys of a flat node row that describe the node rather than its properties
+_NODE_META_KEYS = ("id", "labels")
+# Only the fields the project node listing renders are fetched; the rows
+# are flat projections that _serialize_node turns into the usual shape.
+_PROJECT_NODE_FIELDS = (
+    "coalesce(n.id, elementId(n)) AS id, n.name AS name, "
+    "labels(n) AS labels, n.updated_at AS updated_at"
+)
+
+# Relationship types pointing from a prerequisite to the node needing it
+_PREREQUISITE_REL_TYPES = ["PREREQUISITE_FOR", "REQUIRES", "DEPENDS_ON"]
+
+_PREREQUISITE_NODES_QUERIES = {
+    element_id: f"""
+    MATCH (prereq)-[:{"|".join(_PREREQUISITE_REL_TYPES)}]->(n)
+    WHERE {_key_predicate("n", "node_id", element_id)}
+    RETURN COALESCE(prereq.id, elementId(prereq)) as id,
+           prereq.name as name,
+           labels(prereq) as labels
+"""
+    for element_id in (False, True)
+}
+
+_GET_NODE_QUERIES = {
+    element_id: f"MATCH (n) WHERE {_key_predicate('n', 'node_id', element_id)} RETURN {_node_map('n')} as n"
+    for element_id in (False, True)
+}
+
+# Relationships are counted and deleted in the same statement
+_DELETE_NODE_QUERIES = {
+    element_id: f"""
+    MATCH (n)
+    WHERE {_key_predicate("n", "node_id", element_id)}
+    WITH n, COUNT {{ (n)--() }} as rel_count
+    DETACH DELETE n
+    RETURN sum(rel_count) as rel_count
+"""
+    for element_id in (False, True)
+}
+
+# Keyed on whether the source key and the target key are element ids.
+# The type is a parameter, so every relationship type shares one plan.
+_DELETE_RELATIONSHIP_QUERIES = {
+    (source_element_id, target_element_id): f"""
+    MATCH (n)-[r:$($rel_type)]->(m)
+    WHERE {_key_predicate("n", "source_id", source_element_id)}
+      AND {_key_predicate("m", "target_id", target_element_id)}
+    DELETE r
+    RETURN count(r) as deleted_count
+"""
+    for source_element_id in (False, True)
+    for target_element_id in (False, True)
+}
+
+_CONNECTED_NODES_QUERIES = {
+    element_id: f"""
+    MATCH (n)-[r]-(connected)
+    WHERE {_key_predicate("n", "node_id", element_id)}
+    RETURN COALESCE(connected.id, elementId(connected)) as id, labels(connected) as labels, type(r) as rel_type
+"""
+    for element_id in (False, True)
+}
+
+_SAVE_PROJECT_LESSON_QUERIES = {
+    element_id: f"""
+    MATCH (ps:ProjectSummary {{id: $project_id}})-[:SUMMARY_FOR]->(p:Project)
+    CREATE (l:ProjectLesson {{
+        id: $lesson_id,
+        node_id: $node_id,
+        title: $title,
+        explanation: $explanation,
+        task: $task,
+        lesson_index: $lesson_index,
+        archived: false,
+        created_at: datetime()
+    }})
+    CREATE (ps)-[:HAS_LESSON]->(l)
+    CREATE (p)-[:HAS_LESSON]->(l)
+    WITH p, l
+    OPTIONAL MATCH (n)
+    WHERE {_key_predicate("n", "node_id", element_id)}
+    WITH p, l, n, CASE
+        WHEN n:Skill THEN 'HAS_SKILL'
+        WHEN n:Concept THEN 'HAS_CONCEPT'
+        WHEN n:Topic THEN 'HAS_TOPIC'
+        WHEN n:Milestone THEN 'HAS_MILESTONE'
+        ELSE 'HAS_NODE'
+    END as rel_type
+    FOREACH (_ IN CASE WHEN n IS NULL THEN [] ELSE [1] END |
+        MERGE (l)-[:ABOUT]->(n)
+        MERGE (p)-[:$(rel_type)]->(n)
+    )
+"""
+    for element_id in (False, True)
+}
+
+_PROJECTS_FOR_NODE_QUERIES = {
+    element_id: f"""
+    MATCH (p:Project)-[:HAS_NODE|HAS_SKILL|HAS_CONCEPT|HAS_TOPIC|HAS_MILESTONE]->(n)
+    WHERE {_key_predicate("n", "node_id", element_id)} OR n.name = $node_name
+    RETURN DISTINCT p.id as id, p.is_default as is_default, p.created_at as created_at
+    ORDER BY p.is_default ASC, p.created_at ASC
+"""
+    for element_id in (False, True)
+}
+
+# Relationship types linking a project to its KG nodes
+_PROJECT_LINK_TYPES = ["HAS_SKILL", "HAS_CONCEPT", "HAS_TOPIC", "HAS_MILESTONE", "HAS_NODE"]
+
+# Nodes linked to the project, or, for projects with no links yet, the
+# nodes its lessons are about. Filtering on type(r) rather than a type
+# pattern avoids unknown-type warnings on graphs without some link types.
+_LIST_PROJECT_NODES_QUERY = f"""
+    MATCH (p:Project {{id: $project_id}})
+    CALL (p) {{
+        MATCH (p)-[r]->(n)
+        WHERE type(r) IN $rel_types
+        RETURN collect(DISTINCT n) as linked
+    }}
+    CALL (p, linked) {{
+        WITH p WHERE size(linked) = 0
+        MATCH (p)-[:HAS_LESSON]->(:ProjectLesson)-[:ABOUT]->(n)
+        RETURN collect(DISTINCT n) as taught
+    }}
+    UNWIND linked + taught as n
+    RETURN DISTINCT {_PROJECT_NODE_FIELDS}
+    ORDER BY name ASC
+"""
+
+
 def _serialize_node(node) -> dict:
     """Serialize a Neo4j Node object to a dictionary."""
     if isinstance(node, dict):
-        properties = node.get("properties")
+        node_get = node.get
+        properties = node_get("properties")
         if isinstance(properties, dict):
             return {
-                "id": node.get("id") or node.get("element_id"),
-                "labels": node.get("labels", []),
+                "id": node_get("id") or node_get("element_id"),
+                "labels": node_get("labels", []),
                 "properties": _serialize_neo4j_value(properties),
             }
+        properties = dict(node)
+        for key in _NODE_META_KEYS:
+            properties.pop(key, None)
         return {
-            "id": node.get("id") or node.get("element_id"),
-            "labels": node.get("labels", []),
-            "properties": _serialize_neo4j_value({k: v for k, v in node.items() if k not in ("id", "labels")}),
+            "id": node_get("id") or node_get("element_id"),
+            "labels": node_get("labels", []),
+            "properties": _serialize_neo4j_value(properties),
         }
     node_id = None
     try:
@@ -56,19 +1227,199 @@ def _serialize_node(node) -> dict:
     }
 
 
+def _serialize_node_result(result: Result) -> list[dict]:
+    """Serialize the ``n`` column of every record as it is streamed."""
+    return [_serialize_node(record["n"]) for record in result]
+
+
+def _serialize_project_graph(result: Result) -> dict:
+    """Serialize the single nodes/relationships record of a project graph read."""
+    record = result.single()
+    if record is None:
+        return {"nodes": [], "relationships": []}
+    return {
+        "nodes": [_serialize_node(node) for node in record["nodes"]],
+        "relationships": record["relationships"],
+    }
+
+
+# ASCII input (the common case) is slugified by a single C-level translate:
+# alphanumerics are kept, spaces/underscores become dashes, the rest dropped.
+_ASCII_SLUG_TABLE = str.maketrans(
+    {
+        code: None
+        for code in range(128)
+        if not chr(code).isalnum() and chr(code) not in " -_"
+    }
+    | {ord(" "): "-", ord("_"): "-"}
+)
+# \w is exactly str.isalnum() plus "_", so this drops the same characters
+# for non-ASCII input.
+_SLUG_DROP_RE = re.compile(r"[^\w \-]+")
+_SLUG_SEPARATOR_RE = re.compile(r"[ _]")
+_SLUG_DASHES_RE = re.compile(r"-{2,}")
+
+
+# Node names repeat across summaries and retries of the same summary
+@lru_cache(maxsize=4096)
 def _slugify(value: str) -> str:
-    safe = []
-    for ch in value.lower().strip():
-        if ch.isalnum():
-            safe.append(ch)
-        elif ch in {" ", "-", "_"}:
-            safe.append("-")
-    slug = "".join(safe).strip("-")
-    while "--" in slug:
-        slug = slug.replace("--", "-")
+    slug = value.lower().strip()
+    if slug.isascii():
+        slug = slug.translate(_ASCII_SLUG_TABLE)
+    else:
+        slug = _SLUG_SEPARATOR_RE.sub("-", _SLUG_DROP_RE.sub("", slug))
+    slug = slug.strip("-")
+    if "--" in slug:
+        slug = _SLUG_DASHES_RE.sub("-", slug)
     return slug or "node"
 
 
+def _summary_match_keys(summary_json: str) -> dict:
+    """
+    Derive the duplicate-lookup keys stored alongside a summary.
+
+    Empty values become None so Neo4j leaves the property unset and an
+    empty title or description never matches another one.
+    """
+    keys = {"session_id": None, "norm_title": None, "norm_desc_200": None}
+    try:
+        summary = _json_loads(summary_json)
+    except (json.JSONDecodeError, TypeError):
+        return keys
+    if not isinstance(summary, dict):
+        return keys
+    keys["session_id"] = summary.get("session_id")
+    agreed = summary.get("agreed_project", {})
+    if isinstance(agreed, dict):
+        keys["norm_title"] = str(agreed.get("name", "")).strip().lower() or None
+        keys["norm_desc_200"] = str(agreed.get("description", "")).strip().lower()[:200] or None
+    return keys
+
+
+def _freeze_json(value: Any) -> Any:
+    """Make parsed JSON read-only: dicts become mapping proxies, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze_json(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze_json(item) for item in value)
+    return value
+
+
+# Parsed summaries keyed on (project_id, updated_at). Every summary write
+# bumps updated_at, so a stale entry is simply never looked up again.
+_SUMMARY_CACHE: dict[tuple[str, str], Mapping[str, Any]] = {}
+_SUMMARY_CACHE_LOCK = threading.Lock()
+
+
+def _parsed_summary(project_id: str, updated_at: str, raw: str) -> Mapping[str, Any]:
+    """
+    Parse a stored summary_json, cached per project revision.
+
+    The result is shared between callers, so it is frozen: nested dicts are
+    read-only mappings and lists are tuples.
+    """
+    key = (project_id, updated_at)
+    summary = _SUMMARY_CACHE.get(key)
+    if summary is not None:
+        return summary
+    try:
+        data = _json_loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        data = None
+    summary = _freeze_json(data) if isinstance(data, dict) else MappingProxyType({})
+    with _SUMMARY_CACHE_LOCK:
+        if len(_SUMMARY_CACHE) >= SUMMARY_CACHE_MAX_ENTRIES:
+            _SUMMARY_CACHE.clear()
+        _SUMMARY_CACHE[key] = summary
+    return summary
+
+
+def _format_timestamps(rows: list[dict], key: str = "timestamp") -> list[dict]:
+    """
+    Format the DateTime under ``key`` in each row in place, as the API's
+    ``%Y-%m-%dT%H:%M:%S.%fZ`` string; other values are left as they are.
+    """
+    for row in rows:
+        if isinstance(row.get(key), DateTime):
+            row[key] = _format_datetime(row[key])
+    return rows
+
+
+def _with_limit(query: str, limit: Optional[int]) -> str:
+    """Append a ``LIMIT $limit`` clause when a page size is requested."""
+    if limit is None:
+        return query
+    return query.rstrip() + "\n    LIMIT $limit\n"
+
+
+def _pending_proposals(rows: list[dict]) -> list[dict]:
+    """Decode the pending proposals stored on a chat session row."""
+    if not rows:
+        return []
+    raw = rows[0].get("pending_proposals")
+    if not raw:
+        return []
+    try:
+        data = _json_loads(raw) if isinstance(raw, str) else raw
+    except Exception:
+        return []
+    return data if isinstance(data, list) else []
+
+
+def _decode_json_object(raw: Any) -> dict:
+    """Decode a JSON object stored as a string property, or ``{}``."""
+    if not isinstance(raw, str):
+        return raw if isinstance(raw, dict) else {}
+    try:
+        data = _json_loads(raw)
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _submission_evaluation_params(
+    submission_id: str,
+    evaluation_id: str,
+    score: float,
+    rubric: Any,
+    skill_evidence: Any,
+    overall_feedback: str,
+    suggestions: list[str],
+    passed: bool,
+    model_used: str,
+    prompt_version: str,
+) -> dict:
+    """Build the parameters for _SAVE_SUBMISSION_EVALUATION_QUERY."""
+    return {
+        "submission_id": submission_id,
+        "evaluation_id": evaluation_id,
+        "score": score,
+        "rubric": json_dumps(rubric if isinstance(rubric, dict) else {}),
+        "skill_evidence": json_dumps(skill_evidence if isinstance(skill_evidence, dict) else {}),
+        "overall_feedback": overall_feedback,
+        "suggestions": suggestions,
+        "passed": passed,
+        "model_used": model_used,
+        "prompt_version": prompt_version,
+    }
+
+
+def _submission_evaluations(rows: list[dict]) -> list[dict]:
+    """Decode the JSON rubric and skill evidence of evaluation rows in place."""
+    for row in rows:
+        row["rubric"] = _decode_json_object(row.get("rubric"))
+        row["skill_evidence"] = _decode_json_object(row.get("skill_evidence"))
+    return rows
+
+
+def _project_graph_counts(rows: list[dict]) -> dict:
+    """Shape the project graph counts row."""
+    return {
+        "nodes": rows[0].get("node_count", 0) if rows else 0,
+        "relationships": rows[0].get("rel_count", 0) if rows else 0,
+    }
+
+
 class Neo4jClient:
     """
     Neo4j database client with graph operations.
@@ -87,53 +1438,53 @@ class Neo4jClient:
         self._config = neo4j_config or config.neo4j
         self._graph: Optional[Neo4jGraph] = None
         self._driver = None
-        self._last_uri: Optional[str] = None
-        self._last_user: Optional[str] = None
+        # Overrides in effect when each connection was last validated, and
+        # the _connection_key the graph was built for. Overrides are immutable,
+        # so an identity match means the connection target cannot have changed.
+        self._graph_scope: Optional[Overrides] = None
+        self._graph_target: Optional[tuple[str, str, str, str]] = None
+        self._driver_scope: Optional[Overrides] = None
+        # Schema names seen in the database, see label_exists
+        self._labels: Optional[frozenset[str]] = None
+        self._relationship_types: Optional[frozenset[str]] = None
+        self._relationship_types_at = 0.0
+        # Remediation events waiting to be written, see track_remediation_event
+        self._event_buffer: list[dict] = []
+        self._event_buffer_lock = threading.Lock()
     
     @property
     def graph(self) -> Neo4jGraph:
         """Get or create LangChain Neo4jGraph instance."""
-        current_uri = self._config.uri
-        current_user = self._config.username
-        
-        if self._graph is not None and (current_uri != self._last_uri or current_user != self._last_user):
-            self._graph = None
+        scope = REQUEST_OVERRIDES.get()
+        if self._graph is not None and scope is self._graph_scope:
+            return self._graph
+
+        target = _connection_key(self._config)
+        if self._graph is None or target != self._graph_target:
+            # Imported here so processes that never add graph documents do
+            # not pay for loading LangChain
+            from langchain_neo4j import Neo4jGraph
 
-        if self._graph is None:
             self._graph = Neo4jGraph(
-                url=current_uri,
-                username=current_user,
+                url=self._config.uri,
+                username=self._config.username,
                 password=self._config.password,
                 database=self._config.database,
                 refresh_schema=False,
             )
-            self._last_uri = current_uri
-            self._last_user = current_user
+            self._graph_target = target
+        self._graph_scope = scope
         return self._graph
     
     @property
-    def driver(self):
-        """Get or create Neo4j driver for direct queries."""
-        current_uri = self._config.uri
-        current_user = self._config.username
-        
-        if self._driver is not None and (current_uri != self._last_uri or current_user != self._last_user):
-            try:
-                self._driver.close()
-            except Exception:
-                pass
-            self._driver = None
-
-        if self._driver is None:
-            # Suppress notifications about non-existent labels/properties/relationship types
-            # These are informational warnings that occur when querying fresh databases
-            self._driver = GraphDatabase.driver(
-                current_uri,
-                auth=(current_user, self._config.password),
-                notifications_disabled_categories=["UNRECOGNIZED", "DEPRECATION"],
-            )
-            self._last_uri = current_uri
-            self._last_user = current_user
+    def driver(self) -> Driver:
+        """Get the shared Neo4j driver for the current connection target."""
+        scope = REQUEST_OVERRIDES.get()
+        if self._driver is not None and scope is self._driver_scope:
+            return self._driver
+
+        self._driver = _shared_driver(self._config)
+        self._driver_scope = scope
         return self._driver
     
     def test_connection(self) -> bool:
@@ -144,7 +1495,7 @@ class Neo4jClient:
             True if connection successful, raises exception otherwise.
         """
         try:
-            self.graph.query("RETURN 1 as test")
+            self._read("RETURN 1 as test")
             return True
         except Exception as e:
             raise ConnectionError(f"Failed to connect to Neo4j: {e}")
@@ -152,7 +1503,11 @@ class Neo4jClient:
     def query(self, cypher: str, params: Optional[dict] = None) -> list[dict]:
         """
         Execute a Cypher query.
-        
+
+        Runs as a single managed write transaction on the pooled driver, so
+        it is retried on transient errors and routed to the cluster leader.
+        The LangChain graph is only used for add_graph_documents.
+
         Args:
             cypher: Cypher query string
             params: Optional query parameters
@@ -160,35 +1515,173 @@ class Neo4jClient:
         Returns:
             List of result dictionaries
         """
-        return self.graph.query(cypher, params or {})
+        return self.driver.execute_query(
+            cypher,
+            params or {},
+            database_=self._config.database,
+            routing_=RoutingControl.WRITE,
+            result_transformer_=Result.data,
+        )
+
+    def _run_in_batches(self, cypher: str, params: Optional[dict] = None) -> list[dict]:
+        """
+        Execute a ``CALL { ... } IN TRANSACTIONS`` statement.
+
+        Such statements commit their own batches, so they run in an
+        auto-commit transaction instead of the managed one used by query.
+
+        Args:
+            cypher: Cypher query string
+            params: Optional query parameters
+
+        Returns:
+            List of result dictionaries
+        """
+        with self.driver.session(database=self._config.database) as session:
+            return session.run(cypher, params or {}).data()
+
+    def _read(
+        self,
+        cypher: str,
+        params: Optional[dict] = None,
+        transformer: Callable[[Result], Any] = Result.data,
+    ) -> Any:
+        """
+        Execute a read-only Cypher query on the driver.
+
+        Like ``query`` but as a managed read transaction, so reads are
+        routed to read replicas in a cluster. Rows are handed to
+        ``transformer`` as they stream in. The default ``Result.data``
+        flattens nodes to property maps like ``query`` does; a custom
+        ``transformer`` sees raw driver values.
+
+        Args:
+            cypher: Cypher query string
+            params: Optional query parameters
+            transformer: Called with the streaming Result; defaults to
+                ``Result.data`` (a list of dictionaries)
+
+        Returns:
+            Whatever ``transformer`` returns
+        """
+        return self.driver.execute_query(
+            cypher,
+            params or {},
+            database_=self._config.database,
+            routing_=RoutingControl.READ,
+            result_transformer_=transformer,
+        )
+
+    def _stream(
+        self,
+        cypher: str,
+        params: Optional[dict] = None,
+        fetch_size: int = 1000,
+    ) -> Iterator[Record]:
+        """
+        Execute a read-only Cypher query and yield records as they arrive.
+
+        The session stays open until the generator is exhausted or closed,
+        so callers should consume it promptly.
+
+        Args:
+            cypher: Cypher query string
+            params: Optional query parameters
+            fetch_size: Records pulled from the server per batch
+
+        Yields:
+            Driver records
+        """
+        with self.driver.session(
+            database=self._config.database,
+            default_access_mode=READ_ACCESS,
+            fetch_size=fetch_size,
+        ) as session:
+            yield from session.run(cypher, params or {})
+
+    def _write(self, work: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run ``work(tx, *args)`` in a single managed write transaction.
+
+        Every statement ``work`` runs through ``tx`` shares one commit, and
+        the driver retries the whole function on transient errors.
+
+        Args:
+            work: Transaction function taking the transaction first
+            *args: Extra arguments passed to ``work``
+
+        Returns:
+            Whatever ``work`` returns
+        """
+        with self.driver.session(database=self._config.database) as session:
+            return session.execute_write(work, *args)
+
+    def _existing_labels(self, refresh: bool = False) -> frozenset[str]:
+        """Return the labels in use, fetched once per client unless refreshed."""
+        if self._labels is None or refresh:
+            result = self._read("CALL db.labels() YIELD label RETURN collect(label) as labels")
+            self._labels = frozenset(result[0]["labels"]) if result else frozenset()
+        return self._labels
+
+    def _existing_relationship_types(self, refresh: bool = False) -> frozenset[str]:
+        """
+        Return the relationship types in use.
+
+        The set is re-fetched when refreshed, when older than
+        RELATIONSHIP_TYPES_TTL_SECONDS, or after this client ran a write
+        that can add a type. The TTL bounds staleness from other writers.
+        """
+        now = time.monotonic()
+        if (
+            self._relationship_types is None
+            or refresh
+            or now - self._relationship_types_at > RELATIONSHIP_TYPES_TTL_SECONDS
+        ):
+            result = self._read(
+                "CALL db.relationshipTypes() YIELD relationshipType "
+                "RETURN collect(relationshipType) as types"
+            )
+            self._relationship_types = frozenset(result[0]["types"]) if result else frozenset()
+            self._relationship_types_at = now
+        return self._relationship_types
+
+    def refresh_schema(self) -> None:
+        """Re-read the label and relationship type sets, e.g. after a migration."""
+        self._existing_labels(refresh=True)
+        self._existing_relationship_types(refresh=True)
+
+    def invalidate_stats(self) -> None:
+        """
+        Drop cached graph stats for this client's database, see _cached_stats.
+
+        Entries cached under any credentials are dropped, since they all
+        describe the same data.
+        """
+        uri, _, database, _ = _connection_key(self._config)
+        with _STATS_CACHE_LOCK:
+            for key in [key for key in _STATS_CACHE if (key[0], key[2]) == (uri, database)]:
+                del _STATS_CACHE[key]
 
     def label_exists(self, label: str) -> bool:
         """Check whether a label exists in the database."""
-        result = self.query(
-            """
-            CALL db.labels() YIELD label
-            WHERE label = $label
-            RETURN count(label) as count
-            """,
-            {"label": label},
-        )
-        return bool(result and result[0].get("count", 0))
+        # A hit can be trusted; a miss re-fetches in case the label was
+        # created since the cached set was read
+        if label in self._existing_labels():
+            return True
+        return label in self._existing_labels(refresh=True)
 
     def relationship_type_exists(self, rel_type: str) -> bool:
         """Check whether a relationship type exists in the database."""
-        result = self.query(
-            """
-            CALL db.relationshipTypes() YIELD relationshipType
-            WHERE relationshipType = $rel_type
-            RETURN count(relationshipType) as count
-            """,
-            {"rel_type": rel_type},
-        )
-        return bool(result and result[0].get("count", 0))
+        if rel_type in self._existing_relationship_types():
+            return True
+        return rel_type in self._existing_relationship_types(refresh=True)
     
     def clean_graph(self) -> None:
         """Delete all nodes and relationships from the graph."""
-        self.query("MATCH (n) DETACH DELETE n")
+        self._run_in_batches(_CLEAN_GRAPH_QUERY, {"batch_size": BULK_DELETE_BATCH_SIZE})
+        self._labels = None
+        self._relationship_types = None
+        self.invalidate_stats()
     
     def clean_by_label(self, label: str) -> int:
         """
@@ -200,9 +1693,12 @@ class Neo4jClient:
         Returns:
             Number of nodes deleted
         """
-        result = self.query(
-            f"MATCH (n:{label}) DETACH DELETE n RETURN count(n) as deleted"
+        result = self._run_in_batches(
+            _CLEAN_LABEL_QUERY, {"label": label, "batch_size": BULK_DELETE_BATCH_SIZE}
         )
+        self._labels = None
+        self._relationship_types = None
+        self.invalidate_stats()
         return result[0]["deleted"] if result else 0
     
     def add_graph_documents(
@@ -224,6 +1720,8 @@ class Neo4jClient:
             include_source=include_source,
             baseEntityLabel=base_entity_label,
         )
+        self._relationship_types = None
+        self.invalidate_stats()
         for label in ("Skill", "Concept", "Topic"):
             try:
                 self.merge_nodes_simple(label, match_property="name")
@@ -242,39 +1740,10 @@ class Neo4jClient:
             Number of nodes merged
         """
         # Find duplicates and merge them
-        result = self.query(f"""
-            MATCH (n:{label})
-            WITH n.{match_property} AS prop, COLLECT(n) AS nodes
-            WHERE prop IS NOT NULL AND SIZE(nodes) > 1
-            CALL {{
-                WITH nodes
-                WITH HEAD(nodes) AS keep, TAIL(nodes) AS duplicates
-                UNWIND duplicates AS dup
-                // Transfer relationships
-                CALL {{
-                    WITH keep, dup
-                    MATCH (dup)-[r]->()
-                    WITH keep, dup, COLLECT(r) as rels
-                    UNWIND rels as r
-                    WITH keep, dup, r, STARTNODE(r) as start, ENDNODE(r) as end, TYPE(r) as type
-                    CALL apoc.create.relationship(keep, type, PROPERTIES(r), end) YIELD rel
-                    RETURN count(*) as created
-                }}
-                CALL {{
-                    WITH keep, dup
-                    MATCH ()-[r]->(dup)
-                    WITH keep, dup, COLLECT(r) as rels
-                    UNWIND rels as r
-                    WITH keep, dup, r, STARTNODE(r) as start, ENDNODE(r) as end, TYPE(r) as type
-                    CALL apoc.create.relationship(start, type, PROPERTIES(r), keep) YIELD rel
-                    RETURN count(*) as created
-                }}
-                // Delete duplicate
-                DETACH DELETE dup
-                RETURN count(*) as merged
-            }}
-            RETURN SUM(merged) as total_merged
-        """)
+        result = self.query(
+            _MERGE_NODES_QUERY, {"label": label, "match_property": match_property}
+        )
+        self.invalidate_stats()
         return result[0]["total_merged"] if result else 0
     
     def merge_nodes_simple(self, label: str, match_property: str = "id") -> int:
@@ -288,80 +1757,73 @@ class Neo4jClient:
         Returns:
             Number of duplicate nodes deleted
         """
-        duplicates = self.query(f"""
-            MATCH (n:{label})
-            WITH n.{match_property} AS prop, COLLECT(n) AS nodes
-            WHERE prop IS NOT NULL AND SIZE(nodes) > 1
-            RETURN elementId(HEAD(nodes)) as keep_id,
-                   [node IN TAIL(nodes) | elementId(node)] as dup_ids
-        """)
+        # One transaction, so the rewiring commits once and a failure
+        # part-way leaves no half-merged nodes behind
+        merged = self._write(self._merge_nodes_simple_tx, label, match_property)
+        if merged:
+            self.invalidate_stats()
+        return merged
+
+    @staticmethod
+    def _merge_nodes_simple_tx(tx, label: str, match_property: str) -> int:
+        """Transaction body for merge_nodes_simple."""
+        duplicates = tx.run(
+            _DUPLICATE_NODES_QUERY, {"label": label, "match_property": match_property}
+        ).data()
 
         if not duplicates:
             return 0
 
-        merged_count = 0
+        keep_by_dup = {}
         for row in duplicates:
-            keep_id = row.get("keep_id")
-            dup_ids = row.get("dup_ids") or []
-            for dup_id in dup_ids:
-                outgoing = self.query(
-                    """
-                    MATCH (dup)
-                    WHERE elementId(dup) = $dup_id
-                    MATCH (dup)-[r]->(m)
-                    RETURN type(r) as rel_type, properties(r) as props, elementId(m) as target_id
-                    """,
-                    {"dup_id": dup_id},
-                )
-                for rel in outgoing:
-                    rel_type = rel.get("rel_type", "")
-                    if not re.match(r"^[A-Z0-9_]+$", rel_type):
-                        continue
-                    self.query(
-                        f"""
-                        MATCH (a) WHERE elementId(a) = $from_id
-                        MATCH (b) WHERE elementId(b) = $to_id
-                        CREATE (a)-[r:{rel_type}]->(b)
-                        SET r += $props
-                        """,
-                        {"from_id": keep_id, "to_id": rel.get("target_id"), "props": rel.get("props") or {}},
-                    )
-
-                incoming = self.query(
-                    """
-                    MATCH (dup)
-                    WHERE elementId(dup) = $dup_id
-                    MATCH (m)-[r]->(dup)
-                    RETURN type(r) as rel_type, properties(r) as props, elementId(m) as source_id
-                    """,
-                    {"dup_id": dup_id},
-                )
-                for rel in incoming:
-                    rel_type = rel.get("rel_type", "")
-                    if not re.match(r"^[A-Z0-9_]+$", rel_type):
-                        continue
-                    self.query(
-                        f"""
-                        MATCH (a) WHERE elementId(a) = $from_id
-                        MATCH (b) WHERE elementId(b) = $to_id
-                        CREATE (a)-[r:{rel_type}]->(b)
-                        SET r += $props
-                        """,
-                        {"from_id": rel.get("source_id"), "to_id": keep_id, "props": rel.get("props") or {}},
-                    )
-
-                self.query(
-                    """
-                    MATCH (dup)
-                    WHERE elementId(dup) = $dup_id
-                    DETACH DELETE dup
-                    """,
-                    {"dup_id": dup_id},
-                )
-                merged_count += 1
+            keep_id = row["keep_id"]
+            for dup_id in row["dup_ids"]:
+                keep_by_dup[dup_id] = keep_id
+        if not keep_by_dup:
+            return 0
+
+        # Fetch every relationship touching a duplicate in one round-trip
+        rels = tx.run(
+            """
+            UNWIND $dup_ids AS dup_id
+            MATCH (dup)
+            WHERE elementId(dup) = dup_id
+            MATCH (dup)-[r]-(m)
+            WITH DISTINCT r
+            RETURN type(r) as rel_type,
+                   properties(r) as props,
+                   elementId(startNode(r)) as source_id,
+                   elementId(endNode(r)) as target_id
+            """,
+            {"dup_ids": list(keep_by_dup)},
+        ).data()
+
+        # Re-point both ends at the kept node; the type is a dynamic
+        # relationship type, so every type goes through one statement
+        rewired = [
+            {
+                "from_id": keep_by_dup.get(rel["source_id"], rel["source_id"]),
+                "to_id": keep_by_dup.get(rel["target_id"], rel["target_id"]),
+                "rel_type": rel["rel_type"],
+                "props": rel["props"] or {},
+            }
+            for rel in rels
+        ]
+        if rewired:
+            tx.run(_REWIRE_RELATIONSHIPS_QUERY, {"rels": rewired})
 
-        return merged_count
+        tx.run(
+            """
+            UNWIND $dup_ids AS dup_id
+            MATCH (dup)
+            WHERE elementId(dup) = dup_id
+            DETACH DELETE dup
+            """,
+            {"dup_ids": list(keep_by_dup)},
+        )
+        return len(keep_by_dup)
     
+    @_cached_stats
     def get_node_count(self, label: Optional[str] = None) -> int:
         """
         Get count of nodes.
@@ -373,11 +1835,12 @@ class Neo4jClient:
             Number of nodes
         """
         if label:
-            result = self.query(f"MATCH (n:{label}) RETURN count(n) as count")
+            result = self._read(_LABEL_NODE_COUNT_QUERY, {"label": label})
         else:
-            result = self.query("MATCH (n) RETURN count(n) as count")
+            result = self._read(_NODE_COUNT_QUERY)
         return result[0]["count"] if result else 0
     
+    @_cached_stats
     def get_relationship_count(self, rel_type: Optional[str] = None) -> int:
         """
         Get count of relationships.
@@ -389,11 +1852,12 @@ class Neo4jClient:
             Number of relationships
         """
         if rel_type:
-            result = self.query(f"MATCH ()-[r:{rel_type}]->() RETURN count(r) as count")
+            result = self._read(_TYPE_RELATIONSHIP_COUNT_QUERY, {"rel_type": rel_type})
         else:
-            result = self.query("MATCH ()-[r]->() RETURN count(r) as count")
+            result = self._read(_RELATIONSHIP_COUNT_QUERY)
         return result[0]["count"] if result else 0
     
+    @_cached_stats
     def get_graph_stats(self) -> dict:
         """
         Get statistics about the current graph.
@@ -401,44 +1865,83 @@ class Neo4jClient:
         Returns:
             Dictionary with node counts by label and relationship counts by type
         """
-        allowed_labels = ["Skill", "Concept", "Topic", "Project", "Milestone"]
-        # Get node labels and counts
-        node_stats = self.query(
-            """
-            CALL db.labels() YIELD label
-            CALL (label) {
-                MATCH (n) WHERE label IN labels(n)
-                RETURN count(n) as count
+        # One scan each over nodes and relationships. Nodes are grouped by
+        # label set first so a node with several labels counts once in the
+        # total; the per-label counts come back as [label, count] pairs.
+        # Every label and relationship type known to the database is listed,
+        # with 0 for those the scans did not count.
+        result = self._read(
+            """
+            CALL {
+                CALL db.labels() YIELD label
+                RETURN collect(label) as all_labels
             }
-            RETURN label, count
-            """
-        )
-        
-        # Get relationship types and counts
-        rel_stats = self.query(
-            """
-            CALL db.relationshipTypes() YIELD relationshipType
-            CALL (relationshipType) {
+            CALL {
+                CALL db.relationshipTypes() YIELD relationshipType
+                RETURN collect(relationshipType) as all_rel_types
+            }
+            CALL {
+                MATCH (n)
+                WITH labels(n) as labels, count(*) as count
+                WITH collect({labels: labels, count: count}) as groups, sum(count) as total_nodes
+                CALL (groups) {
+                    UNWIND groups as group
+                    UNWIND group.labels as label
+                    WITH label, sum(group.count) as count
+                    RETURN collect([label, count]) as node_counts
+                }
+                RETURN node_counts, total_nodes
+            }
+            CALL {
                 MATCH (n)-[r]->(m)
-                WHERE type(r) = relationshipType
-                  AND any(label IN labels(n) WHERE label IN $labels)
-                  AND any(label IN labels(m) WHERE label IN $labels)
-                  AND NOT (n:Project AND COALESCE(n.is_default, false))
-                  AND NOT (m:Project AND COALESCE(m.is_default, false))
-                RETURN count(r) as count
+                WITH type(r) as type,
+                     any(label IN labels(n) WHERE label IN $labels)
+                       AND any(label IN labels(m) WHERE label IN $labels)
+                       AND NOT (n:Project AND COALESCE(n.is_default, false))
+                       AND NOT (m:Project AND COALESCE(m.is_default, false)) as in_graph,
+                     count(*) as count
+                RETURN collect(CASE WHEN in_graph THEN [type, count] END) as rel_counts,
+                       sum(count) as total_relationships
             }
-            RETURN relationshipType, count
+            RETURN all_labels, all_rel_types, node_counts, total_nodes,
+                   rel_counts, total_relationships
             """,
-            {"labels": allowed_labels},
+            {"labels": _KNOWLEDGE_GRAPH_LABELS},
         )
+        row = result[0] if result else {}
+        nodes = dict.fromkeys(row.get("all_labels", []), 0)
+        nodes.update(row.get("node_counts", []))
+        relationships = dict.fromkeys(row.get("all_rel_types", []), 0)
+        relationships.update(row.get("rel_counts", []))
         
         return {
-            "nodes": {row["label"]: row["count"] for row in node_stats},
-            "relationships": {row["relationshipType"]: row["count"] for row in rel_stats},
-            "total_nodes": self.get_node_count(),
-            "total_relationships": self.get_relationship_count(),
+            "nodes": nodes,
+            "relationships": relationships,
+            "total_nodes": row.get("total_nodes", 0),
+            "total_relationships": row.get("total_relationships", 0),
         }
     
+    def iter_all_nodes(self, label: Optional[str] = None, limit: int = 100) -> Iterator[dict]:
+        """
+        Iterate over all nodes, optionally filtered by label.
+
+        Nodes are serialized as records arrive rather than after the whole
+        result has been buffered.
+
+        Args:
+            label: Optional label to filter by
+            limit: Maximum number of nodes to return
+
+        Yields:
+            Node dictionaries with id, labels, and properties
+        """
+        if label:
+            records = self._stream(_LABEL_NODES_QUERY, {"label": label, "limit": limit})
+        else:
+            records = self._stream(_ALL_NODES_QUERY, {"limit": limit})
+        for record in records:
+            yield _serialize_node(record["n"])
+
     def get_all_nodes(self, label: Optional[str] = None, limit: int = 100) -> list[dict]:
         """
         Get all nodes, optionally filtered by label.
@@ -450,13 +1953,7 @@ class Neo4jClient:
         Returns:
             List of node dictionaries with id, labels, and properties
         """
-        if label:
-            query = f"MATCH (n:{label}) RETURN n LIMIT {limit}"
-        else:
-            query = f"MATCH (n) RETURN n LIMIT {limit}"
-
-        result = self.query(query)
-        return [_serialize_node(row["n"]) for row in result]
+        return list(self.iter_all_nodes(label, limit))
 
     def get_knowledge_graph_nodes(self, limit: int = 100) -> list[dict]:
         """
@@ -468,69 +1965,31 @@ class Neo4jClient:
         Returns:
             List of node dictionaries
         """
-        allowed_labels = ["Skill", "Concept", "Topic", "Project", "Milestone"]
-        project_result = self.query(
-            """
-            MATCH (n:Project)
-            WHERE NOT COALESCE(n.is_default, false)
-            RETURN labels(n) as labels,
-                   properties(n) as properties,
-                   elementId(n) as element_id,
-                   n.id as id
-            """,
-        )
-        remaining_limit = max(limit - len(project_result), 0)
-        other_result = self.query(
-            """
-            MATCH (n)
-            WHERE any(label IN labels(n) WHERE label IN $labels)
-              AND NOT (n:Project AND COALESCE(n.is_default, false))
-            RETURN labels(n) as labels,
-                   properties(n) as properties,
-                   elementId(n) as element_id,
-                   n.id as id
-            LIMIT $limit
-            """,
-            {"limit": remaining_limit, "labels": allowed_labels},
+        return self._read(
+            _KG_NODES_QUERY,
+            {"limit": limit, "labels": _KNOWLEDGE_GRAPH_LABELS},
+            _serialize_node_result,
         )
-        combined = project_result + other_result
-        seen = set()
-        nodes = []
-        for row in combined:
-            node = _serialize_node(row)
-            node_id = node.get("id")
-            if node_id in seen:
-                continue
-            seen.add(node_id)
-            nodes.append(node)
-        return nodes
 
-    def get_knowledge_graph_relationships(self, limit: int = 100) -> list[dict]:
+    def get_knowledge_graph_relationships(
+        self, limit: int = 100, with_properties: bool = False
+    ) -> list[dict]:
         """
         Get relationships for the knowledge graph (excluding chat relationships).
 
         Args:
             limit: Maximum number of relationships to return
+            with_properties: Also return each relationship's properties
 
         Returns:
             List of relationship dictionaries
         """
-        allowed_labels = ["Skill", "Concept", "Topic", "Project", "Milestone"]
-        query = """
-            MATCH (n)-[r]->(m)
-            WHERE any(label IN labels(n) WHERE label IN $labels)
-              AND any(label IN labels(m) WHERE label IN $labels)
-              AND NOT (n:Project AND COALESCE(n.is_default, false))
-              AND NOT (m:Project AND COALESCE(m.is_default, false))
-            RETURN COALESCE(n.id, elementId(n)) as source,
-                   type(r) as type,
-                   COALESCE(m.id, elementId(m)) as target,
-                   properties(r) as properties
-            LIMIT $limit
-        """
-        result = self.query(query, {"limit": limit, "labels": allowed_labels})
-        return result
+        return self._read(
+            _KG_RELATIONSHIPS_QUERIES[with_properties],
+            {"limit": limit, "labels": _KNOWLEDGE_GRAPH_LABELS},
+        )
 
+    @_cached_stats
     def get_knowledge_graph_stats(self) -> dict:
         """
         Get statistics for the knowledge graph (excluding chat nodes).
@@ -538,68 +1997,26 @@ class Neo4jClient:
         Returns:
             Dictionary with node counts by label and relationship counts by type
         """
-        allowed_labels = ["Skill", "Concept", "Topic", "Project", "Milestone"]
-        node_stats = self.query(
-            """
-            UNWIND $labels as label
-            CALL (label) {
-                MATCH (n)
-                WHERE label IN labels(n)
-                  AND NOT (n:Project AND COALESCE(n.is_default, false))
-                RETURN count(n) as count
-            }
-            RETURN label, count
-            """,
-            {"labels": allowed_labels},
-        )
-
-        rel_stats = self.query(
-            """
-            CALL db.relationshipTypes() YIELD relationshipType
-            CALL (relationshipType) {
-                MATCH ()-[r]->() WHERE type(r) = relationshipType
-                RETURN count(r) as count
-            }
-            RETURN relationshipType, count
-            """
+        result = self._read(
+            _KG_STATS_QUERY,
+            {"labels": _KNOWLEDGE_GRAPH_LABELS, "rel_labels": _KNOWLEDGE_GRAPH_REL_LABELS},
         )
+        row = result[0] if result else {}
 
         return {
-            "nodes": {row["label"]: row["count"] for row in node_stats if row["count"] > 0},
-            "relationships": {row["relationshipType"]: row["count"] for row in rel_stats if row["count"] > 0},
-            "total_nodes": self.get_knowledge_graph_node_count(),
-            "total_relationships": self.get_knowledge_graph_relationship_count(),
+            "nodes": dict(row.get("node_counts", [])),
+            "relationships": dict(row.get("rel_counts", [])),
+            "total_nodes": row.get("total_nodes", 0),
+            "total_relationships": row.get("total_relationships", 0),
         }
 
     def get_knowledge_graph_node_count(self) -> int:
         """Get count of knowledge graph nodes (excluding chat nodes)."""
-        allowed_labels = ["Skill", "Concept", "Topic", "Project", "Milestone"]
-        result = self.query(
-            """
-            MATCH (n)
-            WHERE any(label IN labels(n) WHERE label IN $labels)
-              AND NOT (n:Project AND COALESCE(n.is_default, false))
-            RETURN count(n) as count
-            """,
-            {"labels": allowed_labels},
-        )
-        return result[0]["count"] if result else 0
+        return self.get_knowledge_graph_stats()["total_nodes"]
 
     def get_knowledge_graph_relationship_count(self) -> int:
         """Get count of knowledge graph relationships (excluding chat relationships)."""
-        allowed_labels = ["Skill", "Concept", "Topic", "Project"]
-        result = self.query(
-            """
-            MATCH (n)-[r]->(m)
-            WHERE any(label IN labels(n) WHERE label IN $labels)
-              AND any(label IN labels(m) WHERE label IN $labels)
-              AND NOT (n:Project AND COALESCE(n.is_default, false))
-              AND NOT (m:Project AND COALESCE(m.is_default, false))
-            RETURN count(r) as count
-            """,
-            {"labels": allowed_labels},
-        )
-        return result[0]["count"] if result else 0
+        return self.get_knowledge_graph_stats()["total_relationships"]
 
     def get_most_recent_project_id(self) -> Optional[str]:
         """
@@ -608,7 +2025,7 @@ class Neo4jClient:
         Returns:
             Project ID string, or None if no projects exist
         """
-        result = self.query(
+        result = self._read(
             """
             MATCH (p:Project)
             WHERE NOT COALESCE(p.is_default, false)
@@ -639,50 +2056,25 @@ class Neo4jClient:
         if project_id is None:
             return self.get_knowledge_graph_nodes(limit=limit)
         
-        allowed_labels = ["Skill", "Concept", "Topic", "Project", "Milestone"]
-        
-        # Get the project node itself
-        project_result = self.query(
+        # Project node plus its connected nodes, de-duplicated server-side
+        return self._read(
             """
             MATCH (p:Project {id: $project_id})
-            WHERE NOT COALESCE(p.is_default, false)
-            RETURN labels(p) as labels,
-                   properties(p) as properties,
-                   elementId(p) as element_id,
-                   p.id as id
-            """,
-            {"project_id": project_id},
-        )
-        
-        # Get nodes connected to this project via various relationship types
-        connected_nodes = self.query(
-            """
-            MATCH (p:Project {id: $project_id})-[:HAS_NODE|HAS_SKILL|HAS_CONCEPT|HAS_TOPIC|HAS_MILESTONE|HAS_LESSON]->(n)
+            OPTIONAL MATCH (p)-[:HAS_NODE|HAS_SKILL|HAS_CONCEPT|HAS_TOPIC|HAS_MILESTONE|HAS_LESSON]->(n)
             WHERE any(label IN labels(n) WHERE label IN $labels)
               AND NOT (n:Project AND COALESCE(n.is_default, false))
-            RETURN labels(n) as labels,
-                   properties(n) as properties,
-                   elementId(n) as element_id,
-                   n.id as id
-            LIMIT $limit
+            WITH p, COLLECT(DISTINCT n)[..$limit] as connected
+            UNWIND [p] + connected as x
+            WITH DISTINCT x
+            WHERE NOT (x:Project AND COALESCE(x.is_default, false))
+            RETURN {id: coalesce(x.id, elementId(x)), labels: labels(x), properties: properties(x)} as n
             """,
-            {"project_id": project_id, "labels": allowed_labels, "limit": limit},
+            {"project_id": project_id, "labels": _KNOWLEDGE_GRAPH_LABELS, "limit": limit},
+            _serialize_node_result,
         )
-        
-        combined = project_result + connected_nodes
-        seen = set()
-        nodes = []
-        for row in combined:
-            node = _serialize_node(row)
-            node_id = node.get("id")
-            if node_id in seen:
-                continue
-            seen.add(node_id)
-            nodes.append(node)
-        return nodes
 
     def get_knowledge_graph_relationships_for_project(
-        self, project_id: Optional[str], limit: int = 500
+        self, project_id: Optional[str], limit: int = 500, with_properties: bool = False
     ) -> list[dict]:
         """
         Get relationships for the knowledge graph filtered by project.
@@ -693,39 +2085,50 @@ class Neo4jClient:
         Args:
             project_id: Project ID to filter by, or None for all relationships
             limit: Maximum number of relationships to return
+            with_properties: Also return each relationship's properties
             
         Returns:
             List of relationship dictionaries
         """
         if project_id is None:
-            return self.get_knowledge_graph_relationships(limit=limit)
+            return self.get_knowledge_graph_relationships(limit=limit, with_properties=with_properties)
         
-        allowed_labels = ["Skill", "Concept", "Topic", "Project", "Milestone"]
+        return self._read(
+            _PROJECT_RELATIONSHIPS_QUERIES[with_properties],
+            {"project_id": project_id, "labels": _KNOWLEDGE_GRAPH_LABELS, "limit": limit},
+        )
+
+    def get_knowledge_graph_for_project(
+        self, project_id: Optional[str], limit: int = 500, with_properties: bool = False
+    ) -> dict:
+        """
+        Get nodes and relationships for the knowledge graph of a project.
         
-        # Get relationships where at least one end is a project node or connected to it.
-        # This iterates over the project's connections rather than all relationships in the graph.
-        result = self.query(
-            """
-            MATCH (p:Project {id: $project_id})
-            OPTIONAL MATCH (p)-[:HAS_NODE|HAS_SKILL|HAS_CONCEPT|HAS_TOPIC|HAS_MILESTONE|HAS_LESSON]->(connected)
-            WITH p, COLLECT(DISTINCT connected) as connected_nodes
-            WITH connected_nodes + [p] as project_nodes
-            UNWIND project_nodes as n
-            MATCH (n)-[r]-(m)
-            WHERE any(label IN labels(n) WHERE label IN $labels)
-              AND any(label IN labels(m) WHERE label IN $labels)
-              AND NOT (n:Project AND COALESCE(n.is_default, false))
-              AND NOT (m:Project AND COALESCE(m.is_default, false))
-            WITH DISTINCT r
-            RETURN COALESCE(startNode(r).id, elementId(startNode(r))) as source,
-                   type(r) as type,
-                   COALESCE(endNode(r).id, elementId(endNode(r))) as target,
-                   properties(r) as properties
-            LIMIT $limit
-            """,
-            {"project_id": project_id, "labels": allowed_labels, "limit": limit},
+        Equivalent to calling get_knowledge_graph_nodes_for_project and
+        get_knowledge_graph_relationships_for_project, but expands the
+        project's connections once and fetches both in a single query.
+        
+        Args:
+            project_id: Project ID to filter by, or None for the whole graph
+            limit: Maximum number of nodes, and of relationships, to return
+            with_properties: Also return each relationship's properties
+            
+        Returns:
+            Dictionary with "nodes" and "relationships" lists
+        """
+        if project_id is None:
+            return {
+                "nodes": self.get_knowledge_graph_nodes(limit=limit),
+                "relationships": self.get_knowledge_graph_relationships(
+                    limit=limit, with_properties=with_properties
+                ),
+            }
+        
+        return self._read(
+            _PROJECT_GRAPH_QUERIES[with_properties],
+            {"project_id": project_id, "labels": _KNOWLEDGE_GRAPH_LABELS, "limit": limit},
+            _serialize_project_graph,
         )
-        return result
 
     def list_all_projects(self, include_default: bool = False) -> list[dict]:
         """
@@ -738,7 +2141,7 @@ class Neo4jClient:
             List of project dictionaries with id, name, and created_at
         """
         if include_default:
-            result = self.query(
+            result = self._read(
                 """
                 MATCH (p:Project)
                 RETURN p.id as id, p.name as name, p.created_at as created_at,
@@ -747,7 +2150,7 @@ class Neo4jClient:
                 """
             )
         else:
-            result = self.query(
+            result = self._read(
                 """
                 MATCH (p:Project)
                 WHERE NOT COALESCE(p.is_default, false)
@@ -758,22 +2161,35 @@ class Neo4jClient:
             )
         return result
 
-    def get_all_relationships(self, limit: int = 100) -> list[dict]:
+    def iter_all_relationships(
+        self, limit: int = 100, with_properties: bool = False
+    ) -> Iterator[dict]:
+        """
+        Iterate over all relationships as records arrive.
+        
+        Args:
+            limit: Maximum number of relationships to return
+            with_properties: Also return each relationship's properties
+            
+        Yields:
+            Relationship dictionaries
+        """
+        records = self._stream(_ALL_RELATIONSHIPS_QUERIES[with_properties], {"limit": limit})
+        for record in records:
+            yield dict(record)
+
+    def get_all_relationships(self, limit: int = 100, with_properties: bool = False) -> list[dict]:
         """
         Get all relationships.
         
         Args:
             limit: Maximum number of relationships to return
+            with_properties: Also return each relationship's properties
             
         Returns:
             List of relationship dictionaries
         """
-        result = self.query(f"""
-            MATCH (n)-[r]->(m) 
-            RETURN n.id as source, type(r) as type, m.id as target, properties(r) as properties
-            LIMIT {limit}
-        """)
-        return result
+        return list(self.iter_all_relationships(limit, with_properties))
     
     def visualize_graph(self):
         """
@@ -785,46 +2201,44 @@ class Neo4jClient:
         try:
             from neo4j_viz.neo4j import from_neo4j
             
-            with self.driver as driver:
-                driver.verify_connectivity()
-                result = driver.execute_query(
-                    "MATCH (n)-[r]->(m) RETURN n,r,m",
-                    database_=self._config.database,
-                    routing_=RoutingControl.READ,
-                    result_transformer_=Result.graph,
-                )
+            # The driver is shared, so it must not be entered as a context
+            # manager here: __exit__ would close its connection pool.
+            result = self._read("MATCH (n)-[r]->(m) RETURN n,r,m", transformer=Result.graph)
             
             return from_neo4j(result)
         except ImportError:
             raise ImportError("neo4j-viz package required for visualization. Install with: pip install neo4j-viz")
     
     def close(self) -> None:
-        """Close all connections."""
-        if self._driver:
-            self._driver.close()
-            self._driver = None
+        """
+        Flush buffered writes and release this client's connections.
+
+        The driver is shared process-wide, so it is only dropped here; its
+        pool is closed at interpreter exit.
+        """
+        self.flush_remediation_events()
+        self._driver = None
         self._graph = None
     
     def __enter__(self):
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        pass  # Don't close - let connection pool manage lifecycle
+        # Don't close - let connection pool manage lifecycle
+        self.flush_remediation_events()
 
     def create_chat_session(self, session_id: str) -> None:
-        """Create a new chat session node."""
-        self.query(
-            """
-            MERGE (s:ChatSession {id: $session_id})
-            ON CREATE SET s.created_at = datetime(),
-                          s.pending_proposals = $empty_list
-            """,
-            {"session_id": session_id, "empty_list": "[]"},
-        )
+        """
+        Create a new chat session node.
+
+        Only needed for sessions that start without a user turn;
+        begin_chat_turn creates its session.
+        """
+        self.query(_CREATE_CHAT_SESSION_QUERY, {"session_id": session_id})
 
     def get_chat_session_metadata(self, session_id: str) -> dict:
         """Get chat session metadata."""
-        result = self.query(
+        result = self._read(
             """
             MATCH (s:ChatSession {id: $session_id})
             RETURN s.last_project_id as last_project_id,
@@ -848,23 +2262,7 @@ class Neo4jClient:
 
     def get_pending_proposals(self, session_id: str) -> list[dict]:
         """Get pending project proposals for a chat session."""
-        result = self.query(
-            """
-            MATCH (s:ChatSession {id: $session_id})
-            RETURN properties(s).pending_proposals as pending_proposals
-            """,
-            {"session_id": session_id},
-        )
-        if not result:
-            return []
-        raw = result[0].get("pending_proposals")
-        if not raw:
-            return []
-        try:
-            data = json.loads(raw) if isinstance(raw, str) else raw
-        except Exception:
-            return []
-        return data if isinstance(data, list) else []
+        return _pending_proposals(self._read(_PENDING_PROPOSALS_QUERY, {"session_id": session_id}))
 
     def set_pending_proposals(self, session_id: str, proposals: list[dict]) -> None:
         """Set pending project proposals for a chat session."""
@@ -875,7 +2273,7 @@ class Neo4jClient:
                 s.pending_proposals_at = datetime(),
                 s.updated_at = datetime()
             """,
-            {"session_id": session_id, "proposals": json.dumps(proposals)},
+            {"session_id": session_id, "proposals": json_dumps(proposals)},
         )
 
     def clear_pending_proposals(self, session_id: str) -> None:
@@ -890,42 +2288,76 @@ class Neo4jClient:
             {"session_id": session_id},
         )
 
-    def add_chat_message(self, session_id: str, role: str, content: str) -> None:
-        """Add a message to a chat session."""
+    def add_chat_messages(self, session_id: str, messages: list[dict]) -> int:
+        """
+        Write several messages to a chat session in one statement.
+
+        Nothing is written if the session does not exist.
+
+        Args:
+            session_id: Chat session ID
+            messages: Dicts with role and content, and optionally an
+                ISO-8601 timestamp and a request_id
+
+        Returns:
+            Number of messages written
+        """
+        if not messages:
+            return 0
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
         self.query(
-            """
-            MATCH (s:ChatSession {id: $session_id})
-            CREATE (m:ChatMessage {role: $role, content: $content, timestamp: datetime()})
-            CREATE (s)-[:HAS_MESSAGE]->(m)
-            """,
-            {"session_id": session_id, "role": role, "content": content}
+            _ADD_CHAT_MESSAGES_QUERY,
+            {
+                "session_id": session_id,
+                "messages": [
+                    {
+                        "role": message["role"],
+                        "content": message["content"],
+                        "timestamp": message.get("timestamp") or timestamp,
+                        "request_id": message.get("request_id"),
+                    }
+                    for message in messages
+                ],
+            },
         )
+        return len(messages)
 
-    def get_chat_history(self, session_id: str) -> list[dict]:
-        """Get chat history for a session."""
-        result = self.query(
+    def get_chat_history(
+        self,
+        session_id: str,
+        since_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        Get chat history for a session.
+
+        Args:
+            session_id: Chat session ID
+            since_seq: Only return messages numbered after this seq
+            limit: Maximum number of messages to return
+
+        Returns:
+            Messages in conversation order
+        """
+        return _format_timestamps(self._read(
+            _with_limit(_CHAT_HISTORY_QUERY, limit),
+            {"session_id": session_id, "since_seq": since_seq, "limit": limit},
+        ))
+
+    def chat_message_exists(self, session_id: str, request_id: str) -> bool:
+        """Check if a chat session already holds a message with this request_id."""
+        result = self._read(
             """
-            MATCH (s:ChatSession {id: $session_id})-[:HAS_MESSAGE]->(m:ChatMessage)
-            RETURN m.role as role, m.content as content, m.timestamp as timestamp
-            ORDER BY m.timestamp
+            MATCH (s:ChatSession {id: $session_id})-[:HAS_MESSAGE]->(m:ChatMessage {request_id: $request_id})
+            RETURN count(m) > 0 as exists
             """,
-            {"session_id": session_id}
+            {"session_id": session_id, "request_id": request_id},
         )
-        messages = []
-        for row in result:
-            timestamp = row.get("timestamp")
-            if isinstance(timestamp, DateTime):
-                timestamp = timestamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-            messages.append({
-                "role": row.get("role"),
-                "content": row.get("content"),
-                "timestamp": timestamp,
-            })
-        return messages
+        return result[0].get("exists", False) if result else False
 
     def get_all_sessions(self) -> list[dict]:
         """Get all chat sessions."""
-        result = self.query(
+        return _format_timestamps(self._read(
             """
             MATCH (s:ChatSession)
             OPTIONAL MATCH (s)-[:HAS_MESSAGE]->(m:ChatMessage)
@@ -933,25 +2365,20 @@ class Neo4jClient:
             RETURN s.id as id, s.created_at as created_at, message_count
             ORDER BY s.created_at DESC
             """
-        )
-        sessions = []
-        for row in result:
-            created_at = row.get("created_at")
-            if isinstance(created_at, DateTime):
-                created_at = created_at.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-            sessions.append({
-                "id": row.get("id"),
-                "created_at": created_at,
-                "message_count": row.get("message_count", 0),
-            })
-        return sessions
-
-    def delete_chat_session(self, session_id: str) -> None:
-        """Delete a chat session and all its messages."""
-        self.query(
-            "MATCH (s:ChatSession {id: $session_id}) DETACH DELETE s",
-            {"session_id": session_id}
-        )
+        ), key="created_at")
+
+    def delete_chat_session(self, session_id: str) -> int:
+        """
+        Delete a chat session and all its messages.
+
+        Args:
+            session_id: Chat session ID
+
+        Returns:
+            Number of stored messages deleted
+        """
+        result = self.query(_DELETE_CHAT_SESSION_QUERY, {"session_id": session_id})
+        return result[0]["message_count"] if result else 0
 
     def set_session_locked(self, session_id: str, locked: bool) -> None:
         """Set the locked state of a chat session."""
@@ -960,9 +2387,51 @@ class Neo4jClient:
             {"session_id": session_id, "locked": locked}
         )
 
+    def begin_chat_turn(
+        self,
+        session_id: str,
+        content: str,
+        request_id: str,
+        timestamp: str,
+        respect_lock: bool = True,
+    ) -> dict:
+        """
+        Store a user message, lock the session and read its history in one round-trip.
+
+        Args:
+            session_id: Chat session ID
+            content: User message content
+            request_id: Idempotency key of the message
+            timestamp: ISO-8601 UTC timestamp of the message
+            respect_lock: Refuse the turn while the session is locked
+
+        Returns:
+            Dict with ``status`` (``started``, ``locked``, ``pending_proposals``
+            or ``duplicate``) and ``history``, which is only filled when the
+            turn started
+        """
+        result = self.query(
+            _BEGIN_CHAT_TURN_QUERY,
+            {
+                "session_id": session_id,
+                "content": content,
+                "request_id": request_id,
+                "timestamp": timestamp,
+                "respect_lock": respect_lock,
+            },
+        )
+        if not result:
+            return {"status": "locked", "history": []}
+        return {"status": result[0]["status"], "history": _format_timestamps(result[0]["history"] or [])}
+
+    def _write_rows(self, query: str, rows: list[dict]) -> None:
+        """Run an ``UNWIND $rows`` write in batches of BULK_WRITE_BATCH_SIZE."""
+        for start in range(0, len(rows), BULK_WRITE_BATCH_SIZE):
+            self.query(query, {"rows": rows[start:start + BULK_WRITE_BATCH_SIZE]})
+
     def is_session_locked(self, session_id: str) -> bool:
         """Check if a chat session is locked (processing)."""
-        result = self.query(
+        result = self._read(
             "MATCH (s:ChatSession {id: $session_id}) RETURN COALESCE(s.is_processing, false) as locked",
             {"session_id": session_id}
         )
@@ -982,6 +2451,9 @@ class Neo4jClient:
             ON CREATE SET ps.created_at = datetime()
             SET ps.project_name = $project_name,
                 ps.summary_json = $summary_json,
+                ps.session_id = $session_id,
+                ps.norm_title = $norm_title,
+                ps.norm_desc_200 = $norm_desc_200,
                 ps.updated_at = datetime(),
                 ps.is_default = $is_default
             MERGE (p:Project {id: $project_id})
@@ -996,19 +2468,24 @@ class Neo4jClient:
                 "project_name": project_name,
                 "summary_json": summary_json,
                 "is_default": is_default,
+                **_summary_match_keys(summary_json),
             },
         )
 
     def rename_project_summary(self, project_id: str, project_name: str, summary_json: str) -> None:
         """Rename an existing project summary and its KG project node."""
+        self.ensure_schema()
         self.query(
             """
             MATCH (ps:ProjectSummary {id: $project_id})
             SET ps.project_name = $project_name,
                 ps.summary_json = $summary_json,
+                ps.session_id = $session_id,
+                ps.norm_title = $norm_title,
+                ps.norm_desc_200 = $norm_desc_200,
                 ps.updated_at = datetime()
             WITH ps
-            MATCH (p:Project {id: $project_id})
+            MATCH (ps)-[:SUMMARY_FOR]->(p:Project)
             SET p.name = $project_name,
                 p.updated_at = datetime()
             """,
@@ -1016,23 +2493,55 @@ class Neo4jClient:
                 "project_id": project_id,
                 "project_name": project_name,
                 "summary_json": summary_json,
+                **_summary_match_keys(summary_json),
             },
         )
 
     def update_project_summary_json(self, project_id: str, summary_json: str) -> None:
         """Update project summary JSON payload."""
         self.query(
-            """
-            MATCH (p:ProjectSummary {id: $project_id})
-            SET p.summary_json = $summary_json,
-                p.updated_at = datetime()
-            """,
+            _UPDATE_PROJECT_SUMMARY_JSON_QUERY,
             {
                 "project_id": project_id,
                 "summary_json": summary_json,
+                **_summary_match_keys(summary_json),
             },
         )
 
+    def ensure_schema(self) -> None:
+        """
+        Ensure the constraints and indexes behind keyed lookups exist.
+
+        Runs until it fully succeeds once per database per process. A
+        constraint the server refuses, for example over existing duplicates,
+        is skipped so requests keep working, and the whole schema is retried
+        on the next call. Summaries written before duplicate-lookup keys were
+        stored on the node are backfilled from their summary_json, lessons
+        and assessments written without an archived flag get
+        ``archived = false``, legacy remediation nodes get a title, and
+        summaries without a SUMMARY_FOR edge get one.
+        """
+        target = (self._config.uri, self._config.database)
+        if target in _SCHEMA_READY_TARGETS:
+            return
+
+        complete = True
+        for schema_query in _SCHEMA_QUERIES:
+            try:
+                self.query(schema_query)
+            except ClientError:
+                complete = False
+        rows = [
+            {"id": row["id"], **_summary_match_keys(row["summary_json"])}
+            for row in self._read(_UNKEYED_PROJECT_SUMMARIES_QUERY)
+        ]
+        if rows:
+            self.query(_SET_PROJECT_SUMMARY_KEYS_QUERY, {"rows": rows})
+        for backfill_query in _BACKFILL_QUERIES:
+            self.query(backfill_query)
+        if complete:
+            _SCHEMA_READY_TARGETS.add(target)
+
     def find_existing_project_by_content(
         self,
         session_id: str,
@@ -1042,42 +2551,20 @@ class Neo4jClient:
         """Check if a project with similar content already exists for this session.
         
         Returns project info (id, name) if exists, None otherwise.
-        Uses case-insensitive matching on title AND description.
+        Uses case-insensitive matching on title OR description (first 200 chars).
         """
-        # Normalize for comparison
-        norm_title = title.strip().lower()
-        norm_desc = description.strip().lower()[:200]  # First 200 chars
-        
-        result = self.query(
-            """
-            MATCH (ps:ProjectSummary)
-            WHERE ps.summary_json IS NOT NULL
-            RETURN ps.id as id, ps.project_name as name, ps.summary_json as summary_json
-            """,
-            {},
+        self.ensure_schema()
+        result = self._read(
+            _FIND_PROJECT_BY_CONTENT_QUERY,
+            {
+                "session_id": session_id,
+                "norm_title": title.strip().lower() or None,
+                "norm_desc_200": description.strip().lower()[:200] or None,
+            },
         )
-        
-        for row in result:
-            try:
-                summary = json.loads(row.get("summary_json", "{}"))
-                # Check if this project is for the same session
-                if summary.get("session_id") != session_id:
-                    continue
-                agreed = summary.get("agreed_project", {})
-                if not isinstance(agreed, dict):
-                    continue
-                existing_title = str(agreed.get("name", "")).strip().lower()
-                existing_desc = str(agreed.get("description", "")).strip().lower()[:200]
-                
-                # Match by either same title OR same description (first 200 chars)
-                if existing_title and existing_title == norm_title:
-                    return {"id": row.get("id"), "name": row.get("name")}
-                if existing_desc and norm_desc and existing_desc == norm_desc:
-                    return {"id": row.get("id"), "name": row.get("name")}
-            except (json.JSONDecodeError, TypeError):
-                continue
-        
-        return None
+        if not result:
+            return None
+        return {"id": result[0]["id"], "name": result[0]["name"]}
 
     def update_project_capstone_state(
         self,
@@ -1087,26 +2574,9 @@ class Neo4jClient:
         completed_at: str | None,
     ) -> None:
         """Update capstone status fields on project nodes."""
+        self.ensure_schema()
         self.query(
-            """
-            MATCH (ps:ProjectSummary {id: $project_id})
-            SET ps.capstone_status = $status,
-                ps.capstone_score = $score,
-                ps.capstone_completed_at = CASE
-                    WHEN $completed_at IS NULL THEN ps.capstone_completed_at
-                    ELSE datetime($completed_at)
-                END,
-                ps.updated_at = datetime()
-            WITH ps
-            MATCH (p:Project {id: $project_id})
-            SET p.capstone_status = $status,
-                p.capstone_score = $score,
-                p.capstone_completed_at = CASE
-                    WHEN $completed_at IS NULL THEN p.capstone_completed_at
-                    ELSE datetime($completed_at)
-                END,
-                p.updated_at = datetime()
-            """,
+            _UPDATE_PROJECT_CAPSTONE_STATE_QUERY,
             {
                 "project_id": project_id,
                 "status": status,
@@ -1116,8 +2586,9 @@ class Neo4jClient:
         )
 
     def ensure_default_project(self) -> None:
-        """Ensure the default 'All' project exists."""
-        summary_json = json.dumps({
+        """Ensure the schema and the default 'All' project exist."""
+        self.ensure_schema()
+        summary_json = json_dumps({
             "agreed_project": {
                 "name": DEFAULT_PROJECT_NAME,
                 "description": "Default collection for unassigned lessons and assessments.",
@@ -1135,7 +2606,7 @@ class Neo4jClient:
         self.upsert_project_summary(DEFAULT_PROJECT_ID, DEFAULT_PROJECT_NAME, summary_json, is_default=True)
 
     def ensure_project_nodes(self) -> None:
-        """Ensure every project summary has a KG project node and prune redundant relationships."""
+        """Ensure every project summary has a KG project node."""
         self.query(
             """
             MATCH (ps:ProjectSummary)
@@ -1147,22 +2618,6 @@ class Neo4jClient:
             MERGE (ps)-[:SUMMARY_FOR]->(p)
             """
         )
-        # Prune redundant HAS_NODE if more specific links exist to avoid double counting
-        if self.relationship_type_exists("HAS_NODE"):
-            rel_types = []
-            for rel in ["HAS_SKILL", "HAS_CONCEPT", "HAS_TOPIC", "HAS_MILESTONE"]:
-                if self.relationship_type_exists(rel):
-                    rel_types.append(rel)
-            
-            if rel_types:
-                rel_pattern = "|".join(rel_types)
-                self.query(
-                    f"""
-                    MATCH (p:Project)-[r:HAS_NODE]->(n)
-                    WHERE (p)-[:{rel_pattern}]->(n)
-                    DELETE r
-                    """
-                )
 
     def upsert_project_profile_node(self, project_id: str, profile: dict) -> None:
         """Create or update a project profile node and link to project."""
@@ -1208,62 +2663,21 @@ class Neo4jClient:
             if isinstance(value, str) and value.strip():
                 nodes["Milestone"].add(value.strip())
 
-        relationship_count = 0
-        for label, names in nodes.items():
-            if not names:
-                continue
-            payload = [{"name": name, "id": f"{label.lower()}-{_slugify(name)}"} for name in names]
-            rel_type = {
-                "Skill": "HAS_SKILL",
-                "Concept": "HAS_CONCEPT",
-                "Topic": "HAS_TOPIC",
-                "Milestone": "HAS_MILESTONE",
-            }.get(label, "HAS_NODE")
-            self.query(
-                f"""
-                MATCH (p:Project {{id: $project_id}})
-                UNWIND $items as item
-                MERGE (n:{label} {{name: item.name}})
-                ON CREATE SET n.created_at = datetime()
-                SET n.name = item.name,
-                    n.id = COALESCE(n.id, item.id),
-                    n.updated_at = datetime()
-                MERGE (p)-[:HAS_NODE]->(n)
-                MERGE (p)-[:{rel_type}]->(n)
-                """,
-                {"project_id": project_id, "items": payload},
-            )
-            if label == "Milestone":
-                self.query(
-                    """
-                    MATCH (p:Project {id: $project_id})
-                    UNWIND $items as item
-                    MATCH (m:Milestone {name: item.name})
-                    MERGE (m)-[:PART_OF]->(p)
-                    """,
-                    {"project_id": project_id, "items": payload},
-                )
-                relationship_count += len(payload) * 3
-            else:
-                relationship_count += len(payload) * 2
-
-        milestone_skill_pairs: list[dict] = []
-        if nodes["Milestone"] and nodes["Skill"]:
-            for milestone in nodes["Milestone"]:
-                for skill in nodes["Skill"]:
-                    if skill.lower() in milestone.lower():
-                        milestone_skill_pairs.append({"milestone": milestone, "skill": skill})
-        if milestone_skill_pairs:
-            self.query(
-                """
-                UNWIND $pairs as pair
-                MATCH (m:Milestone {name: pair.milestone})
-                MATCH (s:Skill {name: pair.skill})
-                MERGE (m)-[:REQUIRES]->(s)
-                """,
-                {"pairs": milestone_skill_pairs},
+        by_label = {
+            label: [{"name": name, "id": f"{label.lower()}-{_slugify(name)}"} for name in names]
+            for label, names in nodes.items()
+        }
+
+        # The specific link per node, and PART_OF per milestone
+        relationship_count = sum(len(names) for names in nodes.values()) + len(nodes["Milestone"])
+        if any(nodes.values()):
+            result = self.query(
+                _UPSERT_PROJECT_NODES_QUERY,
+                {"project_id": project_id, "by_label": by_label},
             )
-            relationship_count += len(milestone_skill_pairs)
+            self._relationship_types = None
+            if result:
+                relationship_count += result[0]["requires"]
 
         for label in ("Skill", "Concept", "Topic"):
             try:
@@ -1278,144 +2692,132 @@ class Neo4jClient:
         for node in nodes:
             name = node.get("name")
             label = node.get("label")
-            if not name or label not in {"Skill", "Concept", "Topic", "Milestone"}:
+            if not name or label not in _PROJECT_NODE_REL_TYPES:
                 continue
             grouped.setdefault(label, set()).add(name)
 
         for label, names in grouped.items():
-            rel_type = {
-                "Skill": "HAS_SKILL",
-                "Concept": "HAS_CONCEPT",
-                "Topic": "HAS_TOPIC",
-                "Milestone": "HAS_MILESTONE",
-            }.get(label, "HAS_NODE")
             self.query(
-                f"""
-                MATCH (p:Project {{id: $project_id}})
-                UNWIND $names as node_name
-                MATCH (n:{label} {{name: node_name}})
-                MERGE (p)-[:{rel_type}]->(n)
-                """,
+                _CONNECT_PROJECT_NODES_QUERIES[label],
                 {"project_id": project_id, "names": list(names)},
             )
+        if grouped:
+            self._relationship_types = None
 
     def list_project_nodes(self, project_id: str) -> list[dict]:
         """List KG nodes connected to a project."""
-        # Check which relationship types exist to avoid Neo4j warnings
-        rel_types = []
-        for rel in ["HAS_SKILL", "HAS_CONCEPT", "HAS_TOPIC", "HAS_MILESTONE", "HAS_NODE"]:
-            if self.relationship_type_exists(rel):
-                rel_types.append(rel)
-        
-        if not rel_types:
-            # Check lessons as fallback
-            result = self.query(
-                """
-                MATCH (p:Project {id: $project_id})-[:HAS_LESSON]->(l:ProjectLesson)-[:ABOUT]->(n)
-                WITH DISTINCT p, n
-                RETURN n
-                ORDER BY n.name ASC
-                """,
-                {"project_id": project_id},
-            )
-        else:
-            # Neo4j 5.x syntax: first rel has colon, others don't
-            rel_pattern = ":" + "|".join(rel_types)
-            result = self.query(
-                f"""
-                MATCH (p:Project {{id: $project_id}})-[{rel_pattern}]->(n)
-                RETURN n
-                ORDER BY n.name ASC
-                """,
-                {"project_id": project_id},
-            )
-            
-            if not result:
-                # Fallback/Migration: If no direct links, check lessons
-                result = self.query(
-                    """
-                    MATCH (p:Project {id: $project_id})-[:HAS_LESSON]->(l:ProjectLesson)-[:ABOUT]->(n)
-                    WITH DISTINCT p, n
-                    RETURN n
-                    ORDER BY n.name ASC
-                    """,
-                    {"project_id": project_id},
-                )
-        
-        return [_serialize_node(r["n"]) for r in result] if result else []
+        result = self._read(
+            _LIST_PROJECT_NODES_QUERY,
+            {"project_id": project_id, "rel_types": _PROJECT_LINK_TYPES},
+        )
+        # Rows are already flat id/name/labels/updated_at projections
+        return [_serialize_node(r) for r in result] if result else []
 
     def clear_project_nodes(self, project_id: str) -> None:
         """Remove project links and delete nodes unique to this project."""
+        # Sharing is decided before any link is removed, so one pass can
+        # drop every link and delete only the nodes no other project uses
         self.query(
             """
-            MATCH (p:Project {id: $project_id})-[rel:HAS_NODE]->(n)
-            WHERE NOT EXISTS {
-                MATCH (p2:Project)-[:HAS_NODE]->(n)
+            MATCH (p:Project {id: $project_id})-[rel:HAS_NODE|HAS_SKILL|HAS_CONCEPT|HAS_TOPIC|HAS_MILESTONE]->(n)
+            WITH rel, n, EXISTS {
+                MATCH (p2:Project)-[:HAS_NODE|HAS_SKILL|HAS_CONCEPT|HAS_TOPIC|HAS_MILESTONE]->(n)
                 WHERE p2.id <> $project_id
-            }
-            DETACH DELETE n
-            """,
-            {"project_id": project_id},
-        )
-        self.query(
-            """
-            MATCH (p:Project {id: $project_id})-[rel:HAS_NODE]->(n)
+            } as shared
             DELETE rel
+            WITH DISTINCT n, shared
+            WHERE NOT shared
+            DETACH DELETE n
             """,
             {"project_id": project_id},
         )
 
     def get_projects_for_node(self, node_id: str, node_name: str) -> list[dict]:
         """Get projects connected to a node by id or name via any relationship type."""
-        # Build a union of all relationship types to find connected projects
-        rel_types = ["HAS_NODE", "HAS_SKILL", "HAS_CONCEPT", "HAS_TOPIC", "HAS_MILESTONE"]
-        
-        result = self.query(
-            """
-            MATCH (p:Project)-[:HAS_NODE|HAS_SKILL|HAS_CONCEPT|HAS_TOPIC|HAS_MILESTONE]->(n)
-            WHERE n.id = $node_id OR elementId(n) = $node_id OR n.name = $node_name
-            RETURN DISTINCT p.id as id, p.is_default as is_default, p.created_at as created_at
-            ORDER BY p.is_default ASC, p.created_at ASC
-            """,
+        return self._read(
+            _PROJECTS_FOR_NODE_QUERIES[_is_element_id(node_id)],
             {"node_id": node_id, "node_name": node_name},
         )
-        return result
 
-    def list_project_summaries(self, limit: int = 10) -> list[dict]:
-        """List recent project summaries."""
-        result = self.query(
+    def list_project_summaries(self, limit: int = 10, include_summary: bool = False) -> list[dict]:
+        """
+        List recent project summaries, newest first.
+
+        Args:
+            limit: Maximum number of summaries to return
+            include_summary: Also return the parsed ``summary``. It is cached
+                per project revision and shared, so it is read-only; only
+                revisions not cached yet have their summary_json fetched.
+
+        Returns:
+            Rows with id, name, created_at and updated_at
+        """
+        rows = self._read(_LIST_PROJECT_SUMMARIES_QUERY, {"limit": limit})
+        if not include_summary:
+            return rows
+
+        missing = []
+        for row in rows:
+            row["summary"] = _SUMMARY_CACHE.get((row["id"], str(row["updated_at"])))
+            if row["summary"] is None:
+                missing.append(row)
+        if missing:
+            raw = {
+                r["id"]: r["summary_json"]
+                for r in self._read(
+                    _PROJECT_SUMMARY_JSON_QUERY, {"project_ids": [row["id"] for row in missing]}
+                )
+            }
+            for row in missing:
+                row["summary"] = _parsed_summary(
+                    row["id"], str(row["updated_at"]), raw.get(row["id"]) or "{}"
+                )
+        return rows
+
+    def get_project_summary(self, project_id: str) -> list[dict]:
+        """Get a project summary by id."""
+        result = self._read(
             """
-            MATCH (p:ProjectSummary)
+            MATCH (p:ProjectSummary {id: $project_id})
             RETURN p.id as id, p.project_name as name, p.created_at as created_at, p.updated_at as updated_at, p.summary_json as summary_json
-            ORDER BY p.created_at DESC
-            LIMIT $limit
             """,
-            {"limit": limit},
+            {"project_id": project_id},
         )
         return result
 
-    def get_project_summary(self, project_id: str) -> list[dict]:
-        """Get a project summary by id."""
-        result = self.query(
+    def get_project_summary_meta(self, project_id: str) -> Optional[dict]:
+        """Get a project summary's id, name and timestamps without its JSON payload."""
+        result = self._read(
             """
             MATCH (p:ProjectSummary {id: $project_id})
-            RETURN p.id as id, p.project_name as name, p.created_at as created_at, p.updated_at as updated_at, p.summary_json as summary_json
+            RETURN p.id as id, p.project_name as name, p.created_at as created_at, p.updated_at as updated_at
             """,
             {"project_id": project_id},
         )
-        return result
+        return result[0] if result else None
 
     def delete_project_summary(self, project_id: str) -> None:
         """Delete a project summary and its chat history."""
+        # One subquery per kind of child, so their rows are never multiplied
+        # together the way chained OPTIONAL MATCHes would
         self.query(
             """
             MATCH (ps:ProjectSummary {id: $project_id})
-            OPTIONAL MATCH (ps)-[:HAS_PROJECT_MESSAGE]->(m:ProjectMessage)
-            OPTIONAL MATCH (ps)-[:HAS_LESSON]->(l:ProjectLesson)
-            OPTIONAL MATCH (ps)-[:HAS_ASSESSMENT]->(a:ProjectAssessment)
+            CALL (ps) {
+                MATCH (ps)-[:HAS_PROJECT_MESSAGE]->(m:ProjectMessage)
+                DETACH DELETE m
+            }
+            CALL (ps) {
+                MATCH (ps)-[:HAS_LESSON]->(l:ProjectLesson)
+                DETACH DELETE l
+            }
+            CALL (ps) {
+                MATCH (ps)-[:HAS_ASSESSMENT]->(a:ProjectAssessment)
+                DETACH DELETE a
+            }
             OPTIONAL MATCH (ps)-[:SUMMARY_FOR]->(p:Project)
             OPTIONAL MATCH (p)-[:HAS_PROFILE]->(u:UserProfile)
-            DETACH DELETE ps, m, l, a, u, p
+            DETACH DELETE ps, u, p
             """,
             {"project_id": project_id},
         )
@@ -1425,38 +2827,46 @@ class Neo4jClient:
         self.query(
             """
             MATCH (ps:ProjectSummary {id: $project_id})
-            OPTIONAL MATCH (ps)-[:HAS_PROJECT_MESSAGE]->(m:ProjectMessage)
-            OPTIONAL MATCH (ps)-[:HAS_LESSON]->(l:ProjectLesson)
-            OPTIONAL MATCH (ps)-[:HAS_ASSESSMENT]->(a:ProjectAssessment)
-            DETACH DELETE m, l, a
+            CALL (ps) {
+                MATCH (ps)-[:HAS_PROJECT_MESSAGE]->(m:ProjectMessage)
+                DETACH DELETE m
+            }
+            CALL (ps) {
+                MATCH (ps)-[:HAS_LESSON]->(l:ProjectLesson)
+                DETACH DELETE l
+            }
+            CALL (ps) {
+                MATCH (ps)-[:HAS_ASSESSMENT]->(a:ProjectAssessment)
+                DETACH DELETE a
+            }
             """,
             {"project_id": project_id},
         )
 
     def save_project_chat_history(self, project_id: str, messages: list[dict]) -> None:
-        """Save project chat history as a snapshot."""
-        self.query(
-            """
-            MATCH (p:ProjectSummary {id: $project_id})
-            OPTIONAL MATCH (p)-[:HAS_PROJECT_MESSAGE]->(m:ProjectMessage)
-            DETACH DELETE m
-            """,
-            {"project_id": project_id},
-        )
-        if not messages:
-            return
+        """
+        Save project chat history as a snapshot.
+
+        Messages are keyed by their ``idx`` within the project, so existing
+        ones are updated in place and only messages past the end of the new
+        snapshot are deleted.
+        """
         self.query(
             """
             MATCH (p:ProjectSummary {id: $project_id})
-            UNWIND $messages as msg
-            CREATE (m:ProjectMessage {
-                role: msg.role,
-                content: msg.content,
-                timestamp: msg.timestamp,
-                request_id: msg.request_id,
-                idx: msg.idx
-            })
-            CREATE (p)-[:HAS_PROJECT_MESSAGE]->(m)
+            CALL (p) {
+                MATCH (p)-[:HAS_PROJECT_MESSAGE]->(old:ProjectMessage)
+                WHERE old.idx IS NULL OR old.idx >= size($messages)
+                DETACH DELETE old
+            }
+            CALL (p) {
+                UNWIND $messages as msg
+                MERGE (p)-[:HAS_PROJECT_MESSAGE]->(m:ProjectMessage {idx: msg.idx})
+                SET m.role = msg.role,
+                    m.content = msg.content,
+                    m.timestamp = msg.timestamp,
+                    m.request_id = msg.request_id
+            }
             """,
             {
                 "project_id": project_id,
@@ -1464,17 +2874,17 @@ class Neo4jClient:
             },
         )
 
-    def get_project_chat_history(self, project_id: str) -> list[dict]:
-        """Get project chat history."""
-        result = self.query(
-            """
-            MATCH (p:ProjectSummary {id: $project_id})-[:HAS_PROJECT_MESSAGE]->(m:ProjectMessage)
-            RETURN m.role as role, m.content as content, m.timestamp as timestamp, m.request_id as request_id, m.idx as idx
-            ORDER BY m.idx ASC
-            """,
-            {"project_id": project_id},
-        )
-        return result
+    def get_project_chat_history(
+        self,
+        project_id: str,
+        since_idx: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """Get project chat history, optionally only messages after ``since_idx``."""
+        return _format_timestamps(self._read(
+            _with_limit(_PROJECT_CHAT_HISTORY_QUERY, limit),
+            {"project_id": project_id, "since_idx": since_idx, "limit": limit},
+        ))
 
     def save_project_lesson(
         self,
@@ -1487,30 +2897,9 @@ class Neo4jClient:
         lesson_index: int,
     ) -> None:
         """Persist a generated lesson."""
+        self.ensure_schema()
         self.query(
-            """
-            MATCH (ps:ProjectSummary {id: $project_id})
-            MATCH (p:Project {id: $project_id})
-            CREATE (l:ProjectLesson {
-                id: $lesson_id,
-                node_id: $node_id,
-                title: $title,
-                explanation: $explanation,
-                task: $task,
-                lesson_index: $lesson_index,
-                archived: false,
-                created_at: datetime()
-            })
-            CREATE (ps)-[:HAS_LESSON]->(l)
-            CREATE (p)-[:HAS_LESSON]->(l)
-            WITH l
-            OPTIONAL MATCH (n)
-            WHERE n.id = $node_id OR elementId(n) = $node_id
-            FOREACH (_ IN CASE WHEN n IS NULL THEN [] ELSE [1] END |
-                MERGE (l)-[:ABOUT]->(n)
-                MERGE (p)-[:HAS_NODE]->(n)
-            )
-            """,
+            _SAVE_PROJECT_LESSON_QUERIES[_is_element_id(node_id)],
             {
                 "project_id": project_id,
                 "lesson_id": lesson_id,
@@ -1521,6 +2910,7 @@ class Neo4jClient:
                 "lesson_index": lesson_index,
             },
         )
+        self._relationship_types = None
 
     def ensure_lesson_index(self) -> None:
         """Ensure lesson_index exists on all ProjectLesson nodes."""
@@ -1534,23 +2924,11 @@ class Neo4jClient:
 
     def list_project_lessons(self, project_id: str) -> list[dict]:
         """List lessons for a project."""
-        result = self.query(
-            """
-            MATCH (p:ProjectSummary {id: $project_id})-[:HAS_LESSON]->(l:ProjectLesson)
-            RETURN l.id as id, l.node_id as node_id, l.title as title, 
-                   l.explanation as explanation, l.task as task, 
-                   l.created_at as created_at, 
-                   coalesce(l.archived, false) as archived, 
-                   l.archived_at as archived_at
-            ORDER BY l.created_at DESC
-            """,
-            {"project_id": project_id},
-        )
-        return result
+        return self._read(_PROJECT_LESSONS_QUERY, {"project_id": project_id})
 
     def get_project_lesson_by_node(self, project_id: str, node_id: str) -> list[dict]:
         """Get latest lesson for a node in a project."""
-        result = self.query(
+        result = self._read(
             """
             MATCH (p:ProjectSummary {id: $project_id})-[:HAS_LESSON]->(l:ProjectLesson {node_id: $node_id})
             RETURN l.id as id, l.node_id as node_id, l.title as title, 
@@ -1567,7 +2945,7 @@ class Neo4jClient:
 
     def list_project_lessons_for_node(self, project_id: str, node_id: str) -> list[dict]:
         """List lessons for a node in a project."""
-        result = self.query(
+        result = self._read(
             """
             MATCH (p:ProjectSummary {id: $project_id})-[:HAS_LESSON]->(l:ProjectLesson {node_id: $node_id})
             RETURN l.id as id,
@@ -1582,24 +2960,9 @@ class Neo4jClient:
 
     def get_project_graph_counts(self, project_id: str) -> dict:
         """Return counts of nodes and relationships connected to a project."""
-        node_result = self.query(
-            """
-            MATCH (p:Project {id: $project_id})-[:HAS_NODE]->(n)
-            RETURN count(DISTINCT n) as node_count
-            """,
-            {"project_id": project_id},
-        )
-        rel_result = self.query(
-            """
-            MATCH (p:Project {id: $project_id})-[r]->()
-            RETURN count(r) as rel_count
-            """,
-            {"project_id": project_id},
+        return _project_graph_counts(
+            self._read(_PROJECT_GRAPH_COUNTS_QUERY, {"project_id": project_id})
         )
-        return {
-            "nodes": node_result[0].get("node_count", 0) if node_result else 0,
-            "relationships": rel_result[0].get("rel_count", 0) if rel_result else 0,
-        }
 
     def archive_project_lesson(self, project_id: str, lesson_id: str) -> None:
         """Archive a lesson."""
@@ -1630,50 +2993,28 @@ class Neo4jClient:
         prompt: str,
     ) -> None:
         """Persist an assessment for a lesson."""
-        self.query(
-            """
-            MATCH (ps:ProjectSummary {id: $project_id})
-            MATCH (p:Project {id: $project_id})
-            CREATE (a:ProjectAssessment {
-                id: $assessment_id,
-                lesson_id: $lesson_id,
-                prompt: $prompt,
-                status: 'pending',
-                archived: false,
-                created_at: datetime(),
-                updated_at: datetime()
-            })
-            CREATE (ps)-[:HAS_ASSESSMENT]->(a)
-            CREATE (p)-[:HAS_ASSESSMENT]->(a)
-            WITH a
-            MATCH (l:ProjectLesson {id: $lesson_id})
-            CREATE (a)-[:ASSESSMENT_FOR]->(l)
-            """,
+        self.save_project_assessments_bulk([
             {
                 "project_id": project_id,
                 "assessment_id": assessment_id,
                 "lesson_id": lesson_id,
                 "prompt": prompt,
-            },
-        )
+            }
+        ])
+
+    def save_project_assessments_bulk(self, rows: list[dict]) -> None:
+        """
+        Persist many assessments with one statement per batch.
+
+        Args:
+            rows: Dicts with project_id, assessment_id, lesson_id and prompt
+        """
+        self.ensure_schema()
+        self._write_rows(_SAVE_PROJECT_ASSESSMENTS_QUERY, rows)
 
     def list_project_assessments(self, project_id: str) -> list[dict]:
         """List assessments for a project."""
-        result = self.query(
-            """
-            OPTIONAL MATCH (p:ProjectSummary {id: $project_id})-[:HAS_ASSESSMENT]->(a:ProjectAssessment)
-            WHERE a IS NOT NULL
-            RETURN a.id as id, a.lesson_id as lesson_id, a.prompt as prompt, 
-                   a.status as status, a.feedback as feedback, 
-                   a.created_at as created_at, a.updated_at as updated_at, 
-                   coalesce(a.archived, false) as archived, 
-                   a.archived_at as archived_at
-            ORDER BY a.created_at DESC
-            """,
-            {"project_id": project_id},
-        )
-        # Filter out null results from OPTIONAL MATCH
-        return [r for r in result if r.get("id") is not None]
+        return self._read(_LIST_PROJECT_ASSESSMENTS_QUERY, {"project_id": project_id})
 
     def create_project_submission(
         self,
@@ -1683,83 +3024,52 @@ class Neo4jClient:
         attempt_number: int,
     ) -> None:
         """Create a submission for a project."""
-        self.query(
-            """
-            MATCH (ps:ProjectSummary {id: $project_id})
-            MATCH (p:Project {id: $project_id})
-            CREATE (s:ProjectSubmission {
-                id: $submission_id,
-                project_id: $project_id,
-                content: $content,
-                attempt_number: $attempt_number,
-                status: 'pending',
-                submitted_at: datetime()
-            })
-            CREATE (ps)-[:HAS_SUBMISSION]->(s)
-            CREATE (p)-[:HAS_SUBMISSION]->(s)
-            """,
+        self.create_project_submissions_bulk([
             {
                 "project_id": project_id,
                 "submission_id": submission_id,
                 "content": content,
                 "attempt_number": attempt_number,
-            },
-        )
+            }
+        ])
+
+    def create_project_submissions_bulk(self, rows: list[dict]) -> None:
+        """
+        Create many submissions with one statement per batch.
+
+        Args:
+            rows: Dicts with project_id, submission_id, content and attempt_number
+        """
+        self.ensure_schema()
+        self._write_rows(_CREATE_PROJECT_SUBMISSIONS_QUERY, rows)
 
     def list_project_submissions(self, project_id: str) -> list[dict]:
         """List submissions for a project."""
-        if not self.label_exists("ProjectSubmission"):
-            return []
-        result = self.query(
-            """
-            MATCH (ps:ProjectSummary {id: $project_id})-[:HAS_SUBMISSION]->(s:ProjectSubmission)
-            RETURN s.id as id,
-                   s.project_id as project_id,
-                   s.content as content,
-                   s.attempt_number as attempt_number,
-                   s.status as status,
-                   properties(s).score as score,
-                   properties(s).passed as passed,
-                   properties(s).feedback as feedback,
-                   properties(s).submitted_at as submitted_at,
-                   properties(s).evaluated_at as evaluated_at
-            ORDER BY s.submitted_at DESC
-            """,
+        result = self._read(
+            _LIST_PROJECT_SUBMISSIONS_QUERY,
             {"project_id": project_id},
         )
         return result
 
+    def iter_project_submissions(self, project_id: str, fetch_size: int = 1000) -> Iterator[dict]:
+        """Yield a project's submissions as they stream in, newest first."""
+        for record in self._stream(
+            _LIST_PROJECT_SUBMISSIONS_QUERY, {"project_id": project_id}, fetch_size
+        ):
+            yield record.data()
+
     def get_project_submission_count(self, project_id: str) -> int:
         """Get submission count for a project."""
-        if not self.label_exists("ProjectSubmission"):
-            return 0
-        result = self.query(
-            """
-            MATCH (ps:ProjectSummary {id: $project_id})-[:HAS_SUBMISSION]->(s:ProjectSubmission)
-            RETURN count(s) as submission_count
-            """,
+        result = self._read(
+            _PROJECT_SUBMISSION_COUNT_QUERY,
             {"project_id": project_id},
         )
         return result[0].get("submission_count", 0) if result else 0
 
     def get_submission(self, submission_id: str) -> list[dict]:
         """Fetch a submission by id."""
-        if not self.label_exists("ProjectSubmission"):
-            return []
-        result = self.query(
-            """
-            MATCH (s:ProjectSubmission {id: $submission_id})
-            RETURN s.id as id,
-                   s.project_id as project_id,
-                   s.content as content,
-                   s.attempt_number as attempt_number,
-                   s.status as status,
-                   properties(s).score as score,
-                   properties(s).passed as passed,
-                   properties(s).feedback as feedback,
-                   properties(s).submitted_at as submitted_at,
-                   properties(s).evaluated_at as evaluated_at
-            """,
+        result = self._read(
+            _GET_SUBMISSION_QUERY,
             {"submission_id": submission_id},
         )
         return result
@@ -1778,51 +3088,73 @@ class Neo4jClient:
         prompt_version: str,
     ) -> None:
         """Persist evaluation results and update submission."""
-        rubric_payload = json.dumps(rubric) if isinstance(rubric, dict) else json.dumps({})
-        skill_evidence_payload = json.dumps(skill_evidence) if isinstance(skill_evidence, dict) else json.dumps({})
+        self.ensure_schema()
         self.query(
-            """
-            MATCH (s:ProjectSubmission {id: $submission_id})
-            SET s.status = 'evaluated',
-                s.score = $score,
-                s.passed = $passed,
-                s.feedback = $overall_feedback,
-                s.evaluated_at = datetime()
-            WITH s
-            CREATE (e:ProjectEvaluation {
-                id: $evaluation_id,
-                submission_id: $submission_id,
-                score: $score,
-                rubric: $rubric,
-                skill_evidence: $skill_evidence,
-                overall_feedback: $overall_feedback,
-                suggestions: $suggestions,
-                passed: $passed,
-                model_used: $model_used,
-                prompt_version: $prompt_version,
-                evaluated_at: datetime()
-            })
-            CREATE (s)-[:HAS_EVALUATION]->(e)
-            WITH s, e
-            MATCH (p:Project {id: s.project_id})
-            MATCH (ps:ProjectSummary {id: s.project_id})
-            CREATE (p)-[:HAS_EVALUATION]->(e)
-            CREATE (ps)-[:HAS_EVALUATION]->(e)
-            """,
-            {
-                "submission_id": submission_id,
-                "evaluation_id": evaluation_id,
-                "score": score,
-                "rubric": rubric_payload,
-                "skill_evidence": skill_evidence_payload,
-                "overall_feedback": overall_feedback,
-                "suggestions": suggestions,
-                "passed": passed,
-                "model_used": model_used,
-                "prompt_version": prompt_version,
-            },
+            _SAVE_SUBMISSION_EVALUATION_QUERY,
+            _submission_evaluation_params(
+                submission_id, evaluation_id, score, rubric, skill_evidence,
+                overall_feedback, suggestions, passed, model_used, prompt_version,
+            ),
         )
 
+    def save_capstone_evaluation(
+        self,
+        project_id: str,
+        submission_id: str,
+        evaluation_id: str,
+        score: float,
+        rubric: dict,
+        skill_evidence: dict,
+        overall_feedback: str,
+        suggestions: list[str],
+        passed: bool,
+        model_used: str,
+        prompt_version: str,
+        summary_json: str,
+        capstone_status: str,
+        completed_at: Optional[str],
+    ) -> None:
+        """
+        Persist an evaluation and the capstone state it produces together.
+
+        Runs the save_submission_evaluation, update_project_summary_json and
+        update_project_capstone_state statements in one write transaction,
+        so they share a commit and a failure applies none of them.
+        """
+        self.ensure_schema()
+        self._write(self._run_statements_tx, [
+            (
+                _SAVE_SUBMISSION_EVALUATION_QUERY,
+                _submission_evaluation_params(
+                    submission_id, evaluation_id, score, rubric, skill_evidence,
+                    overall_feedback, suggestions, passed, model_used, prompt_version,
+                ),
+            ),
+            (
+                _UPDATE_PROJECT_SUMMARY_JSON_QUERY,
+                {
+                    "project_id": project_id,
+                    "summary_json": summary_json,
+                    **_summary_match_keys(summary_json),
+                },
+            ),
+            (
+                _UPDATE_PROJECT_CAPSTONE_STATE_QUERY,
+                {
+                    "project_id": project_id,
+                    "status": capstone_status,
+                    "score": score,
+                    "completed_at": completed_at,
+                },
+            ),
+        ])
+
+    @staticmethod
+    def _run_statements_tx(tx, statements: list[tuple[str, dict]]) -> None:
+        """Transaction body running each (query, params) pair in order."""
+        for cypher, params in statements:
+            tx.run(cypher, params).consume()
+
     def update_submission_status(
         self,
         submission_id: str,
@@ -1831,40 +3163,15 @@ class Neo4jClient:
     ) -> None:
         """Update submission status and optional feedback."""
         self.query(
-            """
-            MATCH (s:ProjectSubmission {id: $submission_id})
-            SET s.status = $status,
-                s.feedback = CASE
-                    WHEN $feedback IS NULL THEN s.feedback
-                    ELSE $feedback
-                END,
-                s.evaluated_at = datetime()
-            """,
+            _UPDATE_SUBMISSION_STATUS_QUERY,
             {"submission_id": submission_id, "status": status, "feedback": feedback},
         )
 
     def list_submission_evaluations(self, submission_id: str) -> list[dict]:
-        """List evaluations for a submission."""
-        if not self.label_exists("ProjectEvaluation"):
-            return []
-        result = self.query(
-            """
-            MATCH (s:ProjectSubmission {id: $submission_id})-[:HAS_EVALUATION]->(e:ProjectEvaluation)
-            RETURN e.id as id,
-                   e.score as score,
-                   e.rubric as rubric,
-                   e.skill_evidence as skill_evidence,
-                   e.overall_feedback as overall_feedback,
-                   e.suggestions as suggestions,
-                   e.passed as passed,
-                   e.model_used as model_used,
-                   e.prompt_version as prompt_version,
-                   e.evaluated_at as evaluated_at
-            ORDER BY e.evaluated_at DESC
-            """,
-            {"submission_id": submission_id},
+        """List evaluations for a submission, with rubric and skill evidence decoded."""
+        return _submission_evaluations(
+            self._read(_LIST_SUBMISSION_EVALUATIONS_QUERY, {"submission_id": submission_id})
         )
-        return result
 
     def update_project_assessment(
         self,
@@ -1876,19 +3183,7 @@ class Neo4jClient:
     ) -> None:
         """Update assessment evaluation."""
         self.query(
-            """
-            MATCH (a:ProjectAssessment {id: $assessment_id})
-            SET a.status = $status,
-                a.feedback = $feedback,
-                a.answer = $answer,
-                a.archived = CASE WHEN $archived IS NULL THEN a.archived ELSE $archived END,
-                a.archived_at = CASE
-                    WHEN $archived IS NULL THEN a.archived_at
-                    WHEN $archived THEN datetime()
-                    ELSE null
-                END,
-                a.updated_at = datetime()
-            """,
+            _UPDATE_PROJECT_ASSESSMENT_QUERY,
             {
                 "assessment_id": assessment_id,
                 "status": status,
@@ -1901,30 +3196,20 @@ class Neo4jClient:
     def archive_project_assessment(self, project_id: str, assessment_id: str) -> None:
         """Archive an assessment."""
         self.query(
-            """
-            MATCH (p:ProjectSummary {id: $project_id})-[:HAS_ASSESSMENT]->(a:ProjectAssessment {id: $assessment_id})
-            SET a.archived = true,
-                a.archived_at = datetime()
-            """,
+            _ARCHIVE_PROJECT_ASSESSMENT_QUERY,
             {"project_id": project_id, "assessment_id": assessment_id},
         )
 
     def delete_project_assessment(self, project_id: str, assessment_id: str) -> None:
         """Delete an assessment from a project."""
         self.query(
-            """
-            MATCH (p:ProjectSummary {id: $project_id})-[:HAS_ASSESSMENT]->(a:ProjectAssessment {id: $assessment_id})
-            DETACH DELETE a
-            """,
+            _DELETE_PROJECT_ASSESSMENT_QUERY,
             {"project_id": project_id, "assessment_id": assessment_id},
         )
 
     def get_node_by_id(self, node_id: str) -> Optional[dict]:
         """Get a node by its ID."""
-        result = self.query(
-            "MATCH (n) WHERE n.id = $node_id OR elementId(n) = $node_id RETURN n",
-            {"node_id": node_id}
-        )
+        result = self._read(_GET_NODE_QUERIES[_is_element_id(node_id)], {"node_id": node_id})
         if result:
             return {"node": result[0]["n"]}
         return None
@@ -1939,26 +3224,9 @@ class Neo4jClient:
         Returns:
             Dictionary with deleted node id and count of deleted relationships
         """
-        # First get the count of relationships
-        count_result = self.query(
-            """
-            MATCH (n)-[r]-()
-            WHERE n.id = $node_id OR elementId(n) = $node_id
-            RETURN COUNT(r) as rel_count
-            """,
-            {"node_id": node_id}
-        )
-        rel_count = count_result[0].get("rel_count", 0) if count_result else 0
-        
-        # Then delete the node with relationships
-        self.query(
-            """
-            MATCH (n)
-            WHERE n.id = $node_id OR elementId(n) = $node_id
-            DETACH DELETE n
-            """,
-            {"node_id": node_id}
-        )
+        result = self.query(_DELETE_NODE_QUERIES[_is_element_id(node_id)], {"node_id": node_id})
+        self.invalidate_stats()
+        rel_count = result[0].get("rel_count", 0) if result else 0
         
         return {
             "deleted_node_id": node_id,
@@ -1970,22 +3238,19 @@ class Neo4jClient:
         Delete a specific relationship between two nodes.
         
         Args:
-            source_id: Source node ID
-            target_id: Target node ID
+            source_id: Source node ID or element ID
+            target_id: Target node ID or element ID
             rel_type: Relationship type
             
         Returns:
             Dictionary with deletion status
         """
         result = self.query(
-            """
-            MATCH (n {id: $source_id})-[r:`$rel_type`]->(m {id: $target_id})
-            DELETE r
-            RETURN COUNT(r) as deleted_count
-            """,
+            _DELETE_RELATIONSHIP_QUERIES[_is_element_id(source_id), _is_element_id(target_id)],
             {"source_id": source_id, "target_id": target_id, "rel_type": rel_type}
         )
-        if result:
+        if result and result[0].get("deleted_count", 0) > 0:
+            self.invalidate_stats()
             return {
                 "deleted": True,
                 "source": source_id,
@@ -2005,15 +3270,7 @@ class Neo4jClient:
         Returns:
             List of connected node info with relationship types
         """
-        result = self.query(
-            """
-            MATCH (n)-[r]-(connected)
-            WHERE n.id = $node_id OR elementId(n) = $node_id
-            RETURN COALESCE(connected.id, elementId(connected)) as id, labels(connected) as labels, type(r) as rel_type
-            """,
-            {"node_id": node_id}
-        )
-        return result
+        return self._read(_CONNECTED_NODES_QUERIES[_is_element_id(node_id)], {"node_id": node_id})
 
     # =========================================================================
     # Remediation methods
@@ -2048,29 +3305,9 @@ class Neo4jClient:
         Returns:
             Dictionary with created node info
         """
+        self.ensure_schema()
         self.query(
-            """
-            MATCH (ps:ProjectSummary) WHERE ps.id = $project_id OR elementId(ps) = $project_id
-            MATCH (p:Project) WHERE p.id = $project_id OR elementId(p) = $project_id
-            CREATE (r:ProjectLesson:Concept {
-                id: $node_id,
-                title: $title,
-                name: $title,
-                description: $description,
-                explanation: $explanation,
-                diagnosis: $diagnosis,
-                severity: $severity,
-                before_node_id: $before_node_id,
-                triggered_by_assessment: $triggered_by_assessment,
-                node_type: 'remediation',
-                is_remediation: true,
-                created_at: datetime(),
-                archived: false,
-                version: 1
-            })
-            CREATE (p)-[:HAS_LESSON {version: 1, created_at: datetime()}]->(r)
-            CREATE (ps)-[:HAS_LESSON]->(r)
-            """,
+            _CREATE_REMEDIATION_NODE_QUERIES[_is_element_id(project_id), _is_element_id(before_node_id)],
             {
                 "project_id": project_id,
                 "node_id": node_id,
@@ -2084,19 +3321,6 @@ class Neo4jClient:
             },
         )
 
-        self.query(
-            """
-            MATCH (r:ProjectLesson {id: $remediation_id})
-            MATCH (target)
-            WHERE target.id = $before_node_id OR elementId(target) = $before_node_id
-            MERGE (r)-[:PREREQUISITE_FOR {version: 1, created_at: datetime()}]->(target)
-            """,
-            {
-                "remediation_id": node_id,
-                "before_node_id": before_node_id,
-            },
-        )
-
         return {
             "id": node_id,
             "title": title,
@@ -2106,50 +3330,14 @@ class Neo4jClient:
 
     def get_prerequisite_nodes(self, node_id: str) -> list[dict]:
         """Get prerequisite/dependency nodes for a given node."""
-        # Check which relationship types exist to avoid Neo4j warnings
-        rel_types = []
-        for rel in ["PREREQUISITE_FOR", "REQUIRES", "DEPENDS_ON"]:
-            if self.relationship_type_exists(rel):
-                rel_types.append(rel)
-        
-        if not rel_types:
-            return []
-        
-        rel_pattern = "|".join(f":{r}" for r in rel_types)
-        result = self.query(
-            f"""
-            MATCH (prereq)-[{rel_pattern}]->(n)
-            WHERE n.id = $node_id OR elementId(n) = $node_id
-            RETURN COALESCE(prereq.id, elementId(prereq)) as id,
-                   prereq.name as name,
-                   labels(prereq) as labels
-            """,
+        return self._read(
+            _PREREQUISITE_NODES_QUERIES[_is_element_id(node_id)],
             {"node_id": node_id},
         )
-        return result
 
     def list_remediation_nodes(self, project_id: str) -> list[dict]:
         """List all remediation nodes for a project (legacy and new)."""
-        # Supports old RemediationConcept and new ProjectLesson with is_remediation=true
-        result = self.query(
-            """
-            MATCH (ps:ProjectSummary {id: $project_id})-[:HAS_REMEDIATION|HAS_LESSON]->(r)
-            WHERE (r:RemediationConcept) OR (r:ProjectLesson AND r.is_remediation = true)
-            RETURN r.id as id,
-                   COALESCE(r.title, r.name) as name,
-                   r.description as description,
-                   r.explanation as explanation,
-                   r.diagnosis as diagnosis,
-                   r.severity as severity,
-                   r.before_node_id as before_node_id,
-                   r.triggered_by_assessment as triggered_by_assessment,
-                   r.created_at as created_at
-            ORDER BY r.created_at DESC
-            """,
-            {"project_id": project_id},
-        )
-        return result
-        return result
+        return self._read(_LIST_REMEDIATION_NODES_QUERY, {"project_id": project_id})
 
     def track_remediation_event(
         self,
@@ -2159,34 +3347,45 @@ class Neo4jClient:
         diagnosis_summary: str,
         severity: str,
     ) -> None:
-        """Log a remediation event for auditability."""
-        self.query(
-            """
-            MATCH (ps:ProjectSummary {id: $project_id})
-            CREATE (e:RemediationEvent {
-                id: $event_id,
-                project_id: $project_id,
-                assessment_id: $assessment_id,
-                remediation_node_id: $remediation_node_id,
-                diagnosis_summary: $diagnosis_summary,
-                severity: $severity,
-                created_at: datetime()
-            })
-            CREATE (ps)-[:HAS_REMEDIATION_EVENT]->(e)
-            """,
-            {
-                "project_id": project_id,
-                "event_id": f"rem-event-{assessment_id[-8:]}",
-                "assessment_id": assessment_id,
-                "remediation_node_id": remediation_node_id,
-                "diagnosis_summary": diagnosis_summary,
-                "severity": severity,
-            },
-        )
+        """
+        Log a remediation event for auditability.
+
+        The event is buffered with its timestamp and written in a batch by
+        flush_remediation_events, which closing the client also calls. A
+        full buffer is flushed immediately.
+        """
+        event = {
+            "project_id": project_id,
+            "event_id": f"rem-event-{assessment_id[-8:]}",
+            "assessment_id": assessment_id,
+            "remediation_node_id": remediation_node_id,
+            "diagnosis_summary": diagnosis_summary,
+            "severity": severity,
+            "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        }
+        with self._event_buffer_lock:
+            self._event_buffer.append(event)
+            full = len(self._event_buffer) >= BULK_WRITE_BATCH_SIZE
+        if full:
+            self.flush_remediation_events()
+
+    def flush_remediation_events(self) -> int:
+        """
+        Write buffered remediation events with one UNWIND per batch.
+
+        Returns:
+            Number of events written
+        """
+        with self._event_buffer_lock:
+            events = self._event_buffer
+            self._event_buffer = []
+        if events:
+            self._write_rows(_TRACK_REMEDIATION_EVENTS_QUERY, events)
+        return len(events)
 
     def get_assessment_by_id(self, assessment_id: str) -> Optional[dict]:
         """Get an assessment by its ID."""
-        result = self.query(
+        result = self._read(
             """
             MATCH (a:ProjectAssessment {id: $assessment_id})
             OPTIONAL MATCH (a)-[:ASSESSMENT_FOR]->(l:ProjectLesson)
@@ -2206,21 +3405,84 @@ class Neo4jClient:
 
     def get_remediation_node(self, node_id: str) -> Optional[dict]:
         """Get a remediation node by ID (legacy or new)."""
-        result = self.query(
-            """
-            MATCH (r)
-            WHERE (r:RemediationConcept AND r.id = $node_id) 
-               OR (r:ProjectLesson AND r.is_remediation = true AND r.id = $node_id)
-            RETURN r.id as id,
-                   COALESCE(r.title, r.name) as name,
-                   r.description as description,
-                   r.explanation as explanation,
-                   r.diagnosis as diagnosis,
-                   r.severity as severity,
-                   r.before_node_id as before_node_id,
-                   r.triggered_by_assessment as triggered_by_assessment,
-                   r.created_at as created_at
-            """,
-            {"node_id": node_id},
-        )
+        result = self._read(_GET_REMEDIATION_NODE_QUERY, {"node_id": node_id})
         return result[0] if result else None
+
+
+class AsyncNeo4jClient:
+    """
+    Async Neo4j client for reads served from async request handlers.
+
+    Mirrors the matching Neo4jClient read methods on an AsyncGraphDatabase
+    driver, so awaiting a query yields the event loop instead of blocking
+    it. Meant to be used per request as an async context manager; clients
+    on the same event loop share one driver, see _shared_async_driver.
+    """
+
+    def __init__(self, neo4j_config: Optional[Neo4jConfig] = None):
+        """
+        Initialize async Neo4j client.
+
+        Args:
+            neo4j_config: Optional config override. Uses global config if not provided.
+        """
+        self._config = neo4j_config or config.neo4j
+        self._driver = None
+
+    @property
+    def driver(self) -> AsyncDriver:
+        """Get the shared async driver for the running loop and connection target."""
+        if self._driver is None:
+            self._driver = _shared_async_driver(self._config)
+        return self._driver
+
+    async def _read(
+        self,
+        cypher: str,
+        params: Optional[dict] = None,
+        transformer: Callable[[AsyncResult], Any] = AsyncResult.data,
+    ) -> Any:
+        """Execute a read-only Cypher query, see Neo4jClient._read."""
+        return await self.driver.execute_query(
+            cypher,
+            params or {},
+            database_=self._config.database,
+            routing_=RoutingControl.READ,
+            result_transformer_=transformer,
+        )
+
+    async def get_chat_history(
+        self,
+        session_id: str,
+        since_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """Get chat history for a session, optionally only messages after ``since_seq``."""
+        return _format_timestamps(await self._read(
+            _with_limit(_CHAT_HISTORY_QUERY, limit),
+            {"session_id": session_id, "since_seq": since_seq, "limit": limit},
+        ))
+
+    async def get_pending_proposals(self, session_id: str) -> list[dict]:
+        """Get pending project proposals for a chat session."""
+        return _pending_proposals(await self._read(_PENDING_PROPOSALS_QUERY, {"session_id": session_id}))
+
+    async def list_project_lessons(self, project_id: str) -> list[dict]:
+        """List lessons for a project."""
+        return await self._read(_PROJECT_LESSONS_QUERY, {"project_id": project_id})
+
+    async def get_project_graph_counts(self, project_id: str) -> dict:
+        """Return counts of nodes and relationships connected to a project."""
+        return _project_graph_counts(
+            await self._read(_PROJECT_GRAPH_COUNTS_QUERY, {"project_id": project_id})
+        )
+
+    async def close(self) -> None:
+        """Release this client's reference to the shared async driver."""
+        self._driver = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -26,6 +26,7 @@ class GraphTransformer:
         llm: Optional[BaseChatModel] = None,
         schema: Optional[GraphSchema] = None,
         ignore_tool_usage: bool = False,
+        provider: Optional[str] = None,
     ):
         """
         Initialize GraphTransformer.
@@ -35,14 +36,15 @@ class GraphTransformer:
             schema: Graph schema defining allowed nodes/relationships.
                    Defaults to SkillGraphSchema.
             ignore_tool_usage: If True, use prompt-based extraction instead of tools.
+            provider: Active LLM provider name. Resolved once from config if not provided.
         """
         self._llm = llm
         self._schema = schema or SkillGraphSchema
+        self._provider = provider or config.llm.provider
         
         # Default to prompt extraction for OpenRouter and Ollama as they often struggle with tool formats
         if ignore_tool_usage is False:
-            provider = config.llm.provider
-            if provider in ("openrouter", "ollama"):
+            if self._provider in ("openrouter", "ollama"):
                 ignore_tool_usage = True
                 
         self._ignore_tool_usage = ignore_tool_usage
@@ -74,8 +76,7 @@ class GraphTransformer:
             
             # LLMGraphTransformer doesn't support property extraction when ignore_tool_usage is True
             # We also force it for OpenRouter/Ollama as they often fail to follow the tool schema anyway
-            provider = config.llm.provider
-            if self._ignore_tool_usage or provider in ("openrouter", "ollama"):
+            if self._ignore_tool_usage or self._provider in ("openrouter", "ollama"):
                 kwargs.pop("node_properties", None)
                 kwargs.pop("relationship_properties", None)
                 
@@ -130,7 +131,7 @@ class GraphTransformer:
         Returns:
             List of GraphDocument objects.
         """
-        if config.llm.provider == "mock":
+        if self._provider == "mock":
             return self._mock_documents(text)
         documents = [Document(page_content=text)]
         return self.convert_to_graph_documents(documents)
@@ -145,7 +146,7 @@ class GraphTransformer:
         Returns:
             List of GraphDocument objects.
         """
-        if config.llm.provider == "mock":
+        if self._provider == "mock":
             return self._mock_documents(text)
         documents = [Document(page_content=text)]
         return await self.aconvert_to_graph_documents(documents)
@@ -160,7 +161,7 @@ class GraphTransformer:
         Returns:
             List of GraphDocument objects from all texts.
         """
-        if config.llm.provider == "mock":
+        if self._provider == "mock":
             results = []
             for text in texts:
                 results.extend(self._mock_documents(text))
@@ -178,7 +179,7 @@ class GraphTransformer:
         Returns:
             List of GraphDocument objects from all texts.
         """
-        if config.llm.provider == "mock":
+        if self._provider == "mock":
             results = []
             for text in texts:
                 results.extend(self._mock_documents(text))
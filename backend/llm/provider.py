@@ -3,21 +3,12 @@ LLM provider module for Endstate.
 Supports Ollama (local) and Gemini (API) providers.
 """
 from typing import Optional, Union
-from enum import Enum
 
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage
 import json
 
-from ..config import LLMConfig, config
-
-
-class LLMProvider(str, Enum):
-    """Supported LLM providers."""
-    OLLAMA = "ollama"
-    GEMINI = "gemini"
-    OPENROUTER = "openrouter"
-    MOCK = "mock"
+from ..config import LLMConfig, LLMProvider, config
 
 
 def get_llm(
@@ -42,19 +33,10 @@ def get_llm(
     llm_config = llm_config or config.llm
     provider = provider or llm_config.provider
     
-    if isinstance(provider, str):
+    if not isinstance(provider, LLMProvider):
         provider = LLMProvider(provider.lower())
     
-    if provider == LLMProvider.OLLAMA:
-        return _get_ollama_llm(llm_config, **kwargs)
-    elif provider == LLMProvider.GEMINI:
-        return _get_gemini_llm(llm_config, **kwargs)
-    elif provider == LLMProvider.OPENROUTER:
-        return _get_openrouter_llm(llm_config, **kwargs)
-    elif provider == LLMProvider.MOCK:
-        return MockChatModel()
-    else:
-        raise ValueError(f"Unsupported LLM provider: {provider}")
+    return _PROVIDER_FACTORIES[provider](llm_config, **kwargs)
 
 
 def _get_ollama_llm(llm_config: LLMConfig, **kwargs) -> BaseChatModel:
@@ -121,6 +103,16 @@ def _get_openrouter_llm(llm_config: LLMConfig, **kwargs) -> BaseChatModel:
     )
 
 
+# Provider dispatch table, built once at import. Entries look the factory up
+# at call time so the module-level functions remain patchable.
+_PROVIDER_FACTORIES = {
+    LLMProvider.OLLAMA: lambda llm_config, **kwargs: _get_ollama_llm(llm_config, **kwargs),
+    LLMProvider.GEMINI: lambda llm_config, **kwargs: _get_gemini_llm(llm_config, **kwargs),
+    LLMProvider.OPENROUTER: lambda llm_config, **kwargs: _get_openrouter_llm(llm_config, **kwargs),
+    LLMProvider.MOCK: lambda llm_config, **kwargs: MockChatModel(),
+}
+
+
 def test_llm(llm: BaseChatModel) -> tuple[bool, str]:
     """
     Test an LLM connection.
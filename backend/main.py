@@ -2,14 +2,17 @@
 Endstate API Server
 FastAPI backend for the knowledge graph visualization, management, and chat interface.
 """
+import asyncio
+import itertools
 import json
 from datetime import datetime
 import uuid
-from typing import Optional
+from typing import Generator, Optional
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 
 from backend.services.knowledge_graph import KnowledgeGraphService
 from backend.services.chat_service import chat_service, BackgroundTaskStore
@@ -24,15 +27,8 @@ from backend.services.evaluation_service import (
     evaluate_submission,
 )
 from backend.services.task_registry import TaskRegistry
-from backend.db.neo4j_client import DEFAULT_PROJECT_ID
-from backend.config import (
-    X_GEMINI_API_KEY,
-    X_OPENROUTER_API_KEY,
-    X_NEO4J_URI,
-    X_NEO4J_USERNAME,
-    X_NEO4J_PASSWORD,
-    X_LLM_PROVIDER,
-)
+from backend.db.neo4j_client import DEFAULT_PROJECT_ID, json_dumps
+from backend.config import request_scope
 
 
 class ChatMessage(BaseModel):
@@ -155,35 +151,16 @@ task_registry = TaskRegistry()
 @app.middleware("http")
 async def extract_config_headers(request: Request, call_next):
     """Extract configuration from headers and set in context variables."""
-    # Extract headers
-    gemini_key = request.headers.get("X-Gemini-API-Key")
-    neo4j_uri = request.headers.get("X-Neo4j-URI")
-    neo4j_user = request.headers.get("X-Neo4j-User")
-    neo4j_password = request.headers.get("X-Neo4j-Password")
-    openrouter_key = request.headers.get("X-OpenRouter-API-Key") or request.headers.get("X-Gemini-API-Key")
-    llm_provider = request.headers.get("X-LLM-Provider")
-
-    # Set context variables and restore them after request
-    tokens = []
-    
-    def set_if_valid(var, val):
-        if val and val.strip():
-            tokens.append(var.set(val.strip()))
-
-    set_if_valid(X_GEMINI_API_KEY, gemini_key)
-    set_if_valid(X_OPENROUTER_API_KEY, openrouter_key)
-    set_if_valid(X_NEO4J_URI, neo4j_uri)
-    set_if_valid(X_NEO4J_USERNAME, neo4j_user)
-    set_if_valid(X_NEO4J_PASSWORD, neo4j_password)
-    set_if_valid(X_LLM_PROVIDER, llm_provider)
-
-    try:
-        response = await call_next(request)
-        return response
-    finally:
-        # Reset context variables (in reverse order)
-        for token in reversed(tokens):
-            token.var.reset(token)
+    headers = request.headers
+    with request_scope(
+        gemini_api_key=headers.get("X-Gemini-API-Key"),
+        openrouter_api_key=headers.get("X-OpenRouter-API-Key") or headers.get("X-Gemini-API-Key"),
+        neo4j_uri=headers.get("X-Neo4j-URI"),
+        neo4j_username=headers.get("X-Neo4j-User"),
+        neo4j_password=headers.get("X-Neo4j-Password"),
+        llm_provider=headers.get("X-LLM-Provider"),
+    ):
+        return await call_next(request)
 
 
 
@@ -192,6 +169,46 @@ def get_service():
     return KnowledgeGraphService()
 
 
+# Items read and encoded before a list response starts, so query and
+# encoding errors on them still come back as an error status; shorter lists
+# are sent whole
+STREAM_FIRST_PAGE_ITEMS = 1000
+
+
+def _json_list_response(key: str, items: Generator[dict, None, None]) -> Response:
+    """
+    Respond with ``{key: [...]}``, encoding items as they are read.
+
+    The first STREAM_FIRST_PAGE_ITEMS items are read inside the request, so
+    a failing query raises a 500 instead of truncating a 200 body, and the
+    read uses the request's connection overrides. A list that fits is sent
+    as one body once ``items`` is exhausted. Only longer lists are streamed,
+    and ``items`` is closed when the response ends, so a client that
+    disconnects does not hold its database session open.
+    """
+    try:
+        first_page = [
+            json_dumps(item) for item in itertools.islice(items, STREAM_FIRST_PAGE_ITEMS + 1)
+        ]
+    except Exception as e:
+        items.close()
+        raise HTTPException(status_code=500, detail=str(e))
+
+    head = f'{{"{key}": [' + ",".join(first_page)
+    if len(first_page) <= STREAM_FIRST_PAGE_ITEMS:
+        return Response(head + "]}", media_type="application/json")
+
+    def _body():
+        yield head
+        for item in items:
+            yield "," + json_dumps(item)
+        yield "]}"
+
+    return StreamingResponse(
+        _body(), media_type="application/json", background=BackgroundTask(items.close)
+    )
+
+
 @app.get("/")
 def root():
     """Root endpoint."""
@@ -240,12 +257,9 @@ def get_graph(project_id: Optional[str] = None):
             effective_project_id = service.db.get_most_recent_project_id()
         
         # Get filtered nodes and relationships
-        nodes = service.db.get_knowledge_graph_nodes_for_project(
-            effective_project_id
-        )
-        relationships = service.db.get_knowledge_graph_relationships_for_project(
-            effective_project_id
-        )
+        graph = service.db.get_knowledge_graph_for_project(effective_project_id)
+        nodes = graph["nodes"]
+        relationships = graph["relationships"]
         
         return {
             "nodes": nodes,
@@ -527,11 +541,11 @@ async def chat_event_stream(session_id: str):
 
 
 @app.get("/api/chat/{session_id}/messages")
-def get_chat_messages(session_id: str):
-    """Get all messages for a chat session."""
+def get_chat_messages(session_id: str, since_seq: Optional[int] = None, limit: Optional[int] = None):
+    """Get messages for a chat session, optionally only those after since_seq."""
     try:
         chat_service.clear_stale_lock(session_id)
-        messages = chat_service.get_messages(session_id)
+        messages = chat_service.get_messages(session_id, since_seq=since_seq, limit=limit)
         is_locked = chat_service.is_locked(session_id)
         proposals = chat_service.get_pending_proposals(session_id)
         return {"messages": messages, "is_locked": is_locked, "proposals": proposals}
@@ -541,9 +555,12 @@ def get_chat_messages(session_id: str):
 
 
 @app.get("/api/chat/{session_id}/proposals")
-def get_chat_proposals(session_id: str):
+async def get_chat_proposals(session_id: str):
     """Get pending project proposals for a chat session."""
-    proposals = chat_service.get_pending_proposals(session_id)
+    from backend.db.neo4j_client import AsyncNeo4jClient
+
+    async with AsyncNeo4jClient() as db:
+        proposals = await db.get_pending_proposals(session_id)
     return {"proposals": proposals}
 
 
@@ -684,36 +701,30 @@ def get_node_connections(node_id: str):
 def list_projects(limit: int = 50):
     """List project summaries."""
     from backend.db.neo4j_client import Neo4jClient
-    from neo4j.time import DateTime
 
     db = Neo4jClient()
     db.ensure_default_project()
-    records = db.list_project_summaries(limit=limit)
 
-    projects = []
-    for row in records:
-        created_at = row.get("created_at")
-        if isinstance(created_at, DateTime):
-            created_at = created_at.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    # The list is bounded by limit, so it is read in full and the session
+    # released before encoding; json_dumps formats DateTime values
+    rows = db.list_project_summaries(limit=limit, include_summary=True)
 
-        summary_json = row.get("summary_json") or "{}"
-        try:
-            data = json.loads(summary_json)
-        except Exception:
-            data = {}
+    def _projects():
+        for row in rows:
+            data = row.get("summary") or {}
 
-        capstone_data = data.get("capstone", {})
-        capstone_passed = bool(capstone_data.get("passed", False))
-        
-        projects.append({
-            "id": row.get("id"),
-            "name": row.get("name") or data.get("agreed_project", {}).get("name", "Untitled"),
-            "created_at": created_at,
-            "interests": data.get("user_profile", {}).get("interests", []),
-            "capstone_passed": capstone_passed,
-        })
+            capstone_data = data.get("capstone", {})
+            capstone_passed = bool(capstone_data.get("passed", False))
+
+            yield {
+                "id": row.get("id"),
+                "name": row.get("name") or data.get("agreed_project", {}).get("name", "Untitled"),
+                "created_at": row.get("created_at"),
+                "interests": data.get("user_profile", {}).get("interests", []),
+                "capstone_passed": capstone_passed,
+            }
 
-    return {"projects": projects}
+    return _json_list_response("projects", _projects())
 
 
 @app.get("/api/projects/{project_id}")
@@ -798,8 +809,7 @@ def delete_project(project_id: str):
     from backend.db.neo4j_client import Neo4jClient
 
     db = Neo4jClient()
-    records = db.get_project_summary(project_id)
-    if not records:
+    if not db.get_project_summary_meta(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
     try:
         if project_id == DEFAULT_PROJECT_ID:
@@ -812,29 +822,16 @@ def delete_project(project_id: str):
 
 
 @app.get("/api/projects/{project_id}/chat")
-def get_project_chat(project_id: str):
-    """Get chat history for a project."""
+def get_project_chat(project_id: str, since_idx: Optional[int] = None, limit: Optional[int] = None):
+    """Get chat history for a project, optionally only messages after since_idx."""
     from backend.db.neo4j_client import Neo4jClient
-    from neo4j.time import DateTime
 
     db = Neo4jClient()
-    records = db.get_project_chat_history(project_id)
-    if not records:
+    records = db.get_project_chat_history(project_id, since_idx=since_idx, limit=limit)
+    if not records and since_idx is None:
         raise HTTPException(status_code=404, detail="Chat history not found")
 
-    messages = []
-    for row in records:
-        timestamp = row.get("timestamp")
-        if isinstance(timestamp, DateTime):
-            timestamp = timestamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-        messages.append({
-            "role": row.get("role"),
-            "content": row.get("content"),
-            "timestamp": timestamp,
-            "request_id": row.get("request_id"),
-        })
-
-    return {"messages": messages}
+    return {"messages": records}
 
 
 @app.get("/api/projects/{project_id}/nodes")
@@ -1034,15 +1031,15 @@ async def queue_project_lesson(project_id: str, request: LessonGenerateRequest):
 
 
 @app.get("/api/projects/{project_id}/lessons")
-def list_project_lessons(project_id: str):
+async def list_project_lessons(project_id: str):
     """List stored lessons."""
-    from backend.db.neo4j_client import Neo4jClient
+    from backend.db.neo4j_client import AsyncNeo4jClient, Neo4jClient
     from neo4j.time import DateTime
 
-    db = Neo4jClient()
     if project_id == DEFAULT_PROJECT_ID:
-        db.ensure_default_project()
-    records = db.list_project_lessons(project_id)
+        await asyncio.to_thread(Neo4jClient().ensure_default_project)
+    async with AsyncNeo4jClient() as db:
+        records = await db.list_project_lessons(project_id)
     lessons = []
     for row in records:
         created_at = row.get("created_at")
@@ -1202,18 +1199,6 @@ async def submit_capstone(project_id: str, request: CapstoneSubmissionRequest):
             except (TypeError, ValueError):
                 safe_score = 0.0
             evaluation_id = f"eval-{uuid.uuid4().hex[:8]}"
-            db.save_submission_evaluation(
-                submission_id,
-                evaluation_id,
-                safe_score,
-                result.get("criteria", {}),
-                result.get("skill_evidence", {}),
-                result.get("overall_feedback", ""),
-                result.get("suggestions", []),
-                bool(result.get("passed")),
-                model_used,
-                str(result.get("prompt_version", "")),
-            )
             skill_evidence = result.get("skill_evidence", {}) if isinstance(result.get("skill_evidence"), dict) else {}
             if required_skills:
                 covered = sum(1 for value in skill_evidence.values() if value and "missing" not in str(value).lower())
@@ -1248,11 +1233,21 @@ async def submit_capstone(project_id: str, request: CapstoneSubmissionRequest):
                 completed_at = datetime.utcnow().isoformat()
                 capstone["completed_at"] = completed_at
             summary["capstone"] = capstone
-            db.update_project_summary_json(project_id, json.dumps(summary))
-            db.update_project_capstone_state(
+            # The evaluation and the capstone state it produces commit together
+            db.save_capstone_evaluation(
                 project_id,
+                submission_id,
+                evaluation_id,
+                safe_score,
+                result.get("criteria", {}),
+                result.get("skill_evidence", {}),
+                result.get("overall_feedback", ""),
+                result.get("suggestions", []),
+                bool(result.get("passed")),
+                model_used,
+                str(result.get("prompt_version", "")),
+                json.dumps(summary),
                 capstone.get("status", "in_progress"),
-                capstone.get("last_score", 0.0),
                 completed_at,
             )
             return {"submission_id": submission_id, "evaluation_id": evaluation_id, **result}
@@ -1269,33 +1264,29 @@ async def submit_capstone(project_id: str, request: CapstoneSubmissionRequest):
 def list_project_submissions(project_id: str):
     """List capstone submissions for a project."""
     from backend.db.neo4j_client import Neo4jClient
-    from neo4j.time import DateTime
 
     db = Neo4jClient()
     if project_id == DEFAULT_PROJECT_ID:
         return {"submissions": []}
-    records = db.list_project_submissions(project_id)
-    submissions = []
-    for row in records:
-        submitted_at = row.get("submitted_at")
-        evaluated_at = row.get("evaluated_at")
-        if isinstance(submitted_at, DateTime):
-            submitted_at = submitted_at.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-        if isinstance(evaluated_at, DateTime):
-            evaluated_at = evaluated_at.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-        submissions.append({
-            "id": row.get("id"),
-            "project_id": row.get("project_id"),
-            "content": row.get("content"),
-            "attempt_number": row.get("attempt_number"),
-            "status": row.get("status"),
-            "score": row.get("score"),
-            "passed": bool(row.get("passed")) if row.get("passed") is not None else False,
-            "feedback": row.get("feedback"),
-            "submitted_at": submitted_at,
-            "evaluated_at": evaluated_at,
-        })
-    return {"submissions": submissions}
+
+    # Rows are encoded as they stream from Neo4j instead of being
+    # collected into one list first; json_dumps formats DateTime values
+    def _submissions():
+        for row in db.iter_project_submissions(project_id):
+            yield {
+                "id": row.get("id"),
+                "project_id": row.get("project_id"),
+                "content": row.get("content"),
+                "attempt_number": row.get("attempt_number"),
+                "status": row.get("status"),
+                "score": row.get("score"),
+                "passed": bool(row.get("passed")) if row.get("passed") is not None else False,
+                "feedback": row.get("feedback"),
+                "submitted_at": row.get("submitted_at"),
+                "evaluated_at": row.get("evaluated_at"),
+            }
+
+    return _json_list_response("submissions", _submissions())
 
 
 @app.get("/api/submissions/{submission_id}")
@@ -1323,21 +1314,7 @@ def get_submission(submission_id: str):
         eval_at = entry.get("evaluated_at")
         if isinstance(eval_at, DateTime):
             eval_at = eval_at.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-        rubric = entry.get("rubric")
-        skill_evidence = entry.get("skill_evidence")
-        if isinstance(rubric, str):
-            try:
-                rubric = json.loads(rubric)
-            except Exception:
-                rubric = {}
-        if isinstance(skill_evidence, str):
-            try:
-                skill_evidence = json.loads(skill_evidence)
-            except Exception:
-                skill_evidence = {}
         formatted_evals.append({**entry, "evaluated_at": eval_at})
-        formatted_evals[-1]["rubric"] = rubric
-        formatted_evals[-1]["skill_evidence"] = skill_evidence
 
     return {
         "submission": {
@@ -1671,7 +1648,7 @@ async def start_project(project_id: str):
         normalized = service.normalize_documents(documents)
 
         # Filter out "Project" nodes to prevents duplicates of the main project node
-        # We rely on generic HAS_NODE/HAS_SKILL links for connecting items to the project
+        # We rely on HAS_SKILL/HAS_CONCEPT/HAS_TOPIC links for connecting items to the project
         filtered_docs = []
         for doc in normalized:
             valid_nodes = [n for n in doc.nodes if n.type != "Project"]
@@ -161,100 +161,40 @@ class ChatService:
     
     def create_session(self, session_id: str) -> None:
         """Create a chat session if it doesn't exist."""
-        self.db.query(
-            """
-            MERGE (s:ChatSession {id: $session_id})
-            ON CREATE SET s.created_at = datetime(),
-                          s.pending_proposals = $empty_list
-            """,
-            {"session_id": session_id, "empty_list": "[]"},
-        )
+        self.db.create_chat_session(session_id)
     
     def message_exists(self, session_id: str, request_id: str) -> bool:
         """Check if a message with this request_id already exists."""
-        result = self.db.query(
-            """
-            MATCH (s:ChatSession {id: $session_id})-[:HAS_MESSAGE]->(m:ChatMessage {request_id: $request_id})
-            RETURN count(m) as count
-            """,
-            {"session_id": session_id, "request_id": request_id}
-        )
-        return result[0].get("count", 0) > 0 if result else False
+        return self.db.chat_message_exists(session_id, request_id)
     
     def add_message(self, session_id: str, role: str, content: str, request_id: Optional[str] = None) -> dict:
         """Add a message to a chat session and return its payload."""
-        timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-        self.db.query(
-            """
-            MATCH (s:ChatSession {id: $session_id})
-            CREATE (m:ChatMessage {
-                role: $role,
-                content: $content,
-                timestamp: datetime($timestamp),
-                request_id: $request_id
-            })
-            CREATE (s)-[:HAS_MESSAGE]->(m)
-            """,
-            {
-                "session_id": session_id,
-                "role": role,
-                "content": content,
-                "timestamp": timestamp,
-                "request_id": request_id,
-            }
-        )
-        return {
+        message = {
             "role": role,
             "content": content,
-            "timestamp": timestamp,
+            "timestamp": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
             "request_id": request_id,
         }
+        self.db.add_chat_messages(session_id, [message])
+        return message
     
-    def get_messages(self, session_id: str) -> list[dict]:
-        """Get all messages for a session."""
-        result = self.db.query(
-            """
-            MATCH (s:ChatSession {id: $session_id})-[:HAS_MESSAGE]->(m:ChatMessage)
-            RETURN m.role as role, m.content as content, m.timestamp as timestamp, m.request_id as request_id
-            ORDER BY m.timestamp
-            """,
-            {"session_id": session_id}
-        )
-        
-        # Convert Neo4j DateTime to ISO string and handle missing request_id
-        messages = []
-        for msg in result:
-            msg_copy = {
-                "role": msg.get("role"),
-                "content": msg.get("content"),
-                "timestamp": None,
-                "request_id": msg.get("request_id"),
-            }
-            timestamp = msg.get("timestamp")
-            if timestamp:
-                try:
-                    # Neo4j DateTime to ISO string
-                    msg_copy["timestamp"] = timestamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-                except Exception:
-                    msg_copy["timestamp"] = None
-            messages.append(msg_copy)
-        
-        return messages
+    def get_messages(
+        self,
+        session_id: str,
+        since_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """Get messages for a session, optionally only those after ``since_seq``."""
+        # Timestamps come back as %Y-%m-%dT%H:%M:%S.%fZ strings
+        return self.db.get_chat_history(session_id, since_seq=since_seq, limit=limit)
     
     def set_locked(self, session_id: str, locked: bool) -> None:
         """Set the processing lock state."""
-        self.db.query(
-            "MATCH (s:ChatSession {id: $session_id}) SET s.is_processing = $locked",
-            {"session_id": session_id, "locked": locked}
-        )
+        self.db.set_session_locked(session_id, locked)
     
     def is_locked(self, session_id: str) -> bool:
         """Check if session is locked."""
-        result = self.db.query(
-            "MATCH (s:ChatSession {id: $session_id}) RETURN COALESCE(s.is_processing, false) as locked",
-            {"session_id": session_id},
-        )
-        return result[0].get("locked", False) if result else False
+        return self.db.is_session_locked(session_id)
 
     def get_pending_proposals(self, session_id: str) -> list[dict]:
         """Return pending proposals for a chat session."""
@@ -278,39 +218,44 @@ class ChatService:
     def delete_session(self, session_id: str) -> None:
         """Delete a session and all its messages."""
         BackgroundTaskStore.cancel(session_id)
-        self.db.query(
-            "MATCH (s:ChatSession {id: $session_id}) DETACH DELETE s",
-            {"session_id": session_id}
-        )
+        self.db.delete_chat_session(session_id)
     
     async def send_message(self, session_id: str, content: str, request_id: str) -> ChatResponse:
         """Send a message - idempotent by request_id."""
-        self.clear_stale_lock(session_id)
-        if self.is_locked(session_id):
+        timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        # Lock check, proposal check, idempotency check, storing the user
+        # message, locking and reading history share one round-trip. A lock
+        # with no background task behind it is stale and is taken over.
+        turn = self.db.begin_chat_turn(
+            session_id,
+            content,
+            request_id,
+            timestamp,
+            respect_lock=BackgroundTaskStore.has_task(session_id),
+        )
+        status = turn["status"]
+        if status == "locked":
             return ChatResponse(success=False, is_processing=True)
-        if self.has_pending_proposals(session_id):
+        if status == "pending_proposals":
             await BackgroundTaskStore.notify(session_id, "error", {
                 "message": "Please select a project or reject all proposals before continuing the chat."
             })
             return ChatResponse(success=False, is_processing=True)
-        self.create_session(session_id)
-        
-        # Check idempotency
-        if self.message_exists(session_id, request_id):
+        if status == "duplicate":
             return ChatResponse(success=True, already_processed=True)
         
-        # Add user message
-        user_message = self.add_message(session_id, "user", content, request_id)
-        
         # Notify subscribers of new user message
+        user_message = {
+            "role": "user",
+            "content": content,
+            "timestamp": timestamp,
+            "request_id": request_id,
+        }
         await BackgroundTaskStore.notify(session_id, "message_added", user_message)
-        
-        # Normal chat response - set locked state during processing
-        self.set_locked(session_id, True)
         await BackgroundTaskStore.notify(session_id, "processing_started", {"reason": "chat"})
         
         try:
-            history = self.get_messages(session_id)
+            history = turn["history"]
             if HISTORY_MAX_MESSAGES > 0 and len(history) > HISTORY_MAX_MESSAGES:
                 history = history[-HISTORY_MAX_MESSAGES:]
             messages_list = [("system", get_chat_system_prompt())]
@@ -60,6 +60,8 @@ class KnowledgeGraphService:
             ignore_tool_usage: If True, use prompt-based extraction.
         """
         self._config = app_config or config
+        # Resolve request-scoped overrides once for this service instance
+        self._resolved = self._config.snapshot()
         
         # Initialize LLM
         if llm is not None:
@@ -73,6 +75,7 @@ class KnowledgeGraphService:
             llm=self._llm,
             schema=schema or SkillGraphSchema,
             ignore_tool_usage=ignore_tool_usage,
+            provider=self._resolved.llm_provider,
         )
     
     @property
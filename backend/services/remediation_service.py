@@ -281,6 +281,33 @@ def create_remediation_node(
     return result
 
 
+# Background event flushes still running, kept so they are not collected early
+_PENDING_FLUSHES: set[asyncio.Task] = set()
+
+
+def _log_failed_flush(future: asyncio.Future) -> None:
+    """Log a background remediation event flush that raised."""
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Remediation event flush failed: {error}")
+
+
+def _flush_events_in_background(db) -> asyncio.Task:
+    """
+    Write buffered remediation events without waiting for the result.
+
+    The flush runs in a worker thread with a copy of the caller's context,
+    so request-scoped connection overrides still pick the database.
+    """
+    task = asyncio.create_task(asyncio.to_thread(db.flush_remediation_events))
+    _PENDING_FLUSHES.add(task)
+    task.add_done_callback(_PENDING_FLUSHES.discard)
+    task.add_done_callback(_log_failed_flush)
+    return task
+
+
 async def remediate_assessment_failure(
     db,
     project_id: str,
@@ -386,6 +413,8 @@ async def remediate_assessment_failure(
         diagnosis_summary=diagnosis.get("diagnosis", ""),
         severity=diagnosis.get("severity", "moderate"),
     )
+    # The audit write is not part of the result, so don't wait for it
+    _flush_events_in_background(db)
     
     return {
         "action": "node_created",
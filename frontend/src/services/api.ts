@@ -319,8 +319,15 @@ export async function getNodeConnections(nodeId: string): Promise<{ node_id: str
   return requestJson(`/api/graph/node/${encodeURIComponent(nodeId)}/connections`);
 }
 
-export async function getChatHistory(sessionId: string): Promise<{ messages: Array<{ role: string; content: string; timestamp: string }>; is_locked?: boolean }> {
-  return requestJson(`/api/chat/${sessionId}/messages`);
+export async function getChatHistory(
+  sessionId: string,
+  options: { sinceSeq?: number; limit?: number } = {},
+): Promise<{ messages: Array<{ role: string; content: string; timestamp: string; seq?: number | null }>; is_locked?: boolean }> {
+  const params = new URLSearchParams();
+  if (options.sinceSeq !== undefined) params.set('since_seq', String(options.sinceSeq));
+  if (options.limit !== undefined) params.set('limit', String(options.limit));
+  const query = params.toString();
+  return requestJson(`/api/chat/${sessionId}/messages${query ? `?${query}` : ''}`);
 }
 
 export async function checkSessionLocked(sessionId: string): Promise<{ locked: boolean }> {
@@ -652,8 +659,15 @@ export async function listProjectJobs(
   return requestJson(`/api/projects/${encodeURIComponent(projectId)}/jobs${query ? `?${query}` : ''}`);
 }
 
-export async function getProjectChat(projectId: string): Promise<{ messages: ChatMessage[] }> {
-  return requestJsonAllowNotFound(`/api/projects/${encodeURIComponent(projectId)}/chat`, { messages: [] });
+export async function getProjectChat(
+  projectId: string,
+  options: { sinceIdx?: number; limit?: number } = {},
+): Promise<{ messages: ChatMessage[] }> {
+  const params = new URLSearchParams();
+  if (options.sinceIdx !== undefined) params.set('since_idx', String(options.sinceIdx));
+  if (options.limit !== undefined) params.set('limit', String(options.limit));
+  const query = params.toString();
+  return requestJsonAllowNotFound(`/api/projects/${encodeURIComponent(projectId)}/chat${query ? `?${query}` : ''}`, { messages: [] });
 }
 
 export async function listProjectNodes(projectId: string): Promise<{ nodes: ApiNode[] }> {
@@ -87,7 +87,7 @@ def _create(base_url: str, project_id: str, project_name: str, skills: list[str]
     MERGE (s:Skill {id: skill.id})
     ON CREATE SET s.created_at = datetime()
     SET s.name = skill.name
-    MERGE (p)-[:HAS_NODE]->(s)
+    MERGE (p)-[:HAS_SKILL]->(s)
     RETURN p.id AS project_id
     """
     _call_query(base_url, cypher, {
@@ -103,12 +103,12 @@ def _cleanup(base_url: str, project_id: str) -> None:
     cypher = """
     MATCH (ps:ProjectSummary {id: $project_id})
     OPTIONAL MATCH (ps)-[:SUMMARY_FOR]->(p:Project)
-    OPTIONAL MATCH (p)-[:HAS_NODE]->(s:Skill)
+    OPTIONAL MATCH (p)-[:HAS_SKILL]->(s:Skill)
     WITH ps, p, collect(distinct s) AS skills
     DETACH DELETE ps, p
     WITH skills
     UNWIND skills AS s
-    OPTIONAL MATCH (s)<-[:HAS_NODE]-(:Project)
+    OPTIONAL MATCH (s)<-[:HAS_NODE|HAS_SKILL]-(:Project)
     WITH s, count(*) AS refs
     WHERE refs = 0
     DETACH DELETE s
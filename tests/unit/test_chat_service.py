@@ -8,9 +8,14 @@ from backend.services.chat_service import BackgroundTaskStore, ChatService
 
 
 class DummyDb:
+    turn_status = "started"
+
     def query(self, cypher: str, params: Optional[dict] = None) -> list[dict]:
         return []
 
+    def begin_chat_turn(self, session_id: str, content: str, request_id: str, timestamp: str, respect_lock: bool = True) -> dict:
+        return {"status": self.turn_status, "history": []}
+
     def get_chat_session_metadata(self, session_id: str) -> dict:
         return {}
 
@@ -83,8 +88,9 @@ async def test_event_stream_emits_message_metadata():
 
 @pytest.mark.asyncio
 async def test_locked_session_rejects_message():
-    service = ChatService(db=DummyDb())
-    service.is_locked = lambda _session_id: True  # type: ignore[assignment]
+    db = DummyDb()
+    db.turn_status = "locked"
+    service = ChatService(db=db)
 
     response = await service.send_message("session-123", "Hello", "req-1")
 
@@ -94,10 +100,23 @@ async def test_locked_session_rejects_message():
 
 @pytest.mark.asyncio
 async def test_pending_proposals_block_message():
-    service = ChatService(db=DummyDb())
-    service.has_pending_proposals = lambda _session_id: True  # type: ignore[assignment]
+    db = DummyDb()
+    db.turn_status = "pending_proposals"
+    service = ChatService(db=db)
 
     response = await service.send_message("session-123", "Hello", "req-1")
 
     assert response.success is False
     assert response.is_processing is True
+
+
+@pytest.mark.asyncio
+async def test_duplicate_request_is_already_processed():
+    db = DummyDb()
+    db.turn_status = "duplicate"
+    service = ChatService(db=db)
+
+    response = await service.send_message("session-123", "Hello", "req-1")
+
+    assert response.success is True
+    assert response.already_processed is True
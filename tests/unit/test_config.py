@@ -2,14 +2,18 @@
 Unit tests for configuration module.
 """
 import os
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from backend.config import (
     Neo4jConfig,
     OllamaConfig,
     GeminiConfig,
     LLMConfig,
+    LLMProvider,
     Config,
+    request_scope,
 )
 
 
@@ -19,7 +23,7 @@ class TestNeo4jConfig:
     def test_default_values(self):
         """Test default configuration values."""
         with patch.dict(os.environ, {}, clear=True):
-            config = Neo4jConfig()
+            config = Neo4jConfig.from_env()
             assert config.uri == "bolt://localhost:7687"
             assert config.username == "neo4j"
             assert config.password == "password123"
@@ -34,12 +38,35 @@ class TestNeo4jConfig:
             "NEO4J_DATABASE": "testdb",
         }
         with patch.dict(os.environ, env, clear=True):
-            config = Neo4jConfig()
+            config = Neo4jConfig.from_env()
             assert config.uri == "bolt://neo4j.example.com:7687"
             assert config.username == "admin"
             assert config.password == "secret"
             assert config.database == "testdb"
 
+    def test_pool_settings_from_environment(self):
+        """Test driver pool settings are parsed and passed as driver options."""
+        env = {
+            "NEO4J_MAX_POOL_SIZE": "10",
+            "NEO4J_ACQUISITION_TIMEOUT_SECONDS": "5",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            config = Neo4jConfig.from_env()
+        assert config.max_pool_size == 10
+        assert config.acquisition_timeout_seconds == 5.0
+        assert config.driver_options() == {
+            "max_connection_pool_size": 10,
+            "connection_acquisition_timeout": 5.0,
+            "max_connection_lifetime": 3600.0,
+            "connection_timeout": 30.0,
+        }
+
+    def test_invalid_pool_size_rejected(self):
+        """Test a non-integer pool size fails fast."""
+        with patch.dict(os.environ, {"NEO4J_MAX_POOL_SIZE": "lots"}, clear=True):
+            with pytest.raises(ValueError, match="NEO4J_MAX_POOL_SIZE"):
+                Neo4jConfig.from_env()
+
     def test_uri_property(self):
         """Test URI property."""
         config = Neo4jConfig(_uri="bolt://custom:7687")
@@ -52,7 +79,7 @@ class TestOllamaConfig:
     def test_default_values(self):
         """Test default Ollama configuration."""
         with patch.dict(os.environ, {}, clear=True):
-            config = OllamaConfig()
+            config = OllamaConfig.from_env()
             assert config.base_url == "http://localhost:11434"
             assert config.model == "llama3.2"
             assert config.temperature == 0.0
@@ -64,10 +91,22 @@ class TestOllamaConfig:
             "OLLAMA_MODEL": "mistral",
         }
         with patch.dict(os.environ, env, clear=True):
-            config = OllamaConfig()
+            config = OllamaConfig.from_env()
             assert config.base_url == "http://ollama.example.com:11434"
             assert config.model == "mistral"
 
+    def test_timeout_from_environment(self):
+        """Test numeric settings are parsed from the environment."""
+        with patch.dict(os.environ, {"OLLAMA_TIMEOUT_SECONDS": "30"}, clear=True):
+            config = OllamaConfig.from_env()
+            assert config.timeout_seconds == 30.0
+
+    def test_invalid_timeout_rejected(self):
+        """Test malformed numeric settings fail with a clear error."""
+        with patch.dict(os.environ, {"OLLAMA_TIMEOUT_SECONDS": "soon"}, clear=True):
+            with pytest.raises(ValueError, match="OLLAMA_TIMEOUT_SECONDS"):
+                OllamaConfig.from_env()
+
     def test_custom_temperature(self):
         """Test custom temperature setting."""
         config = OllamaConfig(temperature=0.7)
@@ -80,7 +119,7 @@ class TestGeminiConfig:
     def test_default_values(self):
         """Test default Gemini configuration."""
         with patch.dict(os.environ, {}, clear=True):
-            config = GeminiConfig()
+            config = GeminiConfig.from_env()
             assert config.api_key == ""
             assert config.model == "gemini-2.5-flash-lite"
             assert config.temperature == 0.0
@@ -92,7 +131,7 @@ class TestGeminiConfig:
             "GEMINI_MODEL": "gemini-pro",
         }
         with patch.dict(os.environ, env, clear=True):
-            config = GeminiConfig()
+            config = GeminiConfig.from_env()
             assert config.api_key == "test_api_key_123"
             assert config.model == "gemini-pro"
 
@@ -103,23 +142,47 @@ class TestLLMConfig:
     def test_default_provider(self):
         """Test default LLM provider is ollama."""
         with patch.dict(os.environ, {}, clear=True):
-            config = LLMConfig()
+            config = LLMConfig.from_env()
             assert config.provider == "ollama"
 
     def test_ollama_provider(self):
         """Test Ollama provider configuration."""
         with patch.dict(os.environ, {"LLM_PROVIDER": "ollama"}, clear=True):
-            config = LLMConfig()
+            config = LLMConfig.from_env()
             assert config.provider == "ollama"
             assert isinstance(config.ollama, OllamaConfig)
 
     def test_gemini_provider(self):
         """Test Gemini provider configuration."""
         with patch.dict(os.environ, {"LLM_PROVIDER": "gemini"}, clear=True):
-            config = LLMConfig()
+            config = LLMConfig.from_env()
             assert config.provider == "gemini"
             assert isinstance(config.gemini, GeminiConfig)
 
+    def test_provider_configs_built_on_first_access(self):
+        """Test provider sub-configs are only built when first accessed."""
+        factory = MagicMock(return_value=GeminiConfig(model="lazy"))
+        with patch.dict("backend.config._LLM_SUBCONFIGS", {"gemini": factory}):
+            config = LLMConfig()
+            factory.assert_not_called()
+            assert config.gemini.model == "lazy"
+            assert config.gemini.model == "lazy"
+        factory.assert_called_once()
+
+    def test_provider_resolves_to_enum(self):
+        """Test provider names resolve to LLMProvider members once."""
+        config = LLMConfig(_provider="Gemini")
+        assert config.provider is LLMProvider.GEMINI
+        assert config.provider == "gemini"
+        assert LLMConfig(_provider="custom").provider == "custom"
+
+    def test_active_provider_settings_routed(self):
+        """Test provider-level settings resolve through the active provider."""
+        config = LLMConfig(_provider="gemini", gemini=GeminiConfig(_api_key="k", model="gemini-pro"))
+        assert config.model == "gemini-pro"
+        assert config.api_key == "k"
+        assert not hasattr(LLMConfig(_provider="mock"), "model")
+
     def test_nested_configs(self):
         """Test that nested configs are properly initialized."""
         config = LLMConfig()
@@ -130,6 +193,12 @@ class TestLLMConfig:
 class TestConfig:
     """Tests for main Config class."""
 
+    def test_defaults_read_once_at_import(self):
+        """Test that plain construction does not re-read the environment."""
+        with patch.dict(os.environ, {"NEO4J_URI": "bolt://changed:7687"}):
+            config = Neo4jConfig()
+            assert config.uri != "bolt://changed:7687"
+
     def test_default_config(self):
         """Test default configuration."""
         with patch.dict(os.environ, {}, clear=True):
@@ -148,3 +217,19 @@ class TestConfig:
         neo4j_config = Neo4jConfig(_uri="bolt://override:7687")
         config = Config(neo4j=neo4j_config)
         assert config.neo4j.uri == "bolt://override:7687"
+
+    def test_snapshot_resolves_overrides(self):
+        """Test snapshot applies request-scoped overrides."""
+        config = Config(neo4j=Neo4jConfig(_uri="bolt://env:7687"))
+        with request_scope(neo4j_uri="bolt://header:7687", llm_provider="  "):
+            resolved = config.snapshot()
+        assert resolved.neo4j_uri == "bolt://header:7687"
+        assert resolved.llm_provider == config.llm.provider
+        assert config.snapshot().neo4j_uri == "bolt://env:7687"
+
+    def test_global_config_is_singleton(self):
+        """Test the lazily built global config is created only once."""
+        import backend.config as config_module
+
+        assert config_module.config is config_module.config
+        assert isinstance(config_module.config, Config)
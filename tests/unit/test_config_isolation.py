@@ -1,10 +1,6 @@
 import pytest
 import asyncio
-from backend.config import (
-    X_GEMINI_API_KEY, X_OPENROUTER_API_KEY, 
-    X_NEO4J_URI, X_NEO4J_USERNAME, X_NEO4J_PASSWORD,
-    config
-)
+from backend.config import REQUEST_OVERRIDES, config
 from backend.main import extract_config_headers
 from unittest.mock import MagicMock, AsyncMock
 
@@ -17,9 +13,10 @@ async def test_request_scoped_isolation():
     
     async def mock_call_next(request):
         # inside the "request", check if context is set
+        overrides = REQUEST_OVERRIDES.get()
         return {
-            "uri": X_NEO4J_URI.get(),
-            "user": X_NEO4J_USERNAME.get()
+            "uri": overrides.neo4j_uri,
+            "user": overrides.neo4j_username
         }
 
     # Request A with overrides
@@ -53,7 +50,7 @@ async def test_request_scoped_isolation():
     assert res_b["user"] == "user-b"
     
     # Request C should fall back to backend defaults
-    assert res_c["uri"] == "" # Default in ContextVar is ""
+    assert res_c["uri"] == "" # Default in Overrides is ""
     assert config.neo4j.uri == orig_uri # The global config object still uses env if ContextVar is empty
 
 @pytest.mark.asyncio
@@ -61,7 +58,7 @@ async def test_empty_header_discarded():
     """Verify that whitespace/empty headers are ignored."""
     
     async def mock_call_next(request):
-        return X_NEO4J_PASSWORD.get()
+        return REQUEST_OVERRIDES.get().neo4j_password
 
     # Request with whitespace password
     req = MagicMock()
@@ -69,7 +66,7 @@ async def test_empty_header_discarded():
     
     res = await extract_config_headers(req, mock_call_next)
     
-    # Should be empty string (the ContextVar default), NOT the whitespace
+    # Should be empty string (the Overrides default), NOT the whitespace
     assert res == ""
     # And global config should still return its default
     assert config.neo4j.password != "   "
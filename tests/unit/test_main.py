@@ -0,0 +1,68 @@
+"""
+Unit tests for API response helpers.
+"""
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.main import _json_list_response
+
+
+class TestJsonListResponse:
+    """Tests for _json_list_response."""
+
+    def test_short_list_sent_whole(self):
+        """Test that a list within the first page is not streamed."""
+        items = (item for item in [{"id": 1}, {"id": 2}])
+
+        response = _json_list_response("projects", items)
+
+        assert not isinstance(response, StreamingResponse)
+        assert json.loads(response.body) == {"projects": [{"id": 1}, {"id": 2}]}
+        assert next(items, None) is None
+
+    def test_query_error_is_an_error_status(self):
+        """Test that a failing read raises a 500 before the response starts."""
+        def items():
+            yield {"id": 1}
+            raise RuntimeError("neo4j down")
+
+        with pytest.raises(HTTPException) as exc_info:
+            _json_list_response("projects", items())
+
+        assert exc_info.value.status_code == 500
+
+    @pytest.mark.asyncio
+    @patch("backend.main.STREAM_FIRST_PAGE_ITEMS", 1)
+    async def test_long_list_streamed(self):
+        """Test that a list past the first page is streamed in full."""
+        items = ({"id": i} for i in range(3))
+
+        response = _json_list_response("projects", items)
+        body = "".join([chunk async for chunk in response.body_iterator])
+
+        assert isinstance(response, StreamingResponse)
+        assert json.loads(body) == {"projects": [{"id": 0}, {"id": 1}, {"id": 2}]}
+
+    @pytest.mark.asyncio
+    @patch("backend.main.STREAM_FIRST_PAGE_ITEMS", 1)
+    async def test_streamed_items_closed_when_response_ends(self):
+        """Test that an unfinished stream releases its source."""
+        closed = []
+
+        def items():
+            try:
+                yield from ({"id": i} for i in range(3))
+            finally:
+                closed.append(True)
+
+        response = _json_list_response("projects", items())
+
+        # As when the client disconnects mid-stream: the body is never
+        # finished, but the background task still runs
+        await response.background()
+
+        assert closed == [True]
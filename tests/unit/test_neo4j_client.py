@@ -2,11 +2,68 @@
 Unit tests for Neo4j client module.
 Tests database operations including merge functions.
 """
-from unittest.mock import patch, MagicMock, PropertyMock
+import json
+import sys
+from unittest.mock import patch, AsyncMock, MagicMock, PropertyMock
 import pytest
-
-from backend.db.neo4j_client import Neo4jClient
-from backend.config import Neo4jConfig
+from neo4j import READ_ACCESS, Result, RoutingControl
+from neo4j.exceptions import ClientError
+from neo4j.time import DateTime
+
+from backend.db.neo4j_client import (
+    BULK_DELETE_BATCH_SIZE,
+    _ALL_NODES_QUERY,
+    _BACKFILL_QUERIES,
+    _CONNECT_PROJECT_NODES_QUERIES,
+    _DRIVERS,
+    _SCHEMA_QUERIES,
+    _STATS_CACHE,
+    _SUMMARY_CACHE,
+    AsyncNeo4jClient,
+    Neo4jClient,
+    _close_shared_drivers,
+    json_dumps,
+    _json_loads,
+    _parsed_summary,
+    _serialize_neo4j_value,
+    _serialize_node,
+    _slugify,
+    _summary_match_keys,
+)
+from backend.config import Neo4jConfig, request_scope
+
+
+@pytest.fixture(autouse=True)
+def _empty_stats_cache():
+    """Keep cached graph stats from leaking between tests."""
+    with patch.dict("backend.db.neo4j_client._STATS_CACHE", clear=True):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _schema_ready():
+    """Treat the default database's schema as ensured, so writers skip it."""
+    config = Neo4jConfig()
+    with patch("backend.db.neo4j_client._SCHEMA_READY_TARGETS", {(config.uri, config.database)}):
+        yield
+
+
+class _FakeNode:
+    """Minimal stand-in for neo4j.graph.Node."""
+
+    def __init__(self, element_id: str, labels: list[str], properties: dict):
+        self.element_id = element_id
+        self.labels = frozenset(labels)
+        self._properties = properties
+
+    def get(self, key, default=None):
+        return self._properties.get(key, default)
+
+    def keys(self):
+        return self._properties.keys()
+
+    def __getitem__(self, key):
+        return self._properties[key]
 
 
 class TestNeo4jClientInit:
@@ -48,7 +105,7 @@ class TestNeo4jClientInit:
 class TestNeo4jClientGraph:
     """Tests for Neo4jClient graph property."""
 
-    @patch("backend.db.neo4j_client.Neo4jGraph")
+    @patch("langchain_neo4j.Neo4jGraph")
     def test_graph_creates_instance(self, mock_neo4j_graph):
         """Test that graph property creates Neo4jGraph instance."""
         mock_graph = MagicMock()
@@ -68,7 +125,7 @@ class TestNeo4jClientGraph:
         )
         assert graph == mock_graph
 
-    @patch("backend.db.neo4j_client.Neo4jGraph")
+    @patch("langchain_neo4j.Neo4jGraph")
     def test_graph_returns_cached_instance(self, mock_neo4j_graph):
         """Test that graph property returns cached instance."""
         mock_graph = MagicMock()
@@ -83,10 +140,32 @@ class TestNeo4jClientGraph:
         assert mock_neo4j_graph.call_count == 1
         assert graph1 == graph2
 
+    @patch("langchain_neo4j.Neo4jGraph")
+    def test_graph_rebuilt_only_when_target_changes(self, mock_neo4j_graph):
+        """Test that a new request scope only rebuilds the graph for a new target."""
+        config = Neo4jConfig()
+        client = Neo4jClient(neo4j_config=config)
+        client.graph
+
+        with request_scope(neo4j_uri=config.uri, neo4j_password=config.password):
+            client.graph
+        assert mock_neo4j_graph.call_count == 1
+
+        with request_scope(neo4j_password="other"):
+            client.graph
+        assert mock_neo4j_graph.call_count == 2
+        assert mock_neo4j_graph.call_args.kwargs["password"] == "other"
+
+        with request_scope(neo4j_uri="bolt://other:7687"):
+            client.graph
+        assert mock_neo4j_graph.call_count == 3
+        assert mock_neo4j_graph.call_args.kwargs["url"] == "bolt://other:7687"
+
 
 class TestNeo4jClientDriver:
     """Tests for Neo4jClient driver property."""
 
+    @patch.dict("backend.db.neo4j_client._DRIVERS", clear=True)
     @patch("backend.db.neo4j_client.GraphDatabase")
     def test_driver_creates_instance(self, mock_graph_db):
         """Test that driver property creates GraphDatabase driver."""
@@ -102,19 +181,86 @@ class TestNeo4jClientDriver:
             "bolt://localhost:7687",
             auth=("neo4j", "password123"),
             notifications_disabled_categories=["UNRECOGNIZED", "DEPRECATION"],
+            max_connection_pool_size=config.max_pool_size,
+            connection_acquisition_timeout=config.acquisition_timeout_seconds,
+            max_connection_lifetime=config.max_connection_lifetime_seconds,
+            connection_timeout=config.connection_timeout_seconds,
         )
         assert driver == mock_driver
 
+    @patch.dict("backend.db.neo4j_client._DRIVERS", clear=True)
+    @patch("backend.db.neo4j_client.GraphDatabase")
+    def test_driver_shared_between_clients(self, mock_graph_db):
+        """Test that clients for the same target share one driver."""
+        mock_graph_db.driver.side_effect = lambda *args, **kwargs: MagicMock()
+
+        first = Neo4jClient(neo4j_config=Neo4jConfig()).driver
+        second = Neo4jClient(neo4j_config=Neo4jConfig()).driver
+        other = Neo4jClient(neo4j_config=Neo4jConfig(database="other")).driver
+
+        assert first is second
+        assert other is not first
+        assert mock_graph_db.driver.call_count == 2
+
+    @patch.dict("backend.db.neo4j_client._DRIVERS", clear=True)
+    @patch("backend.db.neo4j_client.GraphDatabase")
+    def test_driver_not_shared_across_passwords(self, mock_graph_db):
+        """Test that a different password never reuses an authenticated pool."""
+        mock_graph_db.driver.side_effect = lambda *args, **kwargs: MagicMock()
+
+        right = Neo4jClient(neo4j_config=Neo4jConfig(_password="right")).driver
+        wrong = Neo4jClient(neo4j_config=Neo4jConfig(_password="wrong")).driver
+
+        assert wrong is not right
+        assert mock_graph_db.driver.call_args.kwargs["auth"] == ("neo4j", "wrong")
+
+    @patch.dict("backend.db.neo4j_client._DRIVERS", clear=True)
+    @patch("backend.db.neo4j_client._RETIRED_DRIVERS", new_callable=list)
+    @patch("backend.db.neo4j_client.SHARED_DRIVERS_MAX_ENTRIES", 2)
+    @patch("backend.db.neo4j_client.GraphDatabase")
+    def test_least_recently_used_driver_retired_past_limit(self, mock_graph_db, retired):
+        """Test that the shared driver cache is bounded."""
+        mock_graph_db.driver.side_effect = lambda *args, **kwargs: MagicMock()
+
+        first = Neo4jClient(neo4j_config=Neo4jConfig(database="a")).driver
+        second = Neo4jClient(neo4j_config=Neo4jConfig(database="b")).driver
+        Neo4jClient(neo4j_config=Neo4jConfig(database="a")).driver
+        Neo4jClient(neo4j_config=Neo4jConfig(database="c")).driver
+
+        second.close.assert_not_called()
+        assert second not in _DRIVERS.values()
+        assert retired == [second]
+        assert Neo4jClient(neo4j_config=Neo4jConfig(database="a")).driver is first
+
+    @patch.dict("backend.db.neo4j_client._DRIVERS", clear=True)
+    @patch("backend.db.neo4j_client._RETIRED_DRIVERS", new_callable=list)
+    @patch("backend.db.neo4j_client.SHARED_DRIVERS_MAX_ENTRIES", 1)
+    @patch("backend.db.neo4j_client.GraphDatabase")
+    def test_evicted_driver_stays_open_for_existing_clients(self, mock_graph_db, retired):
+        """Test that evicting a driver does not close it under a long-lived client."""
+        mock_graph_db.driver.side_effect = lambda *args, **kwargs: MagicMock()
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig(database="a"))
+        driver = client.driver
+        Neo4jClient(neo4j_config=Neo4jConfig(database="b")).driver
+
+        client.query("RETURN 1")
+
+        driver.close.assert_not_called()
+        driver.execute_query.assert_called_once()
+
+        _close_shared_drivers()
+        driver.close.assert_called_once()
+        assert retired == []
+
 
 class TestNeo4jClientTestConnection:
     """Tests for test_connection method."""
 
-    @patch.object(Neo4jClient, "graph", new_callable=PropertyMock)
-    def test_test_connection_success(self, mock_graph_prop):
+    @patch.object(Neo4jClient, "_read")
+    def test_test_connection_success(self, mock_read):
         """Test successful connection test."""
-        mock_graph = MagicMock()
-        mock_graph.query.return_value = [{"test": 1}]
-        mock_graph_prop.return_value = mock_graph
+        mock_read.return_value = [{"test": 1}]
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
@@ -122,14 +268,12 @@ class TestNeo4jClientTestConnection:
         result = client.test_connection()
 
         assert result is True
-        mock_graph.query.assert_called_once_with("RETURN 1 as test")
+        mock_read.assert_called_once_with("RETURN 1 as test")
 
-    @patch.object(Neo4jClient, "graph", new_callable=PropertyMock)
-    def test_test_connection_failure(self, mock_graph_prop):
+    @patch.object(Neo4jClient, "_read")
+    def test_test_connection_failure(self, mock_read):
         """Test failed connection test."""
-        mock_graph = MagicMock()
-        mock_graph.query.side_effect = Exception("Connection refused")
-        mock_graph_prop.return_value = mock_graph
+        mock_read.side_effect = Exception("Connection refused")
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
@@ -141,77 +285,250 @@ class TestNeo4jClientTestConnection:
 class TestNeo4jClientQuery:
     """Tests for query method."""
 
-    @patch.object(Neo4jClient, "graph", new_callable=PropertyMock)
-    def test_query_with_params(self, mock_graph_prop):
+    @patch.object(Neo4jClient, "driver", new_callable=PropertyMock)
+    def test_query_with_params(self, mock_driver_prop):
         """Test query with parameters."""
-        mock_graph = MagicMock()
-        mock_graph.query.return_value = [{"id": 1, "name": "test"}]
-        mock_graph_prop.return_value = mock_graph
+        execute_query = mock_driver_prop.return_value.execute_query
+        execute_query.return_value = [{"id": 1, "name": "test"}]
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
 
         result = client.query("MATCH (n) WHERE n.id = $id RETURN n", {"id": 1})
 
-        mock_graph.query.assert_called_once_with(
+        execute_query.assert_called_once_with(
             "MATCH (n) WHERE n.id = $id RETURN n",
             {"id": 1},
+            database_=client._config.database,
+            routing_=RoutingControl.WRITE,
+            result_transformer_=Result.data,
         )
         assert result == [{"id": 1, "name": "test"}]
 
-    @patch.object(Neo4jClient, "graph", new_callable=PropertyMock)
-    def test_query_without_params(self, mock_graph_prop):
+    @patch.object(Neo4jClient, "driver", new_callable=PropertyMock)
+    def test_query_without_params(self, mock_driver_prop):
         """Test query without parameters."""
-        mock_graph = MagicMock()
-        mock_graph.query.return_value = [{"count": 5}]
-        mock_graph_prop.return_value = mock_graph
+        execute_query = mock_driver_prop.return_value.execute_query
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
 
         client.query("MATCH (n) RETURN count(n) as count")
 
-        mock_graph.query.assert_called_once_with(
+        assert execute_query.call_args[0] == ("MATCH (n) RETURN count(n) as count", {})
+
+
+class TestNeo4jClientRead:
+    """Tests for the driver-backed _read helper."""
+
+    @patch.object(Neo4jClient, "driver", new_callable=PropertyMock)
+    def test_read_runs_routed_read_query(self, mock_driver_prop):
+        """Test that reads go to the driver as routed read transactions."""
+        execute_query = mock_driver_prop.return_value.execute_query
+        execute_query.return_value = [{"count": 1}]
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+        result = client._read("MATCH (n) RETURN count(n) as count")
+
+        assert result == [{"count": 1}]
+        execute_query.assert_called_once_with(
             "MATCH (n) RETURN count(n) as count",
             {},
+            database_=client._config.database,
+            routing_=RoutingControl.READ,
+            result_transformer_=Result.data,
+        )
+
+
+class TestNeo4jClientSchemaLookup:
+    """Tests for label_exists and relationship_type_exists."""
+
+    @patch.object(Neo4jClient, "_read")
+    def test_label_exists_reuses_fetched_labels(self, mock_read):
+        """Test that known labels are answered without another query."""
+        mock_read.return_value = [{"labels": ["Skill", "Project"]}]
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        assert client.label_exists("Skill")
+        assert client.label_exists("Project")
+        mock_read.assert_called_once()
+
+    @patch.object(Neo4jClient, "_read")
+    def test_label_exists_refreshes_on_miss(self, mock_read):
+        """Test that a missing label is re-checked against the database."""
+        mock_read.side_effect = [
+            [{"labels": ["Skill"]}],
+            [{"labels": ["Skill", "ProjectSubmission"]}],
+        ]
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        assert client.label_exists("ProjectSubmission")
+        assert mock_read.call_count == 2
+
+    @patch.object(Neo4jClient, "_read")
+    def test_relationship_type_exists(self, mock_read):
+        """Test relationship type lookup against the fetched set."""
+        mock_read.return_value = [{"types": ["REQUIRES"]}]
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        assert client.relationship_type_exists("REQUIRES")
+        assert not client.relationship_type_exists("DEPENDS_ON")
+        assert mock_read.call_count == 2
+
+    @patch.object(Neo4jClient, "_read")
+    def test_refresh_schema_refetches_both_sets(self, mock_read):
+        """Test that an explicit refresh re-reads labels and relationship types."""
+        mock_read.side_effect = [[{"labels": ["Skill"]}], [{"labels": ["Skill"]}], [{"types": ["REQUIRES"]}]]
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+        client.label_exists("Skill")
+        client.refresh_schema()
+
+        assert mock_read.call_count == 3
+        assert client.relationship_type_exists("REQUIRES")
+
+    @patch.object(Neo4jClient, "_read", return_value=[])
+    @patch.object(Neo4jClient, "query")
+    def test_submission_reads_skip_label_checks(self, mock_query, mock_read):
+        """Test that submission reads go straight to their query."""
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        assert client.list_project_submissions("proj-1") == []
+        assert client.get_project_submission_count("proj-1") == 0
+        assert client.get_submission("submission-1") == []
+        assert client.list_submission_evaluations("submission-1") == []
+
+        mock_query.assert_not_called()
+        assert mock_read.call_count == 4
+        assert "properties(s)" not in mock_read.call_args_list[0][0][0]
+
+    @patch.object(Neo4jClient, "_read")
+    def test_list_submission_evaluations_decodes_json(self, mock_read):
+        """Test that stored rubric and skill evidence come back as dicts."""
+        mock_read.return_value = [
+            {"id": "e-1", "rubric": '{"clarity": 4}', "skill_evidence": "not json"},
+        ]
+
+        evaluations = Neo4jClient(neo4j_config=Neo4jConfig()).list_submission_evaluations("s-1")
+
+        assert evaluations == [{"id": "e-1", "rubric": {"clarity": 4}, "skill_evidence": {}}]
+
+    @patch.object(Neo4jClient, "query")
+    @patch.object(Neo4jClient, "_write")
+    def test_save_capstone_evaluation_uses_one_transaction(self, mock_write, mock_query):
+        """Test that the evaluation and capstone writes share a commit."""
+        tx, mock_write.side_effect = _run_in_fake_tx([])
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        client.save_capstone_evaluation(
+            "proj-1", "s-1", "e-1", 0.8, {"clarity": 4}, {}, "Good", [], True,
+            "model", "v1", '{"capstone": {}}', "completed", "2024-01-02T03:04:05",
         )
 
+        mock_write.assert_called_once()
+        mock_query.assert_not_called()
+        params = [c[0][1] for c in tx.run.call_args_list]
+        assert json.loads(params[0]["rubric"]) == {"clarity": 4}
+        assert params[1]["summary_json"] == '{"capstone": {}}'
+        assert params[2] == {
+            "project_id": "proj-1",
+            "status": "completed",
+            "score": 0.8,
+            "completed_at": "2024-01-02T03:04:05",
+        }
+
+    @patch.object(Neo4jClient, "_stream")
+    def test_iter_project_submissions_yields_rows_lazily(self, mock_stream):
+        """Test that submissions are yielded one record at a time."""
+        record = MagicMock()
+        record.data.return_value = {"id": "submission-1"}
+        mock_stream.return_value = iter([record])
+
+        rows = Neo4jClient(neo4j_config=Neo4jConfig()).iter_project_submissions("proj-1")
+
+        mock_stream.assert_not_called()
+        assert list(rows) == [{"id": "submission-1"}]
+        assert mock_stream.call_args[0][1] == {"project_id": "proj-1"}
+
+    @patch("backend.db.neo4j_client.time.monotonic")
+    @patch.object(Neo4jClient, "_read")
+    def test_relationship_types_expire_after_ttl(self, mock_read, mock_monotonic):
+        """Test that the cached relationship types are re-fetched once stale."""
+        mock_read.return_value = [{"types": ["HAS_SKILL"]}]
+        mock_monotonic.side_effect = [100.0, 130.0, 161.0]
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+        client._existing_relationship_types()
+        client._existing_relationship_types()
+        assert mock_read.call_count == 1
+
+        client._existing_relationship_types()
+        assert mock_read.call_count == 2
+
+    @patch.object(Neo4jClient, "_read", return_value=[{"types": ["HAS_NODE"]}])
+    @patch.object(Neo4jClient, "query")
+    def test_project_links_invalidate_relationship_types(self, mock_query, mock_read):
+        """Test that linking project nodes drops the cached relationship types."""
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+        client._existing_relationship_types()
+        client.connect_project_to_nodes("proj-1", [{"label": "Skill", "name": "Python"}])
+
+        assert client._relationship_types is None
+
 
 class TestNeo4jClientCleanGraph:
     """Tests for clean_graph method."""
 
-    @patch.object(Neo4jClient, "query")
-    def test_clean_graph(self, mock_query):
+    @patch.object(Neo4jClient, "_run_in_batches")
+    def test_clean_graph(self, mock_run):
         """Test cleaning entire graph."""
-        mock_query.return_value = []
+        mock_run.return_value = []
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
 
         client.clean_graph()
 
-        mock_query.assert_called_once_with("MATCH (n) DETACH DELETE n")
+        query, params = mock_run.call_args[0]
+        assert "IN TRANSACTIONS OF $batch_size ROWS" in query
+        assert params == {"batch_size": BULK_DELETE_BATCH_SIZE}
+
+    @patch.object(Neo4jClient, "driver", new_callable=PropertyMock)
+    def test_run_in_batches_uses_auto_commit_session(self, mock_driver_prop):
+        """Test batched statements run outside a managed transaction."""
+        session = mock_driver_prop.return_value.session.return_value.__enter__.return_value
+        session.run.return_value.data.return_value = [{"deleted": 2}]
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        assert client._run_in_batches("MATCH (n) RETURN n", {"a": 1}) == [{"deleted": 2}]
+        session.run.assert_called_once_with("MATCH (n) RETURN n", {"a": 1})
+        session.execute_write.assert_not_called()
 
 
 class TestNeo4jClientCleanByLabel:
     """Tests for clean_by_label method."""
 
-    @patch.object(Neo4jClient, "query")
-    def test_clean_by_label_with_nodes(self, mock_query):
+    @patch.object(Neo4jClient, "_run_in_batches")
+    def test_clean_by_label_with_nodes(self, mock_run):
         """Test cleaning nodes with specific label."""
-        mock_query.return_value = [{"deleted": 5}]
+        mock_run.return_value = [{"deleted": 5}]
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
 
         deleted = client.clean_by_label("Skill")
 
-        mock_query.assert_called_once_with(
-            "MATCH (n:Skill) DETACH DELETE n RETURN count(n) as deleted"
-        )
+        query, params = mock_run.call_args[0]
+        assert "MATCH (n:$($label))" in query
+        assert params == {"label": "Skill", "batch_size": BULK_DELETE_BATCH_SIZE}
         assert deleted == 5
 
-    @patch.object(Neo4jClient, "query")
+    @patch.object(Neo4jClient, "_run_in_batches")
     def test_clean_by_label_no_nodes(self, mock_query):
         """Test cleaning with no matching nodes."""
         mock_query.return_value = []
@@ -223,7 +540,7 @@ class TestNeo4jClientCleanByLabel:
 
         assert deleted == 0
 
-    @patch.object(Neo4jClient, "query")
+    @patch.object(Neo4jClient, "_run_in_batches")
     def test_clean_by_label_empty_result(self, mock_query):
         """Test cleaning with empty result list."""
         mock_query.return_value = []
@@ -272,8 +589,9 @@ class TestNeo4jClientMergeNodes:
         merged = client.merge_nodes("Skill", match_property="id")
 
         assert merged == 3
-        assert "MATCH (n:Skill)" in mock_query.call_args[0][0]
-        assert "apoc.create.relationship" in mock_query.call_args[0][0]
+        assert "MATCH (n:$($label))" in mock_query.call_args[0][0]
+        assert "apoc.refactor.mergeNodes" in mock_query.call_args[0][0]
+        assert mock_query.call_args[0][1] == {"label": "Skill", "match_property": "id"}
 
     @patch.object(Neo4jClient, "query")
     def test_merge_nodes_no_duplicates(self, mock_query):
@@ -309,25 +627,28 @@ class TestNeo4jClientMergeNodes:
 
         client.merge_nodes("Concept", match_property="name")
 
-        query = mock_query.call_args[0][0]
-        assert "n.name AS prop" in query
+        query, params = mock_query.call_args[0]
+        assert "n[$match_property] AS prop" in query
+        assert params == {"label": "Concept", "match_property": "name"}
+
+
+def _run_in_fake_tx(results):
+    """Build a fake transaction whose run().data() yields ``results`` in order."""
+    tx = MagicMock()
+    tx.run.return_value.data.side_effect = results
+    return tx, lambda work, *args: work(tx, *args)
 
 
 class TestNeo4jClientMergeNodesSimple:
     """Tests for merge_nodes_simple method (non-APOC)."""
 
-    @patch.object(Neo4jClient, "query")
-    def test_merge_nodes_simple_success(self, mock_query):
+    @patch.object(Neo4jClient, "_write")
+    def test_merge_nodes_simple_success(self, mock_write):
         """Test simple node merge."""
-        mock_query.side_effect = [
+        tx, mock_write.side_effect = _run_in_fake_tx([
             [{"keep_id": "keep-1", "dup_ids": ["dup-1", "dup-2"]}],
             [],
-            [],
-            [],
-            [],
-            [],
-            [],
-        ]
+        ])
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
@@ -335,12 +656,42 @@ class TestNeo4jClientMergeNodesSimple:
         deleted = client.merge_nodes_simple("Skill")
 
         assert deleted == 2
-        assert "elementId" in mock_query.call_args_list[0][0][0]
+        mock_write.assert_called_once()
+        assert "elementId" in tx.run.call_args_list[0][0][0]
 
-    @patch.object(Neo4jClient, "query")
-    def test_merge_nodes_simple_no_duplicates(self, mock_query):
+    @patch.object(Neo4jClient, "_write")
+    def test_merge_nodes_simple_batches_rewiring(self, mock_write):
+        """Test relationships of every type are rewired by one statement in one transaction."""
+        tx, mock_write.side_effect = _run_in_fake_tx([
+            [{"keep_id": "keep-1", "dup_ids": ["dup-1", "dup-2"]}],
+            [
+                {"rel_type": "REQUIRES", "props": {}, "source_id": "dup-1", "target_id": "n-1"},
+                {"rel_type": "REQUIRES", "props": {}, "source_id": "n-2", "target_id": "dup-2"},
+                {"rel_type": "RELATED_TO", "props": {"w": 1}, "source_id": "dup-1", "target_id": "dup-2"},
+            ],
+        ])
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        deleted = client.merge_nodes_simple("Skill", match_property="name")
+
+        assert deleted == 2
+        mock_write.assert_called_once()
+        assert tx.run.call_count == 4
+        assert tx.run.call_args_list[0][0][1] == {"label": "Skill", "match_property": "name"}
+        rewire_query, rewire_params = tx.run.call_args_list[2][0]
+        assert "$(rel.rel_type)" in rewire_query
+        assert rewire_params["rels"] == [
+            {"from_id": "keep-1", "to_id": "n-1", "rel_type": "REQUIRES", "props": {}},
+            {"from_id": "n-2", "to_id": "keep-1", "rel_type": "REQUIRES", "props": {}},
+            {"from_id": "keep-1", "to_id": "keep-1", "rel_type": "RELATED_TO", "props": {"w": 1}},
+        ]
+        assert tx.run.call_args_list[3][0][1] == {"dup_ids": ["dup-1", "dup-2"]}
+
+    @patch.object(Neo4jClient, "_write")
+    def test_merge_nodes_simple_no_duplicates(self, mock_write):
         """Test simple merge with no duplicates."""
-        mock_query.return_value = []
+        tx, mock_write.side_effect = _run_in_fake_tx([[]])
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
@@ -348,11 +699,12 @@ class TestNeo4jClientMergeNodesSimple:
         deleted = client.merge_nodes_simple("Skill")
 
         assert deleted == 0
+        tx.run.assert_called_once()
 
-    @patch.object(Neo4jClient, "query")
-    def test_merge_nodes_simple_empty_result(self, mock_query):
+    @patch.object(Neo4jClient, "_write")
+    def test_merge_nodes_simple_empty_result(self, mock_write):
         """Test simple merge with empty result."""
-        mock_query.return_value = []
+        tx, mock_write.side_effect = _run_in_fake_tx([[{"keep_id": "keep-1", "dup_ids": []}]])
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
@@ -361,42 +713,55 @@ class TestNeo4jClientMergeNodesSimple:
 
         assert deleted == 0
 
+    @patch.object(Neo4jClient, "driver", new_callable=PropertyMock)
+    def test_write_uses_one_managed_transaction(self, mock_driver_prop):
+        """Test that _write runs the work function through execute_write."""
+        session = mock_driver_prop.return_value.session.return_value.__enter__.return_value
+        session.execute_write.return_value = 3
+        work = MagicMock()
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        assert client._write(work, "Skill", "id") == 3
+        mock_driver_prop.return_value.session.assert_called_once_with(database=client._config.database)
+        session.execute_write.assert_called_once_with(work, "Skill", "id")
+
 
 class TestNeo4jClientGetNodeCount:
     """Tests for get_node_count method."""
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_node_count_all(self, mock_query):
+    @patch.object(Neo4jClient, "_read")
+    def test_get_node_count_all(self, mock_read):
         """Test getting count of all nodes."""
-        mock_query.return_value = [{"count": 100}]
+        mock_read.return_value = [{"count": 100}]
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
 
         count = client.get_node_count()
 
-        mock_query.assert_called_once_with("MATCH (n) RETURN count(n) as count")
+        mock_read.assert_called_once_with("MATCH (n) RETURN count(n) as count")
         assert count == 100
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_node_count_with_label(self, mock_query):
+    @patch.object(Neo4jClient, "_read")
+    def test_get_node_count_with_label(self, mock_read):
         """Test getting count with label filter."""
-        mock_query.return_value = [{"count": 25}]
+        mock_read.return_value = [{"count": 25}]
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
 
         count = client.get_node_count("Skill")
 
-        mock_query.assert_called_once_with(
-            "MATCH (n:Skill) RETURN count(n) as count"
+        mock_read.assert_called_once_with(
+            "MATCH (n:$($label)) RETURN count(n) as count", {"label": "Skill"}
         )
         assert count == 25
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_node_count_empty_result(self, mock_query):
+    @patch.object(Neo4jClient, "_read")
+    def test_get_node_count_empty_result(self, mock_read):
         """Test getting count with empty result."""
-        mock_query.return_value = []
+        mock_read.return_value = []
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
@@ -409,33 +774,34 @@ class TestNeo4jClientGetNodeCount:
 class TestNeo4jClientGetRelationshipCount:
     """Tests for get_relationship_count method."""
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_relationship_count_all(self, mock_query):
+    @patch.object(Neo4jClient, "_read")
+    def test_get_relationship_count_all(self, mock_read):
         """Test getting count of all relationships."""
-        mock_query.return_value = [{"count": 50}]
+        mock_read.return_value = [{"count": 50}]
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
 
         count = client.get_relationship_count()
 
-        mock_query.assert_called_once_with(
+        mock_read.assert_called_once_with(
             "MATCH ()-[r]->() RETURN count(r) as count"
         )
         assert count == 50
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_relationship_count_with_type(self, mock_query):
+    @patch.object(Neo4jClient, "_read")
+    def test_get_relationship_count_with_type(self, mock_read):
         """Test getting count with relationship type filter."""
-        mock_query.return_value = [{"count": 10}]
+        mock_read.return_value = [{"count": 10}]
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
 
         count = client.get_relationship_count("REQUIRES")
 
-        mock_query.assert_called_once_with(
-            "MATCH ()-[r:REQUIRES]->() RETURN count(r) as count"
+        mock_read.assert_called_once_with(
+            "MATCH ()-[r:$($rel_type)]->() RETURN count(r) as count",
+            {"rel_type": "REQUIRES"},
         )
         assert count == 10
 
@@ -443,23 +809,22 @@ class TestNeo4jClientGetRelationshipCount:
 class TestNeo4jClientGetGraphStats:
     """Tests for get_graph_stats method."""
 
-    @patch.object(Neo4jClient, "query")
-    @patch.object(Neo4jClient, "get_node_count")
-    @patch.object(Neo4jClient, "get_relationship_count")
-    def test_get_graph_stats(self, mock_rel_count, mock_node_count, mock_query):
+    @patch.object(Neo4jClient, "_read")
+    def test_get_graph_stats(self, mock_read):
         """Test getting graph statistics."""
-        mock_query.side_effect = [
-            [{"label": "Skill", "count": 10}, {"label": "Concept", "count": 5}],
-            [{"relationshipType": "REQUIRES", "count": 8}, {"relationshipType": "RELATED_TO", "count": 3}],
-        ]
-        mock_node_count.return_value = 15
-        mock_rel_count.return_value = 11
+        mock_read.return_value = [{
+            "node_counts": [["Skill", 10], ["Concept", 5]],
+            "total_nodes": 15,
+            "rel_counts": [["REQUIRES", 8], ["RELATED_TO", 3]],
+            "total_relationships": 11,
+        }]
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
 
         stats = client.get_graph_stats()
 
+        mock_read.assert_called_once()
         assert stats["total_nodes"] == 15
         assert stats["total_relationships"] == 11
         assert stats["nodes"]["Skill"] == 10
@@ -467,14 +832,33 @@ class TestNeo4jClientGetGraphStats:
         assert stats["relationships"]["REQUIRES"] == 8
         assert stats["relationships"]["RELATED_TO"] == 3
 
-    @patch.object(Neo4jClient, "query")
-    @patch.object(Neo4jClient, "get_node_count")
-    @patch.object(Neo4jClient, "get_relationship_count")
-    def test_get_graph_stats_empty(self, mock_rel_count, mock_node_count, mock_query):
+    @patch.object(Neo4jClient, "_read")
+    def test_get_graph_stats_lists_zero_counts(self, mock_read):
+        """Test that known labels and types without counted entries report 0."""
+        mock_read.return_value = [{
+            "all_labels": ["Skill", "Concept"],
+            "all_rel_types": ["REQUIRES", "HAS_MESSAGE"],
+            "node_counts": [["Skill", 2]],
+            "total_nodes": 2,
+            "rel_counts": [["REQUIRES", 1]],
+            "total_relationships": 4,
+        }]
+
+        stats = Neo4jClient(neo4j_config=Neo4jConfig()).get_graph_stats()
+
+        assert "db.relationshipTypes()" in mock_read.call_args[0][0]
+        assert stats["nodes"] == {"Skill": 2, "Concept": 0}
+        assert stats["relationships"] == {"REQUIRES": 1, "HAS_MESSAGE": 0}
+
+    @patch.object(Neo4jClient, "_read")
+    def test_get_graph_stats_empty(self, mock_read):
         """Test getting stats from empty graph."""
-        mock_query.side_effect = [[], []]
-        mock_node_count.return_value = 0
-        mock_rel_count.return_value = 0
+        mock_read.return_value = [{
+            "node_counts": [],
+            "total_nodes": 0,
+            "rel_counts": [],
+            "total_relationships": 0,
+        }]
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
@@ -486,56 +870,178 @@ class TestNeo4jClientGetGraphStats:
         assert stats["total_nodes"] == 0
         assert stats["total_relationships"] == 0
 
+    @patch.object(Neo4jClient, "_read")
+    def test_get_graph_stats_cached_until_invalidated(self, mock_read):
+        """Test repeated stats reads share one query until a write invalidates them."""
+        mock_read.return_value = [{
+            "node_counts": [["Skill", 1]],
+            "total_nodes": 1,
+            "rel_counts": [],
+            "total_relationships": 0,
+        }]
+
+        first = Neo4jClient(neo4j_config=Neo4jConfig()).get_graph_stats()
+        first["nodes"]["Skill"] = 99
+        second = Neo4jClient(neo4j_config=Neo4jConfig()).get_graph_stats()
+
+        assert mock_read.call_count == 1
+        assert second["nodes"]["Skill"] == 1
+
+        Neo4jClient(neo4j_config=Neo4jConfig()).invalidate_stats()
+        Neo4jClient(neo4j_config=Neo4jConfig()).get_graph_stats()
+
+        assert mock_read.call_count == 2
+
+    @patch.object(Neo4jClient, "_read")
+    def test_stats_cache_keyed_on_credentials(self, mock_read):
+        """Test that cached stats are never served to other credentials."""
+        mock_read.return_value = [{"count": 3}]
+
+        Neo4jClient(neo4j_config=Neo4jConfig()).get_node_count()
+        Neo4jClient(neo4j_config=Neo4jConfig(_password="wrong")).get_node_count()
+        Neo4jClient(neo4j_config=Neo4jConfig(_username="other")).get_node_count()
+
+        assert mock_read.call_count == 3
+
+        Neo4jClient(neo4j_config=Neo4jConfig()).invalidate_stats()
+        assert not _STATS_CACHE
+
+    @patch.object(Neo4jClient, "_read")
+    def test_get_knowledge_graph_stats(self, mock_read):
+        """Test knowledge graph stats come back from one query."""
+        mock_read.return_value = [{
+            "node_counts": [["Skill", 4], ["Project", 1]],
+            "total_nodes": 5,
+            "rel_counts": [["REQUIRES", 2]],
+            "total_relationships": 2,
+        }]
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+        stats = client.get_knowledge_graph_stats()
+
+        mock_read.assert_called_once()
+        assert stats == {
+            "nodes": {"Skill": 4, "Project": 1},
+            "relationships": {"REQUIRES": 2},
+            "total_nodes": 5,
+            "total_relationships": 2,
+        }
+
+    @patch.object(Neo4jClient, "_read")
+    def test_knowledge_graph_counts_share_stats_query(self, mock_read):
+        """Test the node and relationship counts come from one cached stats read."""
+        mock_read.return_value = [{
+            "node_counts": [["Skill", 4]],
+            "total_nodes": 4,
+            "rel_counts": [["REQUIRES", 3]],
+            "total_relationships": 3,
+        }]
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        assert client.get_knowledge_graph_node_count() == 4
+        assert client.get_knowledge_graph_relationship_count() == 3
+        mock_read.assert_called_once()
+
 
 class TestNeo4jClientGetAllNodes:
     """Tests for get_all_nodes method."""
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_all_nodes_no_filter(self, mock_query):
+    @patch.object(Neo4jClient, "_stream")
+    def test_get_all_nodes_no_filter(self, mock_stream):
         """Test getting all nodes without label filter."""
-        mock_query.return_value = [{"n": {"id": "1"}}, {"n": {"id": "2"}}]
+        mock_stream.return_value = [{"n": {"id": "1"}}, {"n": {"id": "2"}}]
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
 
         nodes = client.get_all_nodes()
 
-        mock_query.assert_called_once_with("MATCH (n) RETURN n LIMIT 100")
+        mock_stream.assert_called_once_with(_ALL_NODES_QUERY, {"limit": 100})
+        assert "properties: properties(n)" in _ALL_NODES_QUERY
         assert len(nodes) == 2
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_all_nodes_with_label(self, mock_query):
+    @patch.object(Neo4jClient, "_stream")
+    def test_get_all_nodes_with_label(self, mock_stream):
         """Test getting nodes with label filter."""
-        mock_query.return_value = [{"n": {"id": "1"}}]
+        mock_stream.return_value = [{"n": {"id": "1"}}]
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
 
         nodes = client.get_all_nodes("Skill")
 
-        mock_query.assert_called_once_with("MATCH (n:Skill) RETURN n LIMIT 100")
+        query, params = mock_stream.call_args[0]
+        assert query.startswith("MATCH (n:$($label))")
+        assert "properties: properties(n)" in query
+        assert params == {"label": "Skill", "limit": 100}
         assert len(nodes) == 1
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_all_nodes_with_limit(self, mock_query):
+    @patch.object(Neo4jClient, "_stream")
+    def test_get_all_nodes_with_limit(self, mock_stream):
         """Test getting nodes with custom limit."""
-        mock_query.return_value = []
+        mock_stream.return_value = []
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
 
         client.get_all_nodes(limit=50)
 
-        mock_query.assert_called_once_with("MATCH (n) RETURN n LIMIT 50")
+        query, params = mock_stream.call_args[0]
+        assert "LIMIT $limit RETURN {id: coalesce(n.id, elementId(n))" in query
+        assert params == {"limit": 50}
+
+    @patch.object(Neo4jClient, "_stream")
+    def test_iter_all_nodes_is_lazy(self, mock_stream):
+        """Test that nodes are serialized one record at a time."""
+        mock_stream.return_value = iter([{"n": {"id": "1"}}, {"n": {"id": "2"}}])
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+        nodes = client.iter_all_nodes()
+
+        assert next(nodes)["id"] == "1"
+        assert next(nodes)["id"] == "2"
+
+    @patch.object(Neo4jClient, "driver", new_callable=PropertyMock)
+    def test_stream_uses_read_session(self, mock_driver_prop):
+        """Test that _stream runs in a read session and yields records."""
+        session = mock_driver_prop.return_value.session.return_value.__enter__.return_value
+        session.run.return_value = iter([{"n": 1}])
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        assert list(client._stream("MATCH (n) RETURN n")) == [{"n": 1}]
+        mock_driver_prop.return_value.session.assert_called_once_with(
+            database=client._config.database,
+            default_access_mode=READ_ACCESS,
+            fetch_size=1000,
+        )
+        session.run.assert_called_once_with("MATCH (n) RETURN n", {})
+
+    @patch.object(Neo4jClient, "driver", new_callable=PropertyMock)
+    def test_stream_passes_fetch_size(self, mock_driver_prop):
+        """Test that a caller-supplied fetch_size reaches the session."""
+        session = mock_driver_prop.return_value.session.return_value.__enter__.return_value
+        session.run.return_value = iter([])
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        assert list(client._stream("MATCH (n) RETURN n", {"limit": 5}, fetch_size=50)) == []
+        mock_driver_prop.return_value.session.assert_called_once_with(
+            database=client._config.database,
+            default_access_mode=READ_ACCESS,
+            fetch_size=50,
+        )
+        session.run.assert_called_once_with("MATCH (n) RETURN n", {"limit": 5})
 
 
 class TestNeo4jClientGetAllRelationships:
     """Tests for get_all_relationships method."""
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_all_relationships(self, mock_query):
+    @patch.object(Neo4jClient, "_stream")
+    def test_get_all_relationships(self, mock_stream):
         """Test getting all relationships."""
-        mock_query.return_value = [
+        mock_stream.return_value = [
             {"source": "1", "type": "REQUIRES", "target": "2", "properties": {}},
         ]
 
@@ -549,18 +1055,31 @@ class TestNeo4jClientGetAllRelationships:
         assert rels[0]["type"] == "REQUIRES"
         assert rels[0]["target"] == "2"
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_all_relationships_with_limit(self, mock_query):
+    @patch.object(Neo4jClient, "_stream")
+    def test_get_all_relationships_with_limit(self, mock_stream):
         """Test getting relationships with limit."""
-        mock_query.return_value = []
+        mock_stream.return_value = []
 
         config = Neo4jConfig()
         client = Neo4jClient(neo4j_config=config)
 
         client.get_all_relationships(limit=50)
 
-        mock_query.assert_called_once()
-        assert "LIMIT 50" in mock_query.call_args[0][0]
+        mock_stream.assert_called_once()
+        assert mock_stream.call_args[0][1] == {"limit": 50}
+
+    @patch.object(Neo4jClient, "_stream")
+    def test_get_all_relationships_properties_opt_in(self, mock_stream):
+        """Test that relationship properties are only fetched on request."""
+        mock_stream.return_value = []
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        client.get_all_relationships()
+        assert "properties(r)" not in mock_stream.call_args[0][0]
+
+        client.get_all_relationships(with_properties=True)
+        assert "properties(r) as properties" in mock_stream.call_args[0][0]
 
 
 class TestNeo4jClientClose:
@@ -568,7 +1087,7 @@ class TestNeo4jClientClose:
 
     @patch.object(Neo4jClient, "graph", new_callable=PropertyMock)
     def test_close_with_driver(self, mock_graph_prop):
-        """Test closing client with active driver."""
+        """Test closing client releases, but does not close, the shared driver."""
         mock_driver = MagicMock()
         mock_graph = MagicMock()
         mock_graph_prop.return_value = mock_graph
@@ -579,7 +1098,7 @@ class TestNeo4jClientClose:
 
         client.close()
 
-        mock_driver.close.assert_called_once()
+        mock_driver.close.assert_not_called()
         assert client._driver is None
         assert client._graph is None
 
@@ -594,6 +1113,26 @@ class TestNeo4jClientClose:
         assert client._graph is None
 
 
+class TestNeo4jClientVisualizeGraph:
+    """Tests for visualize_graph method."""
+
+    @patch.object(Neo4jClient, "driver", new_callable=PropertyMock)
+    def test_visualize_graph_keeps_driver_open(self, mock_driver_prop):
+        """Test that visualizing reuses the driver without closing it."""
+        mock_driver = mock_driver_prop.return_value
+        viz_module = MagicMock()
+
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+        with patch.dict(sys.modules, {"neo4j_viz": MagicMock(), "neo4j_viz.neo4j": viz_module}):
+            result = client.visualize_graph()
+
+        assert result == viz_module.from_neo4j.return_value
+        viz_module.from_neo4j.assert_called_once_with(mock_driver.execute_query.return_value)
+        assert mock_driver.execute_query.call_args.kwargs["result_transformer_"] == Result.graph
+        mock_driver.__exit__.assert_not_called()
+        mock_driver.close.assert_not_called()
+
+
 class TestNeo4jClientContextManager:
     """Tests for context manager protocol."""
 
@@ -667,6 +1206,88 @@ class TestNeo4jClientLessonAssessment:
         assert "DETACH DELETE a" in query
         assert params == {"project_id": "proj-1", "assessment_id": "assessment-1"}
 
+    @patch.object(Neo4jClient, "query")
+    def test_save_project_assessment_writes_one_row(self, mock_query):
+        client = Neo4jClient()
+
+        client.save_project_assessment("proj-1", "assessment-1", "lesson-1", "Explain closures")
+
+        mock_query.assert_called_once()
+        query, params = mock_query.call_args[0]
+        assert "UNWIND $rows" in query
+        assert params == {"rows": [{
+            "project_id": "proj-1",
+            "assessment_id": "assessment-1",
+            "lesson_id": "lesson-1",
+            "prompt": "Explain closures",
+        }]}
+
+    @patch("backend.db.neo4j_client.BULK_WRITE_BATCH_SIZE", 2)
+    @patch.object(Neo4jClient, "query")
+    def test_create_project_submissions_bulk_batches_rows(self, mock_query):
+        client = Neo4jClient()
+        rows = [
+            {"project_id": "proj-1", "submission_id": f"s-{i}", "content": "x", "attempt_number": i}
+            for i in range(5)
+        ]
+
+        client.create_project_submissions_bulk(rows)
+
+        assert [len(call[0][1]["rows"]) for call in mock_query.call_args_list] == [2, 2, 1]
+
+
+class TestNeo4jClientDeleteNode:
+    """Tests for node and relationship deletion."""
+
+    @patch.object(Neo4jClient, "query")
+    def test_delete_node_counts_and_deletes_in_one_query(self, mock_query):
+        mock_query.return_value = [{"rel_count": 3}]
+        client = Neo4jClient()
+
+        result = client.delete_node("skill-python")
+
+        mock_query.assert_called_once()
+        assert "DETACH DELETE n" in mock_query.call_args[0][0]
+        assert result == {"deleted_node_id": "skill-python", "relationships_deleted": 3}
+        assert "n.id = $node_id" in mock_query.call_args[0][0]
+        assert "elementId(n)" not in mock_query.call_args[0][0]
+
+    @patch.object(Neo4jClient, "query", return_value=[{"rel_count": 0}])
+    def test_delete_node_matches_element_ids_by_element_id_only(self, mock_query):
+        client = Neo4jClient()
+
+        client.delete_node("4:c0a8f1e2-1234-4abc-9def-0123456789ab:17")
+
+        assert "elementId(n) = $node_id" in mock_query.call_args[0][0]
+        assert "n.id" not in mock_query.call_args[0][0]
+
+    @patch.object(Neo4jClient, "query")
+    def test_delete_relationship_passes_type_as_parameter(self, mock_query):
+        mock_query.return_value = [{"deleted_count": 1}]
+        client = Neo4jClient()
+
+        result = client.delete_relationship("a", "b", "REQUIRES")
+
+        query, params = mock_query.call_args[0]
+        assert "[r:$($rel_type)]" in query
+        assert params["rel_type"] == "REQUIRES"
+        assert result["deleted"] is True
+
+    @patch.object(Neo4jClient, "query", return_value=[{"deleted_count": 1}])
+    def test_delete_relationship_matches_element_id_endpoints(self, mock_query):
+        Neo4jClient().delete_relationship("skill-1", "4:c0a8f1e2-1234-4abc-9def-0123456789ab:17", "REQUIRES")
+
+        query = mock_query.call_args[0][0]
+        assert "n.id = $source_id" in query
+        assert "elementId(m) = $target_id" in query
+
+    @patch.object(Neo4jClient, "query", return_value=[{"deleted_count": 0}])
+    def test_delete_relationship_reports_missing(self, mock_query):
+        assert Neo4jClient().delete_relationship("a", "b", "REQUIRES") == {
+            "deleted": False,
+            "error": "Relationship not found",
+        }
+
 
 class TestNeo4jClientProjectGraph:
     """Tests for project graph helpers."""
@@ -686,36 +1307,317 @@ class TestNeo4jClientProjectGraph:
         client.connect_project_to_nodes("proj-1", nodes)
 
         assert mock_query.call_count == 3
+        queries = {call[0][0] for call in mock_query.call_args_list}
+        assert queries == {
+            _CONNECT_PROJECT_NODES_QUERIES[label] for label in ("Skill", "Concept", "Topic")
+        }
+
+    @patch.object(Neo4jClient, "_read")
+    def test_list_project_nodes_reads_projection(self, mock_read):
+        mock_read.return_value = [
+            {"id": "skill-python", "name": "Python", "labels": ["Skill"], "updated_at": None}
+        ]
 
+        nodes = Neo4jClient().list_project_nodes("proj-1")
+
+        mock_read.assert_called_once()
+        query, params = mock_read.call_args[0]
+        assert "RETURN n\n" not in query
+        assert "n.name AS name" in query
+        assert "HAS_SKILL" in params["rel_types"]
+        assert nodes == [
+            {
+                "id": "skill-python",
+                "labels": ["Skill"],
+                "properties": {"name": "Python", "updated_at": None},
+            }
+        ]
+
+    @patch.object(Neo4jClient, "merge_nodes_simple")
     @patch.object(Neo4jClient, "query")
-    def test_get_projects_for_node(self, mock_query):
+    def test_upsert_project_nodes_from_summary_uses_one_query(self, mock_query, mock_merge):
+        client = Neo4jClient()
+        mock_query.return_value = [{"requires": 1}]
+        summary = {
+            "skills": ["Python", " Python ", ""],
+            "concepts": ["Closures"],
+            "agreed_project": {"milestones": ["Learn Python basics"]},
+        }
+
+        result = client.upsert_project_nodes_from_summary("proj-1", summary)
+
+        mock_query.assert_called_once()
+        params = mock_query.call_args[0][1]
+        assert params["by_label"]["Skill"] == [{"name": "Python", "id": "skill-python"}]
+        assert params["by_label"]["Topic"] == []
+        assert set(params) == {"project_id", "by_label"}
+        assert "HAS_NODE" not in mock_query.call_args[0][0]
+        assert result == {"nodes": 3, "relationships": 5}
+
+    @patch.object(Neo4jClient, "merge_nodes_simple")
+    @patch.object(Neo4jClient, "query")
+    def test_upsert_project_nodes_from_empty_summary_skips_query(self, mock_query, mock_merge):
+        client = Neo4jClient()
+
+        result = client.upsert_project_nodes_from_summary("proj-1", {})
+
+        mock_query.assert_not_called()
+        assert result == {"nodes": 0, "relationships": 0}
+
+    @patch.object(Neo4jClient, "_read")
+    def test_get_projects_for_node(self, mock_read):
         client = Neo4jClient()
-        mock_query.return_value = [{"id": "proj-1", "is_default": False}]
+        mock_read.return_value = [{"id": "proj-1", "is_default": False}]
 
         result = client.get_projects_for_node("node-1", "Node Name")
 
         assert result == [{"id": "proj-1", "is_default": False}]
-        mock_query.assert_called_once()
+        mock_read.assert_called_once()
+
+    @patch.object(Neo4jClient, "_read", return_value=[])
+    def test_get_prerequisite_nodes_expands_typed_relationships(self, mock_read):
+        client = Neo4jClient()
+
+        client.get_prerequisite_nodes("skill-python")
+
+        query, params = mock_read.call_args[0]
+        assert "[:PREREQUISITE_FOR|REQUIRES|DEPENDS_ON]" in query
+        assert params == {"node_id": "skill-python"}
+
+
+class TestNeo4jClientFindExistingProject:
+    """Tests for duplicate project detection."""
+
+    def test_summary_match_keys_normalizes_title_and_description(self):
+        """Test that lookup keys are lowercased, stripped and truncated."""
+        summary_json = json.dumps({
+            "session_id": "session-1",
+            "agreed_project": {"name": "  Build A CLI ", "description": "X" * 250},
+        })
+
+        assert _summary_match_keys(summary_json) == {
+            "session_id": "session-1",
+            "norm_title": "build a cli",
+            "norm_desc_200": "x" * 200,
+        }
+
+    def test_summary_match_keys_leaves_empty_values_unset(self):
+        """Test that empty or unparseable summaries produce no keys."""
+        empty = {"session_id": None, "norm_title": None, "norm_desc_200": None}
+
+        assert _summary_match_keys("not json") == empty
+        assert _summary_match_keys(json.dumps({"agreed_project": {"name": " "}})) == empty
+
+    @patch.object(Neo4jClient, "query")
+    def test_upsert_project_summary_stores_match_keys(self, mock_query):
+        """Test that upserting a summary writes the lookup keys."""
+        client = Neo4jClient()
+        summary_json = json.dumps({"session_id": "s-1", "agreed_project": {"name": "Demo"}})
+
+        client.upsert_project_summary("proj-1", "Demo", summary_json)
+
+        params = mock_query.call_args[0][1]
+        assert params["session_id"] == "s-1"
+        assert params["norm_title"] == "demo"
+        assert params["norm_desc_200"] is None
+
+    @patch.object(Neo4jClient, "_read")
+    @patch.object(Neo4jClient, "ensure_schema")
+    def test_find_existing_project_queries_normalized_keys(self, mock_ensure, mock_read):
+        """Test that matching is pushed into a single indexed query."""
+        mock_read.return_value = [{"id": "proj-1", "name": "Demo"}]
+        client = Neo4jClient()
+
+        result = client.find_existing_project_by_content("s-1", " Demo ", "")
+
+        assert result == {"id": "proj-1", "name": "Demo"}
+        mock_ensure.assert_called_once()
+        params = mock_read.call_args[0][1]
+        assert params == {"session_id": "s-1", "norm_title": "demo", "norm_desc_200": None}
+
+    @patch.object(Neo4jClient, "_read", return_value=[])
+    @patch.object(Neo4jClient, "ensure_schema")
+    def test_find_existing_project_returns_none_without_match(self, mock_ensure, mock_read):
+        """Test that no match returns None."""
+        client = Neo4jClient()
+
+        assert client.find_existing_project_by_content("s-1", "Demo", "Desc") is None
+
+    @patch("backend.db.neo4j_client._SCHEMA_READY_TARGETS", set())
+    @patch.object(Neo4jClient, "_read")
+    @patch.object(Neo4jClient, "query")
+    def test_ensure_schema_backfills_once_per_target(self, mock_query, mock_read):
+        """Test that schema is created and old nodes backfilled only once."""
+        mock_read.return_value = [
+            {"id": "proj-1", "summary_json": json.dumps({"session_id": "s-1"})},
+        ]
+
+        Neo4jClient().ensure_schema()
+        Neo4jClient().ensure_schema()
+
+        mock_read.assert_called_once()
+        assert mock_query.call_count == len(_SCHEMA_QUERIES) + 1 + len(_BACKFILL_QUERIES)
+        assert [c[0][0] for c in mock_query.call_args_list[-len(_BACKFILL_QUERIES):]] == list(_BACKFILL_QUERIES)
+        rows = mock_query.call_args_list[len(_SCHEMA_QUERIES)][0][1]["rows"]
+        assert rows == [
+            {"id": "proj-1", "session_id": "s-1", "norm_title": None, "norm_desc_200": None},
+        ]
+
+    @patch("backend.db.neo4j_client._SCHEMA_READY_TARGETS", set())
+    @patch.object(Neo4jClient, "_read", return_value=[])
+    @patch.object(Neo4jClient, "query")
+    def test_ensure_schema_skips_failing_constraints(self, mock_query, mock_read):
+        """Test that a constraint blocked by existing data does not abort the rest."""
+        mock_query.side_effect = [ClientError("duplicate ids")] + [[]] * (
+            len(_SCHEMA_QUERIES) + len(_BACKFILL_QUERIES)
+        )
+
+        Neo4jClient().ensure_schema()
+
+        assert mock_query.call_count == len(_SCHEMA_QUERIES) + len(_BACKFILL_QUERIES)
+        assert any("project_summary_session_title" in call[0][0] for call in mock_query.call_args_list)
+
+        # The refused constraint is retried on the next call
+        mock_query.side_effect = None
+        Neo4jClient().ensure_schema()
+        assert mock_query.call_count == 2 * (len(_SCHEMA_QUERIES) + len(_BACKFILL_QUERIES))
+
+    @patch("backend.db.neo4j_client._SCHEMA_READY_TARGETS", set())
+    @patch.object(Neo4jClient, "_read", return_value=[])
+    @patch.object(Neo4jClient, "query")
+    def test_ensure_schema_once_per_database(self, mock_query, mock_read):
+        """Test that every database gets its own schema and backfills."""
+        Neo4jClient(neo4j_config=Neo4jConfig()).ensure_schema()
+        calls = mock_query.call_count
+        Neo4jClient(neo4j_config=Neo4jConfig(database="other")).ensure_schema()
+
+        assert mock_query.call_count == 2 * calls
+
+    @patch("backend.db.neo4j_client._SCHEMA_READY_TARGETS", set())
+    @patch.object(Neo4jClient, "_read", return_value=[])
+    @patch.object(Neo4jClient, "query")
+    def test_writers_backfill_summary_links_first(self, mock_query, mock_read):
+        """Test that writers traversing SUMMARY_FOR run the backfill first."""
+        Neo4jClient().update_project_capstone_state("proj-1", "passed", 0.9, None)
+
+        queries = [c[0][0] for c in mock_query.call_args_list]
+        assert any("WHERE NOT (ps)-[:SUMMARY_FOR]->(:Project)" in q for q in queries[:-1])
+        assert "capstone_status" in queries[-1]
+
+
+class TestNeo4jClientListProjectSummaries:
+    """Tests for listing project summaries."""
+
+    @patch.dict("backend.db.neo4j_client._SUMMARY_CACHE", clear=True)
+    @patch.object(Neo4jClient, "_read")
+    def test_rows_carry_parsed_summary(self, mock_read):
+        """Test that each row includes its parsed summary."""
+        mock_read.side_effect = [
+            [{"id": "proj-1", "updated_at": "t1"}, {"id": "proj-2", "updated_at": "t1"}],
+            [
+                {"id": "proj-1", "summary_json": '{"capstone": {"passed": true}}'},
+                {"id": "proj-2", "summary_json": None},
+            ],
+        ]
+        client = Neo4jClient()
+
+        rows = client.list_project_summaries(limit=5, include_summary=True)
+
+        (list_query, list_params), (summary_query, summary_params) = [
+            c[0] for c in mock_read.call_args_list
+        ]
+        assert "summary_json" not in list_query
+        assert list_params == {"limit": 5}
+        assert "summary_json" in summary_query
+        assert summary_params == {"project_ids": ["proj-1", "proj-2"]}
+        assert rows[0]["summary"] == {"capstone": {"passed": True}}
+        assert rows[1]["summary"] == {}
+
+    @patch.dict("backend.db.neo4j_client._SUMMARY_CACHE", clear=True)
+    @patch.object(Neo4jClient, "_read")
+    def test_cached_revisions_skip_the_summary_fetch(self, mock_read):
+        """Test that summary_json is only fetched for revisions not parsed yet."""
+        cached = _parsed_summary("proj-1", "t1", '{"name": "Demo"}')
+        mock_read.side_effect = [
+            [{"id": "proj-1", "updated_at": "t1"}, {"id": "proj-2", "updated_at": "t2"}],
+            [{"id": "proj-2", "summary_json": '{"name": "Other"}'}],
+        ]
+
+        rows = Neo4jClient().list_project_summaries(limit=5, include_summary=True)
+
+        assert mock_read.call_args[0][1] == {"project_ids": ["proj-2"]}
+        assert rows[0]["summary"] is cached
+        assert rows[1]["summary"] == {"name": "Other"}
+
+        mock_read.side_effect = [[{"id": "proj-1", "updated_at": "t1"}]]
+        Neo4jClient().list_project_summaries(limit=5, include_summary=True)
+        assert mock_read.call_count == 3
+
+    @patch.object(Neo4jClient, "_read")
+    def test_summary_payload_is_omitted_by_default(self, mock_read):
+        """Test that only metadata is fetched unless the summary is requested."""
+        mock_read.return_value = [{"id": "proj-1", "name": "Demo", "created_at": None, "updated_at": None}]
+
+        rows = Neo4jClient().list_project_summaries(limit=5)
+
+        mock_read.assert_called_once()
+        assert "summary_json" not in mock_read.call_args[0][0]
+        assert "summary" not in rows[0]
+
+    @patch.object(Neo4jClient, "_read")
+    def test_get_project_summary_meta(self, mock_read):
+        """Test the lean single-project lookup."""
+        mock_read.return_value = [{"id": "proj-1", "name": "Demo"}]
+        client = Neo4jClient()
+
+        assert client.get_project_summary_meta("proj-1") == {"id": "proj-1", "name": "Demo"}
+        assert "summary_json" not in mock_read.call_args[0][0]
+
+        mock_read.return_value = []
+        assert client.get_project_summary_meta("missing") is None
+
+    @patch.dict("backend.db.neo4j_client._SUMMARY_CACHE", clear=True)
+    def test_parsed_summary_is_cached_per_revision(self):
+        """Test that the same revision is parsed once and a new one reparsed."""
+        raw = '{"name": "Demo"}'
+
+        first = _parsed_summary("proj-1", "t1", raw)
+        assert _parsed_summary("proj-1", "t1", raw) is first
+        assert _parsed_summary("proj-1", "t2", raw) is not first
+        assert _parsed_summary("proj-1", "t3", "[1, 2]") == {}
+        assert list(_SUMMARY_CACHE) == [("proj-1", "t1"), ("proj-1", "t2"), ("proj-1", "t3")]
+
+    @patch.dict("backend.db.neo4j_client._SUMMARY_CACHE", clear=True)
+    def test_parsed_summary_is_read_only(self):
+        """Test that callers cannot change the shared cached summary."""
+        summary = _parsed_summary(
+            "proj-1", "t1", '{"capstone": {"passed": false}, "user_profile": {"interests": ["ml"]}}'
+        )
+
+        with pytest.raises(TypeError):
+            summary["capstone"]["passed"] = True
+        assert summary["user_profile"]["interests"] == ("ml",)
+        assert _parsed_summary("proj-1", "t1", "{}")["capstone"] == {"passed": False}
 
 
 class TestNeo4jClientProjectFilter:
     """Tests for project filter methods."""
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_most_recent_project_id_returns_id(self, mock_query):
+    @patch.object(Neo4jClient, "_read")
+    def test_get_most_recent_project_id_returns_id(self, mock_read):
         """Test getting most recent project ID when projects exist."""
-        mock_query.return_value = [{"id": "proj-123", "created_at": "2024-01-27"}]
+        mock_read.return_value = [{"id": "proj-123", "created_at": "2024-01-27"}]
 
         client = Neo4jClient()
         result = client.get_most_recent_project_id()
 
         assert result == "proj-123"
-        mock_query.assert_called_once()
+        mock_read.assert_called_once()
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_most_recent_project_id_returns_none(self, mock_query):
+    @patch.object(Neo4jClient, "_read")
+    def test_get_most_recent_project_id_returns_none(self, mock_read):
         """Test getting most recent project ID when no projects exist."""
-        mock_query.return_value = []
+        mock_read.return_value = []
 
         client = Neo4jClient()
         result = client.get_most_recent_project_id()
@@ -734,20 +1636,28 @@ class TestNeo4jClientProjectFilter:
         mock_kg_nodes.assert_called_once_with(limit=500)
         assert result == [{"id": "node-1", "labels": ["Skill"]}]
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_knowledge_graph_nodes_for_project_with_id(self, mock_query):
+    @patch.object(Neo4jClient, "driver", new_callable=PropertyMock)
+    def test_get_knowledge_graph_nodes_for_project_with_id(self, mock_driver_prop):
         """Test filtering nodes by specific project."""
-        # Mock project query
-        mock_query.side_effect = [
-            [{"labels": ["Project"], "properties": {"id": "proj-1", "name": "Test"}, "element_id": "4:abc:1", "id": "proj-1"}],
-            [{"labels": ["Skill"], "properties": {"id": "skill-1", "name": "Python"}, "element_id": "4:abc:2", "id": "skill-1"}],
+        # Project and connected nodes come back from a single query as
+        # id/labels/properties maps rather than Nodes
+        records = [
+            {"n": {"id": "proj-1", "labels": ["Project"], "properties": {"id": "proj-1", "name": "Test"}}},
+            {"n": {"id": "skill-1", "labels": ["Skill"], "properties": {"id": "skill-1", "name": "Python"}}},
         ]
+        execute_query = mock_driver_prop.return_value.execute_query
+        execute_query.side_effect = lambda cypher, params, **kwargs: kwargs["result_transformer_"](records)
 
         client = Neo4jClient()
         result = client.get_knowledge_graph_nodes_for_project("proj-1")
 
-        assert len(result) == 2
-        assert mock_query.call_count == 2
+        assert result == [
+            {"id": "proj-1", "labels": ["Project"], "properties": {"id": "proj-1", "name": "Test"}},
+            {"id": "skill-1", "labels": ["Skill"], "properties": {"id": "skill-1", "name": "Python"}},
+        ]
+        execute_query.assert_called_once()
+        assert "WITH DISTINCT x" in execute_query.call_args[0][0]
+        assert "properties: properties(x)" in execute_query.call_args[0][0]
 
     @patch.object(Neo4jClient, "query")
     @patch.object(Neo4jClient, "get_knowledge_graph_relationships")
@@ -758,13 +1668,13 @@ class TestNeo4jClientProjectFilter:
         client = Neo4jClient()
         result = client.get_knowledge_graph_relationships_for_project(None)
 
-        mock_kg_rels.assert_called_once_with(limit=500)
+        mock_kg_rels.assert_called_once_with(limit=500, with_properties=False)
         assert result == [{"source": "n1", "target": "n2", "type": "RELATED"}]
 
-    @patch.object(Neo4jClient, "query")
-    def test_get_knowledge_graph_relationships_for_project_with_id(self, mock_query):
+    @patch.object(Neo4jClient, "_read")
+    def test_get_knowledge_graph_relationships_for_project_with_id(self, mock_read):
         """Test filtering relationships by specific project."""
-        mock_query.return_value = [
+        mock_read.return_value = [
             {"source": "node-1", "target": "node-2", "type": "REQUIRES", "properties": {}}
         ]
 
@@ -773,12 +1683,45 @@ class TestNeo4jClientProjectFilter:
 
         assert len(result) == 1
         assert result[0]["type"] == "REQUIRES"
-        mock_query.assert_called_once()
+        mock_read.assert_called_once()
 
-    @patch.object(Neo4jClient, "query")
-    def test_list_all_projects_excludes_default(self, mock_query):
+    @patch.object(Neo4jClient, "get_knowledge_graph_relationships")
+    @patch.object(Neo4jClient, "get_knowledge_graph_nodes")
+    def test_get_knowledge_graph_for_project_none(self, mock_kg_nodes, mock_kg_rels):
+        """Test the fused fetch falls back to the whole graph without a project."""
+        mock_kg_nodes.return_value = [{"id": "node-1"}]
+        mock_kg_rels.return_value = [{"source": "node-1", "target": "node-2"}]
+
+        client = Neo4jClient()
+        result = client.get_knowledge_graph_for_project(None)
+
+        assert result == {"nodes": [{"id": "node-1"}], "relationships": [{"source": "node-1", "target": "node-2"}]}
+
+    @patch.object(Neo4jClient, "driver", new_callable=PropertyMock)
+    def test_get_knowledge_graph_for_project_single_query(self, mock_driver_prop):
+        """Test nodes and relationships for a project come from one query."""
+        relationships = [{"source": "proj-1", "type": "HAS_SKILL", "target": "skill-1", "properties": {}}]
+        result = MagicMock()
+        result.single.return_value = {
+            "nodes": [_FakeNode("4:abc:2", ["Skill"], {"id": "skill-1", "name": "Python"})],
+            "relationships": relationships,
+        }
+        execute_query = mock_driver_prop.return_value.execute_query
+        execute_query.side_effect = lambda cypher, params, **kwargs: kwargs["result_transformer_"](result)
+
+        client = Neo4jClient()
+        graph = client.get_knowledge_graph_for_project("proj-1")
+
+        execute_query.assert_called_once()
+        assert graph == {
+            "nodes": [{"id": "skill-1", "labels": ["Skill"], "properties": {"id": "skill-1", "name": "Python"}}],
+            "relationships": relationships,
+        }
+
+    @patch.object(Neo4jClient, "_read")
+    def test_list_all_projects_excludes_default(self, mock_read):
         """Test listing all projects without default."""
-        mock_query.return_value = [
+        mock_read.return_value = [
             {"id": "proj-1", "name": "Project 1", "created_at": "2024-01-27", "is_default": False},
         ]
 
@@ -787,13 +1730,13 @@ class TestNeo4jClientProjectFilter:
 
         assert len(result) == 1
         assert result[0]["id"] == "proj-1"
-        mock_query.assert_called_once()
-        assert "WHERE NOT COALESCE" in mock_query.call_args[0][0]
+        mock_read.assert_called_once()
+        assert "WHERE NOT COALESCE" in mock_read.call_args[0][0]
 
-    @patch.object(Neo4jClient, "query")
-    def test_list_all_projects_includes_default(self, mock_query):
+    @patch.object(Neo4jClient, "_read")
+    def test_list_all_projects_includes_default(self, mock_read):
         """Test listing all projects including default."""
-        mock_query.return_value = [
+        mock_read.return_value = [
             {"id": "default", "name": "Default", "created_at": "2024-01-01", "is_default": True},
             {"id": "proj-1", "name": "Project 1", "created_at": "2024-01-27", "is_default": False},
         ]
@@ -802,5 +1745,308 @@ class TestNeo4jClientProjectFilter:
         result = client.list_all_projects(include_default=True)
 
         assert len(result) == 2
+        mock_read.assert_called_once()
+        assert "WHERE NOT" not in mock_read.call_args[0][0]
+
+
+class TestNeo4jClientChatMessages:
+    """Tests for chat message writes and reads."""
+
+    @patch.object(Neo4jClient, "query")
+    def test_add_chat_messages_writes_batch_in_one_statement(self, mock_query):
+        """Test that a batch is appended to its session at once."""
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        written = client.add_chat_messages("session-1", [
+            {"role": "assistant", "content": "Hello", "request_id": "req-1"},
+            {"role": "user", "content": "Thanks", "timestamp": "2024-01-02T03:04:05.000000Z"},
+        ])
+
+        assert written == 2
+        mock_query.assert_called_once()
+        assert "MATCH (s:ChatSession {id: $session_id})" in mock_query.call_args[0][0]
+        assert "MERGE" not in mock_query.call_args[0][0]
+        messages = mock_query.call_args[0][1]["messages"]
+        assert [m["content"] for m in messages] == ["Hello", "Thanks"]
+        assert messages[0]["request_id"] == "req-1"
+        assert messages[0]["timestamp"].endswith("Z")
+        assert messages[1]["timestamp"] == "2024-01-02T03:04:05.000000Z"
+
+    @patch.object(Neo4jClient, "query")
+    def test_add_no_chat_messages_skips_write(self, mock_query):
+        """Test that an empty batch costs no round-trip."""
+        assert Neo4jClient().add_chat_messages("session-1", []) == 0
+        mock_query.assert_not_called()
+
+    @patch.object(Neo4jClient, "_read")
+    def test_history_pages_by_seq(self, mock_read):
+        """Test that history can be read incrementally after a known seq."""
+        mock_read.return_value = [{"role": "user", "content": "Hi", "timestamp": None, "seq": 6}]
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        history = client.get_chat_history("session-1", since_seq=5, limit=20)
+
+        query, params = mock_read.call_args[0]
+        assert query.rstrip().endswith("LIMIT $limit")
+        assert params == {"session_id": "session-1", "since_seq": 5, "limit": 20}
+        assert history[0]["seq"] == 6
+
+        client.get_chat_history("session-1")
+        assert "LIMIT" not in mock_read.call_args[0][0]
+
+    @patch.object(Neo4jClient, "_read", return_value=[{"exists": True}])
+    def test_message_exists_reads_by_request_id(self, mock_read):
+        """Test that the idempotency check is a single read."""
+        assert Neo4jClient().chat_message_exists("session-1", "req-1") is True
+        assert mock_read.call_args[0][1] == {"session_id": "session-1", "request_id": "req-1"}
+
+    @patch.object(Neo4jClient, "query")
+    def test_begin_chat_turn_is_one_round_trip(self, mock_query):
+        """Test that starting a turn writes, locks and reads in one query."""
+        history = [{"role": "user", "content": "Hi", "seq": 1}]
+        mock_query.return_value = [{"status": "started", "history": history}]
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        turn = client.begin_chat_turn("session-1", "Hi", "req-1", "2024-01-02T03:04:05.000000Z")
+
         mock_query.assert_called_once()
-        assert "WHERE NOT" not in mock_query.call_args[0][0]
+        assert mock_query.call_args[0][1]["respect_lock"] is True
+        assert turn == {"status": "started", "history": history}
+
+    @patch.object(Neo4jClient, "query", return_value=[{"message_count": 3}])
+    def test_delete_chat_session_removes_messages_in_one_statement(self, mock_query):
+        """Test that the session and its messages go in one round-trip."""
+        assert Neo4jClient().delete_chat_session("session-1") == 3
+
+        mock_query.assert_called_once()
+        assert "DETACH DELETE m" in mock_query.call_args[0][0]
+
+
+class TestNeo4jClientRemediationNodes:
+    """Tests for remediation node creation."""
+
+    @patch.object(Neo4jClient, "query", return_value=[])
+    def test_create_remediation_node_is_one_statement(self, mock_query):
+        """Test that the node and its prerequisite link are written together."""
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        result = client.create_remediation_node(
+            "proj-1", "remediation-1", "Loops", "", "", "Gap", "minor", "skill-python", "assess-1",
+        )
+
+        mock_query.assert_called_once()
+        query = mock_query.call_args[0][0]
+        assert "PREREQUISITE_FOR" in query
+        assert "target.id = $before_node_id" in query
+        assert result["created"] is True
+
+    @patch.object(Neo4jClient, "_read")
+    def test_get_remediation_node_uses_labelled_lookups(self, mock_read):
+        """Test that each remediation label is looked up by id, not scanned."""
+        mock_read.return_value = [{"id": "remediation-1", "name": "Loops"}]
+
+        node = Neo4jClient(neo4j_config=Neo4jConfig()).get_remediation_node("remediation-1")
+
+        query, params = mock_read.call_args[0]
+        assert "MATCH (r:RemediationConcept {id: $node_id})" in query
+        assert "MATCH (r:ProjectLesson {id: $node_id})" in query
+        assert params == {"node_id": "remediation-1"}
+        assert node == {"id": "remediation-1", "name": "Loops"}
+        assert any("remediation_concept_id" in q for q in _SCHEMA_QUERIES)
+
+
+class TestNeo4jClientRemediationEvents:
+    """Tests for buffered remediation event writes."""
+
+    @patch.object(Neo4jClient, "query")
+    def test_events_are_batched_until_flush(self, mock_query):
+        """Test that tracked events share one UNWIND write."""
+        client = Neo4jClient(neo4j_config=Neo4jConfig())
+
+        client.track_remediation_event("proj-1", "assess-00000001", "rem-1", "Gap", "minor")
+        client.track_remediation_event("proj-1", "assess-00000002", "rem-2", "Gap", "major")
+        mock_query.assert_not_called()
+
+        assert client.flush_remediation_events() == 2
+        mock_query.assert_called_once()
+        rows = mock_query.call_args[0][1]["rows"]
+        assert [row["event_id"] for row in rows] == ["rem-event-00000001", "rem-event-00000002"]
+        assert client.flush_remediation_events() == 0
+
+
+class TestNeo4jClientProjectGraphCounts:
+    """Tests for get_project_graph_counts."""
+
+    @patch.object(Neo4jClient, "_read")
+    def test_counts_come_from_one_query(self, mock_read):
+        """Test that node and relationship counts share one read."""
+        mock_read.return_value = [{"node_count": 4, "rel_count": 9}]
+
+        counts = Neo4jClient().get_project_graph_counts("proj-1")
+
+        assert counts == {"nodes": 4, "relationships": 9}
+        mock_read.assert_called_once()
+        assert "COUNT { (p)-->() }" in mock_read.call_args[0][0]
+
+    @patch.object(Neo4jClient, "_read", return_value=[])
+    def test_missing_project_counts_zero(self, mock_read):
+        """Test that an unknown project reports zero counts."""
+        assert Neo4jClient().get_project_graph_counts("missing") == {"nodes": 0, "relationships": 0}
+
+
+class TestAsyncNeo4jClient:
+    """Tests for the async read client."""
+
+    @pytest.mark.asyncio
+    @patch.object(AsyncNeo4jClient, "_read", new_callable=AsyncMock)
+    async def test_get_pending_proposals_decodes_json(self, mock_read):
+        """Test that stored proposals are decoded like the sync client."""
+        mock_read.return_value = [{"pending_proposals": '[{"id": "p-1"}]'}]
+
+        async with AsyncNeo4jClient(neo4j_config=Neo4jConfig()) as client:
+            proposals = await client.get_pending_proposals("session-1")
+
+        assert proposals == [{"id": "p-1"}]
+        assert mock_read.call_args[0][1] == {"session_id": "session-1"}
+
+    @pytest.mark.asyncio
+    @patch.object(AsyncNeo4jClient, "_read", new_callable=AsyncMock)
+    async def test_get_chat_history_formats_timestamps(self, mock_read):
+        """Test that message timestamps use the API's fixed-width format."""
+        mock_read.return_value = [
+            {"role": "user", "content": "Hi", "timestamp": DateTime(2024, 1, 2, 21, 40, 0), "seq": 1},
+            {"role": "user", "content": "Old", "timestamp": "2023-05-06T07:08:09.000000Z", "seq": None},
+        ]
+
+        client = AsyncNeo4jClient(neo4j_config=Neo4jConfig())
+        history = await client.get_chat_history("session-1")
+
+        assert "toString" not in mock_read.call_args[0][0]
+        assert history[0]["timestamp"] == "2024-01-02T21:40:00.000000Z"
+        assert history[1]["timestamp"] == "2023-05-06T07:08:09.000000Z"
+
+    @pytest.mark.asyncio
+    @patch.dict("backend.db.neo4j_client._ASYNC_DRIVERS", clear=True)
+    @patch("backend.db.neo4j_client.AsyncGraphDatabase")
+    async def test_driver_shared_between_clients(self, mock_graph_db):
+        """Test that per-request clients on one loop share a driver."""
+        mock_graph_db.driver.side_effect = lambda *args, **kwargs: AsyncMock()
+
+        async with AsyncNeo4jClient(neo4j_config=Neo4jConfig()) as first:
+            driver = first.driver
+        async with AsyncNeo4jClient(neo4j_config=Neo4jConfig()) as second:
+            assert second.driver is driver
+        async with AsyncNeo4jClient(neo4j_config=Neo4jConfig(_password="other")) as other:
+            assert other.driver is not driver
+
+        driver.close.assert_not_awaited()
+        assert mock_graph_db.driver.call_count == 2
+
+
+class TestSlugify:
+    """Tests for the _slugify helper."""
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("  Machine Learning  ", "machine-learning"),
+            ("Data_Structures -- & Algorithms", "data-structures-algorithms"),
+            ("Node.js", "nodejs"),
+            ("Café Crème", "café-crème"),
+            ("a" + "-" * 50 + "b", "a-b"),
+            ("???", "node"),
+        ],
+    )
+    def test_slugify(self, value, expected):
+        """Test slugs keep alphanumerics and collapse separators."""
+        assert _slugify(value) == expected
+
+    def test_repeated_names_hit_the_cache(self):
+        """Test that slugs are memoized per name."""
+        _slugify.cache_clear()
+
+        _slugify("Machine Learning")
+        _slugify("Machine Learning")
+
+        assert _slugify.cache_info().hits == 1
+
+
+class TestJsonHelpers:
+    """Tests for the JSON helpers used for stored payloads."""
+
+    @patch("backend.db.neo4j_client.orjson", None)
+    def test_round_trip_with_stdlib_json(self):
+        """Test that payloads round-trip through the stdlib fallback."""
+        payload = {"id": "p-1", "milestones": ["Build", "Ship"], "score": 0.5}
+
+        raw = json_dumps(payload)
+
+        assert raw == json.dumps(payload)
+        assert _json_loads(raw) == payload
+
+    def test_round_trip_with_orjson(self):
+        """Test that orjson output is returned as a string."""
+        pytest.importorskip("orjson")
+        payload = {"id": "p-1", "milestones": ["Build", "Ship"], "score": 0.5}
+
+        raw = json_dumps(payload)
+
+        assert isinstance(raw, str)
+        assert _json_loads(raw) == payload
+
+    @patch("backend.db.neo4j_client.orjson", None)
+    def test_datetimes_encoded_in_place(self):
+        """Test that Neo4j DateTime values are dumped without a prior walk."""
+        payload = {"created_at": DateTime(2024, 1, 2, 3, 4, 5), "tags": [DateTime(2024, 1, 2, 3, 4, 5)]}
+
+        assert _json_loads(json_dumps(payload)) == {
+            "created_at": "2024-01-02T03:04:05.000000Z",
+            "tags": ["2024-01-02T03:04:05.000000Z"],
+        }
+        with pytest.raises(TypeError):
+            json_dumps({"value": object()})
+
+    @patch("backend.db.neo4j_client.orjson", None)
+    def test_invalid_json_raises_json_decode_error(self):
+        """Test that invalid input raises the stdlib error type."""
+        with pytest.raises(json.JSONDecodeError):
+            _json_loads("not json")
+
+
+class TestSerializeNeo4jValue:
+    """Tests for the _serialize_neo4j_value helper."""
+
+    def test_scalars_pass_through(self):
+        """Test that JSON scalars are returned unchanged."""
+        for value in ("text", 3, 1.5, True, None):
+            assert _serialize_neo4j_value(value) is value
+
+    def test_nested_datetimes_are_formatted(self):
+        """Test that DateTime values inside lists and dicts are formatted."""
+        stamp = DateTime(2024, 1, 2, 3, 4, 5)
+        result = _serialize_neo4j_value({"created_at": stamp, "history": [stamp, "x"]})
+
+        expected = stamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        assert result == {"created_at": expected, "history": [expected, "x"]}
+
+    def test_datetime_format_matches_strftime(self):
+        """Test that DateTime formatting keeps microsecond precision."""
+        stamp = DateTime(2024, 3, 9, 7, 5, 2, 123456789)
+
+        assert _serialize_neo4j_value(stamp) == stamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        assert _serialize_neo4j_value(stamp) == "2024-03-09T07:05:02.123456Z"
+
+
+class TestSerializeNode:
+    """Tests for the _serialize_node helper."""
+
+    def test_flat_row_moves_remaining_keys_to_properties(self):
+        """Test that a flat row keeps everything but id and labels as properties."""
+        row = {"id": "skill-1", "labels": ["Skill"], "name": "Python", "level": 2}
+
+        assert _serialize_node(row) == {
+            "id": "skill-1",
+            "labels": ["Skill"],
+            "properties": {"name": "Python", "level": 2},
+        }
+        assert row == {"id": "skill-1", "labels": ["Skill"], "name": "Python", "level": 2}
@@ -2,12 +2,19 @@
 Unit tests for Remediation Service.
 Tests diagnosis, content generation, and mock LLM responses.
 """
+import asyncio
+from unittest.mock import MagicMock
+
 import pytest
 
+from backend.config import config, request_scope
 from backend.services.remediation_service import (
     diagnose_failure,
     generate_remediation_content,
     _extract_json_block,
+    _flush_events_in_background,
+    _log_failed_flush,
+    _PENDING_FLUSHES,
 )
 
 
@@ -31,6 +38,33 @@ def test_extract_json_block_returns_none_for_invalid():
     assert result is None
 
 
+def test_failed_event_flush_is_logged(caplog):
+    loop = asyncio.new_event_loop()
+    try:
+        future = loop.create_future()
+        future.set_exception(RuntimeError("neo4j down"))
+        _log_failed_flush(future)
+    finally:
+        loop.close()
+    assert "neo4j down" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_background_flush_keeps_request_scope():
+    """Test that the event flush writes to the request's database."""
+    seen = []
+    db = MagicMock()
+    db.flush_remediation_events.side_effect = lambda: seen.append(config.neo4j.uri)
+
+    with request_scope(neo4j_uri="bolt://tenant:7687"):
+        task = _flush_events_in_background(db)
+    assert task in _PENDING_FLUSHES
+    await task
+
+    assert seen == ["bolt://tenant:7687"]
+    assert task not in _PENDING_FLUSHES
+
+
 @pytest.mark.asyncio
 async def test_diagnose_failure_returns_valid_structure():
     """Test that diagnose_failure returns expected structure with mock LLM."""